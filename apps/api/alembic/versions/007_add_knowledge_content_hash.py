@@ -0,0 +1,38 @@
+"""Add per-chunk content hash to knowledge_documents for incremental re-ingestion
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "knowledge_documents",
+        sa.Column("content_hash", sa.String(64), nullable=True),
+    )
+    # Same digest as app.services.rag.content_hash (sha256 of the UTF-8 text)
+    op.execute(
+        "UPDATE knowledge_documents "
+        "SET content_hash = encode(sha256(convert_to(content, 'UTF8')), 'hex')"
+    )
+    op.create_index(
+        "ix_knowledge_documents_tenant_title",
+        "knowledge_documents",
+        ["tenant_id", "title"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_knowledge_documents_tenant_title", table_name="knowledge_documents")
+    op.drop_column("knowledge_documents", "content_hash")
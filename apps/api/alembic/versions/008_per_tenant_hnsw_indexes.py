@@ -0,0 +1,45 @@
+"""Replace the global HNSW index with per-tenant partial HNSW indexes
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.vector_index import tenant_index_ddl, tenant_index_name
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _tenant_ids() -> list[str]:
+    rows = op.get_bind().execute(
+        sa.text("SELECT DISTINCT tenant_id FROM knowledge_documents WHERE embedding IS NOT NULL")
+    )
+    return [row[0] for row in rows]
+
+
+def upgrade() -> None:
+    tenant_ids = _tenant_ids()
+    # CONCURRENTLY can't run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for tenant_id in tenant_ids:
+            op.execute(tenant_index_ddl(tenant_id))
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_knowledge_documents_embedding")
+
+
+def downgrade() -> None:
+    tenant_ids = _tenant_ids()
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_knowledge_documents_embedding "
+            "ON knowledge_documents USING hnsw (embedding vector_cosine_ops)"
+        )
+        for tenant_id in tenant_ids:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {tenant_index_name(tenant_id)}")
@@ -0,0 +1,27 @@
+"""Record which backend (in-memory index or pgvector) served each RAG retrieval
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "rag_retrieval_metrics",
+        sa.Column("search_backend", sa.String(16), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("rag_retrieval_metrics", "search_backend")
@@ -0,0 +1,54 @@
+"""Add full-text search column for hybrid retrieval and per-leg retrieval metrics
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "knowledge_documents",
+        sa.Column(
+            "content_tsv",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', content)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "rag_retrieval_metrics",
+        sa.Column("retrieval_mode", sa.String(16), nullable=True),
+    )
+    op.add_column(
+        "rag_retrieval_metrics",
+        sa.Column("lexical_latency_ms", sa.Integer(), nullable=True),
+    )
+    op.add_column(
+        "rag_retrieval_metrics",
+        sa.Column("lexical_hits", sa.Integer(), nullable=True),
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_knowledge_documents_content_tsv "
+            "ON knowledge_documents USING gin (content_tsv)"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_knowledge_documents_content_tsv", table_name="knowledge_documents")
+    op.drop_column("rag_retrieval_metrics", "lexical_hits")
+    op.drop_column("rag_retrieval_metrics", "lexical_latency_ms")
+    op.drop_column("rag_retrieval_metrics", "retrieval_mode")
+    op.drop_column("knowledge_documents", "content_tsv")
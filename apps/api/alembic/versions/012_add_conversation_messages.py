@@ -0,0 +1,61 @@
+"""Add append-only conversation_messages table and conversation_transcripts view
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-16
+
+Existing JSONB transcripts are left in place (no rewrite of old rows); the
+view serves them followed by the messages appended from now on.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.conversation_message import CONVERSATION_TRANSCRIPTS_VIEW_SQL
+
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "conversation_messages",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True),
+        sa.Column(
+            "conversation_id",
+            sa.UUID(),
+            sa.ForeignKey("conversations.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("tenant_id", sa.String(), nullable=False),
+        sa.Column("role", sa.String(16), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_conversation_messages_conversation_id",
+        "conversation_messages",
+        ["conversation_id", "id"],
+    )
+    op.execute(CONVERSATION_TRANSCRIPTS_VIEW_SQL)
+
+
+def downgrade() -> None:
+    # Fold appended messages back into the JSONB blob before dropping them
+    op.execute("""
+        UPDATE conversations c
+        SET transcript = t.transcript
+        FROM conversation_transcripts t
+        WHERE t.conversation_id = c.id
+          AND EXISTS (SELECT 1 FROM conversation_messages m WHERE m.conversation_id = c.id)
+    """)
+    op.execute("DROP VIEW IF EXISTS conversation_transcripts")
+    op.drop_index("ix_conversation_messages_conversation_id", table_name="conversation_messages")
+    op.drop_table("conversation_messages")
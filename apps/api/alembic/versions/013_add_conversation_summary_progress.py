@@ -0,0 +1,37 @@
+"""Track message counts for the rolling conversation summary
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "conversations",
+        sa.Column("message_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "conversations",
+        sa.Column("summary_message_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute("""
+        UPDATE conversations c
+        SET message_count = COALESCE(jsonb_array_length(c.transcript), 0)
+            + (SELECT count(*) FROM conversation_messages m WHERE m.conversation_id = c.id)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("conversations", "summary_message_count")
+    op.drop_column("conversations", "message_count")
@@ -0,0 +1,41 @@
+"""Add centroid pre-classifier columns to escalation decision metrics
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "escalation_decision_metrics",
+        sa.Column("centroid_label", sa.String(16), nullable=True),
+    )
+    op.add_column(
+        "escalation_decision_metrics",
+        sa.Column("centroid_margin", sa.Numeric(5, 4), nullable=True),
+    )
+    op.add_column(
+        "escalation_decision_metrics",
+        sa.Column("centroid_confident", sa.Boolean(), nullable=True),
+    )
+    op.execute(
+        "ALTER TABLE escalation_decision_metrics ADD COLUMN message_embedding vector(1536)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("escalation_decision_metrics", "message_embedding")
+    op.drop_column("escalation_decision_metrics", "centroid_confident")
+    op.drop_column("escalation_decision_metrics", "centroid_margin")
+    op.drop_column("escalation_decision_metrics", "centroid_label")
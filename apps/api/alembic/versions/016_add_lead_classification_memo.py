@@ -0,0 +1,33 @@
+"""Add per-conversation lead classification memo
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "conversations",
+        sa.Column("lead_memo", postgresql.JSONB(), nullable=True),
+    )
+    op.add_column(
+        "agent_run_metrics",
+        sa.Column("lead_classification", sa.String(16), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("agent_run_metrics", "lead_classification")
+    op.drop_column("conversations", "lead_memo")
@@ -0,0 +1,50 @@
+"""Add pending_lead_captures table for lead capture on the follow_up queue
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "017"
+down_revision: Union[str, None] = "016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pending_lead_captures",
+        sa.Column("id", sa.UUID(), primary_key=True),
+        sa.Column("tenant_id", sa.String(), nullable=False, index=True),
+        sa.Column(
+            "conversation_id",
+            sa.UUID(),
+            sa.ForeignKey("conversations.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        ),
+        sa.Column("run_id", sa.UUID(), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("classification", postgresql.JSONB(), nullable=True),
+        sa.Column("message_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("pending_lead_captures")
@@ -0,0 +1,190 @@
+"""Single-pass escalation pattern engine.
+
+Escalation rules are literal phrases per category. Short templates expand
+to phrases: ``"call {911|an ambulance}"`` gives two phrases, and an empty
+alternative makes its part optional. All phrases of all categories are
+compiled into one trie-shaped regex (the regex equivalent of an Aho-Corasick
+automaton): at each offset of the lowercased message the next character
+selects the single branch to follow. This replaces running one regex per
+category and stopping at the first hit. A scan reports every matched
+category, including overlapping phrases, ordered by priority (the first one
+decides the escalation reason), and the cost barely grows as phrases are
+added.
+
+Tenants can add phrases to a category through
+``Tenant.settings["escalation_rules"]`` (``{"complaint": ["charged twice"]}``).
+Those match whole words only, and compiled engines are cached per distinct
+rule set.
+"""
+
+import itertools
+import re
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+
+_TEMPLATE_PART = re.compile(r"(\{[^{}]*\})")
+
+
+@dataclass(frozen=True)
+class EscalationCategory:
+    name: str  # recorded as pattern_matched
+    reason: str  # escalation reason (key of the safe response templates)
+    priority: int  # lower wins when several categories match
+
+
+@dataclass(frozen=True)
+class PatternMatch:
+    category: str
+    reason: str
+    priority: int
+    text: str
+
+
+CATEGORIES: tuple[EscalationCategory, ...] = (
+    EscalationCategory("emergency", "emergency", 0),
+    EscalationCategory("complaint", "complaint", 1),
+    EscalationCategory("human_request", "patient_request", 2),
+    EscalationCategory("medical_advice", "medical_question", 3),
+)
+_CATEGORIES_BY_NAME = {c.name: c for c in CATEGORIES}
+
+DEFAULT_RULES: dict[str, tuple[str, ...]] = {
+    "emergency": (
+        "allergic reaction", "can{'|}t breathe", "difficulty breathing", "severe swelling",
+        "chest pain", "call 911", "emergency", "anaphyla", "heart attack", "seizure",
+        "severe bleeding", "loss of consciousness",
+    ),
+    "complaint": (
+        "terrible experience", "horrible", "worst", "never coming back", "sue", "lawyer",
+        "report you", "file a complaint", "malpractice", "ruined", "damaged", "botched",
+    ),
+    "human_request": (
+        "{speak|talk} to {a |some|}{real |}{person|human|someone|staff|doctor|nurse|provider}",
+        "real {person|human}", "human {please|help}",
+        "connect me", "transfer me", "can i call", "phone number",
+    ),
+    "medical_advice": (
+        "is it safe to", "should i", "side effect{s|} of", "am i a {good |}candidate",
+        "safe {during|while|if|for}", "contraindication", "interact{ion|} with",
+        "pregnant", "pregnancy", "breastfeed", "nursing", "medical {condition|history}",
+        "taking medication", "blood thinner", "autoimmune", "infection",
+        "drooping", "eyelid", "complication", "adverse", "reaction after", "swelling after",
+        "pain after", "bruising {that|won't|wont}", "lump", "hard", "nodule",
+    ),
+}
+
+
+def expand_template(template: str) -> set[str]:
+    """All lowercase phrases a rule template stands for."""
+    parts = _TEMPLATE_PART.split(template.lower())
+    options = [p[1:-1].split("|") if p.startswith("{") else [p] for p in parts]
+    return {"".join(choice) for choice in itertools.product(*options)}
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: dict) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Greedy optional: the longest phrase through this node is tried first
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
+
+
+def category_pattern(name: str) -> re.Pattern:
+    """Standalone regex for one default category (e.g. to test its phrases in isolation)."""
+    phrases = set().union(*(expand_template(t) for t in DEFAULT_RULES[name]))
+    return re.compile(_trie_pattern(phrases), re.IGNORECASE)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class EscalationPatternEngine:
+    """Scans a message for every escalation category in one pass."""
+
+    def __init__(self, phrases: Mapping[str, Iterable[str]], whole_word: Iterable[str] = ()):
+        # phrase -> category; a phrase listed under several categories keeps the most urgent
+        self._phrases: dict[str, EscalationCategory] = {}
+        for category in sorted(CATEGORIES, key=lambda c: c.priority, reverse=True):
+            for phrase in phrases.get(category.name, ()):
+                self._phrases[phrase] = category
+        self._whole_word = frozenset(whole_word)
+        self._lengths = sorted({len(p) for p in self._phrases})
+        self._regex = re.compile(_trie_pattern(self._phrases)) if self._phrases else None
+
+    def _bounded(self, text: str, start: int, end: int) -> bool:
+        return (start == 0 or not _is_word_char(text[start - 1])) and (
+            end == len(text) or not _is_word_char(text[end])
+        )
+
+    def scan(self, message: str) -> list[PatternMatch]:
+        """Every matched category (first matching phrase each), most urgent first."""
+        if self._regex is None:
+            return []
+        text = message.lower()
+        found: dict[str, PatternMatch] = {}
+        pos = 0
+        while (match := self._regex.search(text, pos)) is not None:
+            start, matched = match.start(), match.group()
+            # The regex returns the longest phrase starting here; shorter
+            # phrases that are prefixes of it may belong to other categories
+            for length in self._lengths:
+                if length > len(matched):
+                    break
+                phrase = matched[:length]
+                category = self._phrases.get(phrase)
+                if category is None or category.name in found:
+                    continue
+                if phrase in self._whole_word and not self._bounded(text, start, start + length):
+                    continue
+                found[category.name] = PatternMatch(
+                    category.name, category.reason, category.priority, phrase
+                )
+            pos = start + 1
+        return sorted(found.values(), key=lambda m: m.priority)
+
+
+def normalize_tenant_rules(raw: object) -> tuple[tuple[str, tuple[str, ...]], ...]:
+    """Hashable form of a tenant's ``escalation_rules``; unknown categories are dropped."""
+    if not isinstance(raw, Mapping):
+        return ()
+    rules = []
+    for name in sorted(raw):
+        phrases = raw[name]
+        if name not in _CATEGORIES_BY_NAME or not isinstance(phrases, list):
+            continue
+        cleaned = tuple(
+            sorted({" ".join(p.lower().split()) for p in phrases if isinstance(p, str)} - {""})
+        )
+        if cleaned:
+            rules.append((name, cleaned))
+    return tuple(rules)
+
+
+@lru_cache(maxsize=256)
+def get_pattern_engine(
+    tenant_rules: tuple[tuple[str, tuple[str, ...]], ...] = (),
+) -> EscalationPatternEngine:
+    """Compiled engine for the default rules plus a tenant's extra phrases."""
+    phrases = {
+        name: set().union(*(expand_template(t) for t in templates))
+        for name, templates in DEFAULT_RULES.items()
+    }
+    defaults = set().union(*phrases.values())
+    whole_word = set()
+    for name, extra in tenant_rules:
+        phrases[name].update(extra)
+        whole_word.update(set(extra) - defaults)
+    return EscalationPatternEngine(phrases, whole_word)
@@ -2,9 +2,11 @@
 
 from typing import TypedDict
 
-from langgraph.graph import END, StateGraph
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.state import CompiledStateGraph
 
 from app.agent.nodes import (
+    answer_node,
     check_escalation_node,
     create_lead_node,
     escalate_node,
@@ -15,13 +17,17 @@ from app.agent.nodes import (
 
 class ConciergeState(TypedDict):
     messages: list[dict]  # [{role: "user"|"assistant", content: str}]
+    summary: str | None  # Rolling summary of turns older than the prompt window
+    summarized_count: int  # Leading entries of messages already covered by summary
     tenant_id: str
     spa_name: str
     lead_id: str | None
     conversation_id: str | None
     should_escalate: bool
     escalation_reason: str | None
+    classification: dict | None  # Lead intent/urgency/summary from check_escalation's LLM call
     intent: str | None
+    lead_capture: dict | None  # Post-response lead capture job from create_lead
     context: str
     response: str  # The generated response text
 
@@ -33,8 +39,16 @@ def _route_after_escalation_check(state: ConciergeState) -> str:
     return "create_lead"
 
 
-def build_concierge_graph() -> StateGraph:
-    """Build the concierge agent graph."""
+def build_concierge_graph() -> CompiledStateGraph:
+    """Build the concierge agent graph.
+
+    The escalation check runs before generation, so no token of an answer
+    that escalation would replace is ever produced (let alone streamed);
+    escalated turns skip generate_response entirely.
+
+    Callers on the request path should use ``app.agent.registry.get_graph()``
+    instead, which compiles once per process.
+    """
     graph = StateGraph(ConciergeState)
 
     # Add nodes
@@ -46,11 +60,52 @@ def build_concierge_graph() -> StateGraph:
 
     # Define edges
     graph.set_entry_point("search_knowledge")
-    graph.add_edge("search_knowledge", "generate_response")
-    graph.add_edge("generate_response", "check_escalation")
+    graph.add_edge("search_knowledge", "check_escalation")
     graph.add_conditional_edges(
         "check_escalation",
         _route_after_escalation_check,
+        {"escalate": "escalate", "create_lead": "generate_response"},
+    )
+    graph.add_edge("generate_response", "create_lead")
+    graph.add_edge("escalate", END)
+    graph.add_edge("create_lead", END)
+
+    return graph.compile()
+
+
+async def _join_node(state: ConciergeState) -> dict:
+    """Barrier where the answer and escalation branches meet before routing."""
+    return {}
+
+
+def build_parallel_concierge_graph() -> CompiledStateGraph:
+    """Build the fan-out variant of the concierge graph.
+
+    search_knowledge + generate_response (as the ``answer`` branch) and
+    check_escalation run concurrently from START and join before the same
+    escalate/create_lead routing as the sequential graph. When escalation
+    wins, the answer branch is cancelled if the caller set an event in
+    ``app.agent.nodes._escalation_signal_ctx``; otherwise its output is
+    discarded by escalate_node overwriting ``response``.
+
+    Answer tokens are produced before the escalation decision, so streaming
+    callers must hold them until check_escalation has updated the state
+    (the chat router does).
+    """
+    graph = StateGraph(ConciergeState)
+
+    graph.add_node("answer", answer_node)
+    graph.add_node("check_escalation", check_escalation_node)
+    graph.add_node("join", _join_node)
+    graph.add_node("escalate", escalate_node)
+    graph.add_node("create_lead", create_lead_node)
+
+    graph.add_edge(START, "answer")
+    graph.add_edge(START, "check_escalation")
+    graph.add_edge(["answer", "check_escalation"], "join")
+    graph.add_conditional_edges(
+        "join",
+        _route_after_escalation_check,
         {"escalate": "escalate", "create_lead": "create_lead"},
     )
     graph.add_edge("escalate", END)
@@ -4,26 +4,97 @@ import logging
 import time
 from decimal import Decimal
 
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import AIMessage, BaseMessage
 
 from app.services.metrics_collector import get_collector
 
 logger = logging.getLogger(__name__)
 
-# Per-million-token pricing (OpenAI, as of 2025)
+# Per-million-token pricing (OpenAI, as of 2025). Prompt tokens served from
+# the provider's prompt cache are billed at the "cached_input" rate.
 MODEL_PRICING: dict[str, dict[str, float]] = {
-    "gpt-4o-mini": {"input": 0.15, "output": 0.60},
-    "gpt-4o": {"input": 2.50, "output": 10.00},
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+    "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
 }
 
 
-def _compute_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Decimal:
+def _compute_cost(
+    model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0
+) -> Decimal:
     pricing = MODEL_PRICING.get(model)
     if not pricing:
         return Decimal("0")
-    input_cost = Decimal(str(pricing["input"])) * prompt_tokens / 1_000_000
+    cached_tokens = min(cached_tokens, prompt_tokens)
+    input_cost = Decimal(str(pricing["input"])) * (prompt_tokens - cached_tokens) / 1_000_000
+    cached_cost = (
+        Decimal(str(pricing.get("cached_input", pricing["input"]))) * cached_tokens / 1_000_000
+    )
     output_cost = Decimal(str(pricing["output"])) * completion_tokens / 1_000_000
-    return input_cost + output_cost
+    return input_cost + cached_cost + output_cost
+
+
+def _extract_usage(response: BaseMessage) -> tuple[int, int, int, int]:
+    """Return (prompt, completion, total, cached) tokens from an OpenAI response or merged stream.
+
+    ``cached`` is the part of the prompt served from the provider's prompt cache.
+    """
+    usage = getattr(response, "response_metadata", {}).get("token_usage", {})
+    if usage:
+        details = usage.get("prompt_tokens_details") or {}
+        return (
+            usage.get("prompt_tokens", 0),
+            usage.get("completion_tokens", 0),
+            usage.get("total_tokens", 0),
+            details.get("cached_tokens") or 0,
+        )
+    # Streamed responses only carry usage on the final chunk (requires stream_usage=True)
+    usage_metadata = getattr(response, "usage_metadata", None) or {}
+    details = usage_metadata.get("input_token_details") or {}
+    return (
+        usage_metadata.get("input_tokens", 0),
+        usage_metadata.get("output_tokens", 0),
+        usage_metadata.get("total_tokens", 0),
+        details.get("cache_read") or 0,
+    )
+
+
+def _model_name(llm) -> str:
+    return getattr(llm, "model_name", "") or getattr(llm, "model", "unknown")
+
+
+def _record_success(llm, response: BaseMessage, node_name: str, latency_ms: int) -> None:
+    collector = get_collector()
+    if not collector:
+        return
+
+    prompt_tokens, completion_tokens, total_tokens, cached_tokens = _extract_usage(response)
+    model = _model_name(llm)
+    collector.record_llm_call(
+        node_name=node_name,
+        model=model,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=total_tokens,
+        cached_tokens=cached_tokens,
+        cost_usd=_compute_cost(model, prompt_tokens, completion_tokens, cached_tokens),
+        latency_ms=latency_ms,
+        success=True,
+    )
+
+
+def _record_failure(llm, exc: Exception, node_name: str, latency_ms: int) -> None:
+    collector = get_collector()
+    if not collector:
+        return
+
+    collector.record_llm_call(
+        node_name=node_name,
+        model=_model_name(llm),
+        latency_ms=latency_ms,
+        success=False,
+        error_type=type(exc).__name__,
+        error_message=str(exc)[:500],
+    )
 
 
 async def instrumented_ainvoke(
@@ -32,48 +103,70 @@ async def instrumented_ainvoke(
     node_name: str,
 ) -> BaseMessage:
     """Invoke LLM and record metrics to the current collector."""
-    collector = get_collector()
     start = time.perf_counter()
 
     try:
         response = await llm.ainvoke(messages)
-        latency_ms = int((time.perf_counter() - start) * 1000)
-
-        # Extract token usage from OpenAI response metadata
-        usage = getattr(response, "response_metadata", {}).get("token_usage", {})
-        prompt_tokens = usage.get("prompt_tokens", 0)
-        completion_tokens = usage.get("completion_tokens", 0)
-        total_tokens = usage.get("total_tokens", 0)
-
-        model = getattr(llm, "model_name", "") or getattr(llm, "model", "unknown")
-        cost = _compute_cost(model, prompt_tokens, completion_tokens)
-
-        if collector:
-            collector.record_llm_call(
-                node_name=node_name,
-                model=model,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=total_tokens,
-                cost_usd=cost,
-                latency_ms=latency_ms,
-                success=True,
-            )
-
-        return response
+    except Exception as exc:
+        _record_failure(llm, exc, node_name, int((time.perf_counter() - start) * 1000))
+        raise
+
+    _record_success(llm, response, node_name, int((time.perf_counter() - start) * 1000))
+    return response
+
 
+async def instrumented_structured[T](
+    llm,
+    schema: type[T],
+    messages: list[BaseMessage],
+    node_name: str,
+) -> T:
+    """Invoke the LLM with a JSON-schema response format and return the parsed model.
+
+    Usage is read from the raw message, so the call is recorded like
+    ``instrumented_ainvoke``. A response that doesn't fit the schema still
+    counts its tokens but raises ``ValueError``.
+    """
+    start = time.perf_counter()
+    structured = llm.with_structured_output(schema, method="json_schema", include_raw=True)
+
+    try:
+        output = await structured.ainvoke(messages)
     except Exception as exc:
-        latency_ms = int((time.perf_counter() - start) * 1000)
-        model = getattr(llm, "model_name", "") or getattr(llm, "model", "unknown")
-
-        if collector:
-            collector.record_llm_call(
-                node_name=node_name,
-                model=model,
-                latency_ms=latency_ms,
-                success=False,
-                error_type=type(exc).__name__,
-                error_message=str(exc)[:500],
-            )
+        _record_failure(llm, exc, node_name, int((time.perf_counter() - start) * 1000))
+        raise
+
+    _record_success(llm, output["raw"], node_name, int((time.perf_counter() - start) * 1000))
+    if output.get("parsing_error") is not None or output.get("parsed") is None:
+        raise ValueError(
+            f"Response does not match {schema.__name__}: {output.get('parsing_error')}"
+        )
+    return output["parsed"]
+
+
+async def instrumented_astream(
+    llm,
+    messages: list[BaseMessage],
+    node_name: str,
+) -> BaseMessage:
+    """Stream the LLM response and return the merged message.
+
+    Tokens are surfaced to callers of ``graph.astream(stream_mode="messages")``
+    through LangChain's callback system as they arrive; this wrapper only
+    aggregates the chunks and records the same metrics as ``instrumented_ainvoke``.
+    """
+    start = time.perf_counter()
+    response = None
 
+    try:
+        async for chunk in llm.astream(messages):
+            response = chunk if response is None else response + chunk
+    except Exception as exc:
+        _record_failure(llm, exc, node_name, int((time.perf_counter() - start) * 1000))
         raise
+
+    if response is None:
+        response = AIMessage(content="")
+
+    _record_success(llm, response, node_name, int((time.perf_counter() - start) * 1000))
+    return response
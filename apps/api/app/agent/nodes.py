@@ -1,50 +1,31 @@
 """LangGraph node implementations."""
 
+import asyncio
+import contextlib
+import contextvars
 import logging
-import re
+import random
 import time
 
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 
-from app.agent.instrumented_llm import instrumented_ainvoke
-from app.agent.prompts.system import CONCIERGE_SYSTEM_PROMPT
+from app.agent.escalation_patterns import category_pattern, get_pattern_engine
+from app.agent.instrumented_llm import instrumented_astream
+from app.agent.prompts.system import CONCIERGE_CONTEXT_PROMPT, CONCIERGE_SYSTEM_PROMPT
+from app.agent.turn_classifier import classify_turn
 from app.config import settings
+from app.services.conversation_memory import select_prompt_messages
+from app.services.llm_clients import get_llm_clients
 from app.services.metrics_collector import get_collector
 
 logger = logging.getLogger(__name__)
 
-# Escalation keyword patterns (fast, deterministic first-pass)
-_EMERGENCY_PATTERNS = re.compile(
-    r"(allergic reaction|can'?t breathe|difficulty breathing|severe swelling|"
-    r"chest pain|call 911|emergency|anaphyla|heart attack|seizure|"
-    r"severe bleeding|loss of consciousness)",
-    re.IGNORECASE,
-)
-
-_MEDICAL_ADVICE_PATTERNS = re.compile(
-    r"(is it safe to|should i|side effects? of|am i a (good )?candidate|"
-    r"safe (during|while|if|for)|contraindication|interact(ion)? with|"
-    r"pregnant|pregnancy|breastfeed|nursing|medical (condition|history)|"
-    r"taking medication|blood thinner|autoimmune|infection|"
-    r"drooping|eyelid|complication|adverse|reaction after|swelling after|"
-    r"pain after|bruising (that|won'?t)|lump|hard|nodule)",
-    re.IGNORECASE,
-)
-
-_HUMAN_REQUEST_PATTERNS = re.compile(
-    r"(speak to (a |some)?(real )?(person|human|someone|staff|doctor|nurse|provider)|"
-    r"talk to (a |some)?(real )?(person|human|someone|staff|doctor|nurse|provider)|"
-    r"real (person|human)|human (please|help)|"
-    r"connect me|transfer me|can i call|phone number)",
-    re.IGNORECASE,
-)
-
-_COMPLAINT_PATTERNS = re.compile(
-    r"(terrible experience|horrible|worst|never coming back|sue|lawyer|"
-    r"report you|file a complaint|malpractice|ruined|damaged|botched)",
-    re.IGNORECASE,
-)
+# Per-category escalation regexes. check_escalation_node scans all categories
+# at once with the single-pass engine in escalation_patterns; these share its rules.
+_EMERGENCY_PATTERNS = category_pattern("emergency")
+_MEDICAL_ADVICE_PATTERNS = category_pattern("medical_advice")
+_HUMAN_REQUEST_PATTERNS = category_pattern("human_request")
+_COMPLAINT_PATTERNS = category_pattern("complaint")
 
 # Safe response templates for escalation
 _ESCALATION_RESPONSES = {
@@ -79,28 +60,34 @@ _ESCALATION_RESPONSES = {
 }
 
 
+# Set per chat turn (like _metrics_ctx): check_escalation sets the event as soon
+# as it decides to escalate so a concurrent answer_node can abandon generation.
+_escalation_signal_ctx: contextvars.ContextVar[asyncio.Event | None] = contextvars.ContextVar(
+    "_escalation_signal_ctx", default=None
+)
+
+
+def _signal_escalation() -> None:
+    signal = _escalation_signal_ctx.get()
+    if signal is not None:
+        signal.set()
+
+
 def _get_llm():
-    """Get the fast LLM instance (gpt-4o-mini)."""
-    return ChatOpenAI(
-        model="gpt-4o-mini",
-        api_key=settings.openai_api_key,
-        max_tokens=1024,
-    )
+    """Get the fast LLM instance (gpt-4o-mini) from the shared client pool."""
+    return get_llm_clients().chat("gpt-4o-mini", max_tokens=1024)
 
 
 def _get_smart_llm():
-    """Get the smarter LLM for classification tasks (gpt-4o)."""
-    return ChatOpenAI(
-        model="gpt-4o",
-        api_key=settings.openai_api_key,
-        max_tokens=256,
-    )
+    """Get the smarter LLM for classification tasks (gpt-4o) from the shared client pool."""
+    return get_llm_clients().chat("gpt-4o", max_tokens=256)
 
 
 async def search_knowledge_node(state: dict) -> dict:
     """Retrieve relevant knowledge base content for the user's query."""
-    from app.database import async_session_factory
     from app.services.rag import RAGService
+    from app.services.tenant_config import get_tenant_config
+    from app.services.unit_of_work import turn_session
 
     collector = get_collector()
     if collector:
@@ -129,9 +116,16 @@ async def search_knowledge_node(state: dict) -> dict:
             collector.end_node("search_knowledge")
         return {"context": "No tenant context available."}
 
-    async with async_session_factory() as db:
+    # Read-only: hand the connection back before the LLM call that follows
+    async with turn_session(release=True) as db:
+        config = await get_tenant_config(db, tenant_id)
         rag = RAGService(db)
-        context, rag_stats = await rag.search_with_stats(tenant_id, last_user_msg)
+        context, rag_stats = await rag.search_with_stats(
+            tenant_id,
+            last_user_msg,
+            top_k=config.top_k,
+            threshold=config.similarity_threshold,
+        )
 
         if collector and rag_stats:
             collector.record_rag_retrieval(
@@ -141,9 +135,14 @@ async def search_knowledge_node(state: dict) -> dict:
                 avg_similarity=rag_stats.get("avg_similarity"),
                 max_similarity=rag_stats.get("max_similarity"),
                 min_similarity=rag_stats.get("min_similarity"),
-                threshold_used=rag_stats.get("threshold_used", 0.78),
+                threshold_used=rag_stats.get("threshold_used", config.similarity_threshold),
                 embedding_latency_ms=rag_stats.get("embedding_latency_ms", 0),
+                embedding_cache_hit=rag_stats.get("embedding_cache_hit"),
                 search_latency_ms=rag_stats.get("search_latency_ms", 0),
+                search_backend=rag_stats.get("search_backend"),
+                retrieval_mode=rag_stats.get("retrieval_mode"),
+                lexical_latency_ms=rag_stats.get("lexical_latency_ms"),
+                lexical_hits=rag_stats.get("lexical_hits"),
                 total_latency_ms=rag_stats.get("total_latency_ms", 0),
             )
 
@@ -153,39 +152,190 @@ async def search_knowledge_node(state: dict) -> dict:
     return {"context": context}
 
 
-async def generate_response_node(state: dict) -> dict:
-    """Generate the AI response using RAG context and conversation history."""
+async def _lookup_cached_response(
+    tenant_id: str, messages: list[dict]
+) -> tuple[str | None, tuple | None]:
+    """Consult the semantic response cache for single-shot turns.
+
+    Only the first user message of a conversation is eligible: later turns
+    depend on the conversation history, not just the tenant's knowledge base.
+    Returns (cached_response, entry) where ``entry`` is what is needed to
+    store the freshly generated answer on a miss, or None if not cacheable.
+    """
+    from app.services.knowledge_version import get_knowledge_version
+    from app.services.rag import _get_query_embedding
+    from app.services.response_cache import get_response_cache
+
+    cache = get_response_cache()
+    single_shot = len(messages) == 1 and messages[0].get("role") == "user"
+    if cache is None or not tenant_id or not single_shot:
+        return None, None
+
+    try:
+        version = await get_knowledge_version(tenant_id)
+        if version is None:
+            # Corpus version unknown: a hit could predate a knowledge change
+            return None, None
+        # Already computed by search_knowledge; served from the embedding cache
+        embedding = await _get_query_embedding(messages[0].get("content", ""))
+    except Exception:
+        logger.warning("Response cache lookup failed", exc_info=True)
+        return None, None
+
+    cached = cache.lookup(tenant_id, version, embedding)
     collector = get_collector()
     if collector:
-        collector.start_node("generate_response")
+        collector.record_response_cache(hit=cached is not None)
+    return cached, (cache, version, embedding)
+
 
+def build_prompt_messages(state: dict) -> list[BaseMessage]:
+    """Build the generate_response prompt in a provider-cache friendly layout.
+
+    Static rules, summary and history form a prefix that is byte-identical to
+    the previous turn's prompt (plus the turns since); the per-turn retrieved
+    context goes last so it never breaks the cached prefix.
+    """
     spa_name = state.get("spa_name", "our med spa")
     context = state.get("context", "No information available.")
-    messages = state.get("messages", [])
 
-    system_prompt = CONCIERGE_SYSTEM_PROMPT.format(
-        spa_name=spa_name,
-        context=context,
-    )
-
-    llm_messages = [SystemMessage(content=system_prompt)]
-    for msg in messages:
+    llm_messages: list[BaseMessage] = [
+        SystemMessage(content=CONCIERGE_SYSTEM_PROMPT.format(spa_name=spa_name))
+    ]
+    summary = state.get("summary")
+    if summary:
+        llm_messages.append(
+            SystemMessage(content=f"Summary of the earlier conversation: {summary}")
+        )
+    messages = state.get("messages", [])
+    for msg in select_prompt_messages(messages, state.get("summarized_count", 0)):
         if msg["role"] == "user":
             llm_messages.append(HumanMessage(content=msg["content"]))
         elif msg["role"] == "assistant":
-            from langchain_core.messages import AIMessage
             llm_messages.append(AIMessage(content=msg["content"]))
+    llm_messages.append(SystemMessage(content=CONCIERGE_CONTEXT_PROMPT.format(context=context)))
+    return llm_messages
+
+
+async def generate_response_node(state: dict) -> dict:
+    """Generate the AI response using RAG context and conversation history.
+
+    The LLM is streamed so that ``graph.astream(stream_mode="messages")`` can
+    forward tokens to the client while the node is still running.
+    """
+    collector = get_collector()
+    if collector:
+        collector.start_node("generate_response")
+
+    messages = state.get("messages", [])
+    tenant_id = state.get("tenant_id", "")
+
+    cache_hit, cache_entry = await _lookup_cached_response(tenant_id, messages)
+    if cache_hit is not None:
+        if collector:
+            collector.end_node("generate_response")
+        return {"response": cache_hit}
+
+    llm_messages = build_prompt_messages(state)
 
     llm = _get_llm()
-    response = await instrumented_ainvoke(llm, llm_messages, "generate_response")
+    response = await instrumented_astream(llm, llm_messages, "generate_response")
     response_text = response.content
 
+    if cache_entry is not None:
+        cache, version, embedding = cache_entry
+        cache.store(tenant_id, version, embedding, response_text)
+
     if collector:
         collector.end_node("generate_response")
 
     return {"response": response_text}
 
 
+async def answer_node(state: dict) -> dict:
+    """Retrieve knowledge and generate the response as a single graph branch.
+
+    Used by the parallel graph, where this branch runs alongside
+    check_escalation. If escalation is signalled first, the in-flight
+    retrieval/LLM stream is cancelled and an empty response is returned
+    (escalate_node supplies the safe response).
+    """
+
+    async def _answer() -> dict:
+        update = await search_knowledge_node(state)
+        generated = await generate_response_node({**state, **update})
+        return {**update, **generated}
+
+    signal = _escalation_signal_ctx.get()
+    if signal is None:
+        return await _answer()
+
+    answer_task = asyncio.ensure_future(_answer())
+    signal_task = asyncio.ensure_future(signal.wait())
+    try:
+        await asyncio.wait({answer_task, signal_task}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        signal_task.cancel()
+
+    if answer_task.done():
+        return answer_task.result()
+
+    answer_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await answer_task
+
+    collector = get_collector()
+    if collector:
+        collector.end_node("search_knowledge")
+        collector.end_node("generate_response")
+
+    logger.debug("Response generation cancelled by escalation")
+    return {"response": ""}
+
+
+async def _tenant_config(tenant_id: str):
+    """Tenant config for a node; the router has already warmed the cache for this turn."""
+    from app.services.tenant_config import TenantConfig, get_tenant_config_cache
+
+    if not tenant_id:
+        return TenantConfig.defaults()
+    cache = get_tenant_config_cache()
+    hit, info = cache.lookup(tenant_id)
+    if hit:
+        return info.config if info is not None else TenantConfig.defaults()
+
+    from app.services.unit_of_work import turn_session
+
+    async with turn_session(release=True) as db:
+        return await cache.get(db, tenant_id)
+
+
+# SAFE (or anything unrecognised) means no escalation
+_CLASSIFICATION_REASONS = {"MEDICAL": "medical_question", "ESCALATE": "ai_unsure"}
+
+
+async def _centroid_prediction(tenant_id: str, message: str):
+    """(query embedding, centroid prediction) for the escalation pre-classifier.
+
+    The embedding is the one search_knowledge computes for RAG (embedding
+    cache / shared in-flight request), so without a tenant there is none and
+    the layer is skipped. It is returned even when no classifier is loaded
+    yet: kept with sampled LLM decisions, annotated rows become centroid examples.
+    """
+    from app.services.escalation_centroids import get_centroid_store
+    from app.services.rag import _get_query_embedding
+
+    if not settings.escalation_centroid_enabled or not tenant_id:
+        return None, None
+    try:
+        embedding = await _get_query_embedding(message)
+    except Exception:
+        logger.warning("Query embedding for escalation pre-classifier failed", exc_info=True)
+        return None, None
+    classifier = get_centroid_store().get()
+    return embedding, classifier.classify(embedding) if classifier is not None else None
+
+
 async def check_escalation_node(state: dict) -> dict:
     """Check if the conversation requires escalation."""
     collector = get_collector()
@@ -210,79 +360,86 @@ async def check_escalation_node(state: dict) -> dict:
             collector.end_node("check_escalation")
         return {"should_escalate": False, "escalation_reason": None}
 
-    # Layer 1: Keyword/pattern matching (fast, deterministic)
-    pattern_checks = [
-        (_EMERGENCY_PATTERNS, "emergency", "emergency"),
-        (_COMPLAINT_PATTERNS, "complaint", "complaint"),
-        (_HUMAN_REQUEST_PATTERNS, "patient_request", "human_request"),
-        (_MEDICAL_ADVICE_PATTERNS, "medical_question", "medical_advice"),
-    ]
-
-    for pattern, reason, pattern_name in pattern_checks:
-        match = pattern.search(last_user_msg)
-        if match:
+    # Layer 1: Keyword/pattern matching (fast, deterministic), all categories in one pass
+    config = await _tenant_config(state.get("tenant_id", ""))
+    matches = get_pattern_engine(config.escalation_rules).scan(last_user_msg)
+    if matches:
+        reason = matches[0].reason
+        latency = int((time.perf_counter() - escalation_start) * 1000)
+        if collector:
+            collector.record_escalation_decision(
+                detection_method="regex",
+                should_escalate=True,
+                # Most urgent first; the first category decides the reason
+                pattern_matched=",".join(m.category for m in matches),
+                escalation_reason=reason,
+                latency_ms=latency,
+            )
+            collector.end_node("check_escalation")
+        _signal_escalation()
+        return {"should_escalate": True, "escalation_reason": reason}
+
+    # Layer 2: nearest labelled centroid on the query embedding RAG already computed
+    embedding, prediction = await _centroid_prediction(state.get("tenant_id", ""), last_user_msg)
+    centroid_fields: dict = {}
+    audited = False
+    if prediction is not None:
+        centroid_fields = {
+            "centroid_label": prediction.label,
+            "centroid_margin": prediction.margin,
+            "centroid_confident": prediction.confident,
+        }
+        # A small audit sample of confident predictions still goes to the LLM
+        audited = prediction.confident and (
+            random.random() < settings.escalation_centroid_audit_rate  # noqa: S311 -- sampling
+        )
+        if prediction.confident and not audited:
+            reason = _CLASSIFICATION_REASONS.get(prediction.label)
             latency = int((time.perf_counter() - escalation_start) * 1000)
             if collector:
                 collector.record_escalation_decision(
-                    detection_method="regex",
-                    should_escalate=True,
-                    pattern_matched=pattern_name,
+                    detection_method="embedding",
+                    should_escalate=reason is not None,
                     escalation_reason=reason,
                     latency_ms=latency,
+                    **centroid_fields,
                 )
                 collector.end_node("check_escalation")
+            if reason is None:
+                return {"should_escalate": False, "escalation_reason": None}
+            _signal_escalation()
             return {"should_escalate": True, "escalation_reason": reason}
 
-    # Layer 2: LLM classification for subtle cases
+    # Layer 3: LLM classification for subtle cases. The same structured call
+    # classifies intent/urgency/summary, so create_lead needs no call of its own.
     try:
-        llm = _get_llm()
-        classification_prompt = (
-            "You are a medical safety classifier for a med spa AI chatbot. "
-            "Analyze the following patient message and classify it as one of:\n"
-            "- SAFE: General inquiry about services, pricing, scheduling, etc.\n"
-            "- MEDICAL: Patient is asking for medical advice, diagnosis, or "
-            "describing symptoms that need professional attention.\n"
-            "- ESCALATE: Patient needs human attention for other reasons.\n\n"
-            f"Patient message: {last_user_msg}\n\n"
-            "Respond with ONLY one word: SAFE, MEDICAL, or ESCALATE."
-        )
-        result = await instrumented_ainvoke(
-            llm, [HumanMessage(content=classification_prompt)], "check_escalation"
-        )
-        classification = result.content.strip().upper()
+        classification = await classify_turn(_get_llm(), last_user_msg, "check_escalation")
+        reason = _CLASSIFICATION_REASONS.get(classification.escalation)
 
         latency = int((time.perf_counter() - escalation_start) * 1000)
+        if collector:
+            # The (PHI-derived) embedding is only kept for the annotation sample
+            sampled = audited or (
+                random.random() < settings.escalation_centroid_label_sample_rate  # noqa: S311
+            )
+            collector.record_escalation_decision(
+                detection_method="llm",
+                should_escalate=reason is not None,
+                llm_classification=classification.escalation,
+                escalation_reason=reason,
+                latency_ms=latency,
+                message_embedding=embedding if sampled else None,
+                **centroid_fields,
+            )
+            collector.end_node("check_escalation")
 
-        if classification == "MEDICAL":
-            if collector:
-                collector.record_escalation_decision(
-                    detection_method="llm",
-                    should_escalate=True,
-                    llm_classification="MEDICAL",
-                    escalation_reason="medical_question",
-                    latency_ms=latency,
-                )
-                collector.end_node("check_escalation")
-            return {"should_escalate": True, "escalation_reason": "medical_question"}
-        elif classification == "ESCALATE":
-            if collector:
-                collector.record_escalation_decision(
-                    detection_method="llm",
-                    should_escalate=True,
-                    llm_classification="ESCALATE",
-                    escalation_reason="ai_unsure",
-                    latency_ms=latency,
-                )
-                collector.end_node("check_escalation")
-            return {"should_escalate": True, "escalation_reason": "ai_unsure"}
-        else:
-            if collector:
-                collector.record_escalation_decision(
-                    detection_method="llm",
-                    should_escalate=False,
-                    llm_classification=classification,
-                    latency_ms=latency,
-                )
+        if reason is not None:
+            _signal_escalation()
+        return {
+            "should_escalate": reason is not None,
+            "escalation_reason": reason,
+            "classification": classification.lead_fields(last_user_msg),
+        }
     except Exception:
         logger.exception("LLM escalation classification failed")
 
@@ -294,8 +451,8 @@ async def check_escalation_node(state: dict) -> dict:
 
 async def escalate_node(state: dict) -> dict:
     """Handle escalation -- create record and return safe response."""
-    from app.database import async_session_factory
     from app.services.notification import InAppNotifier
+    from app.services.unit_of_work import turn_session
 
     collector = get_collector()
     if collector:
@@ -308,14 +465,33 @@ async def escalate_node(state: dict) -> dict:
     safe_response = _ESCALATION_RESPONSES.get(reason, _ESCALATION_RESPONSES["ai_unsure"])
 
     if conversation_id and tenant_id:
+        escalation_id = None
         try:
             import uuid
 
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+            from app.models.conversation import Channel, Conversation
             from app.models.escalation import Escalation, EscalationReason, EscalationStatus
 
             reason_enum = EscalationReason(reason)
 
-            async with async_session_factory() as db:
+            # Committed on its own before the safe response is sent, not with
+            # the rest of the turn: staff must hear about it even if saving the
+            # transcript fails or the client disconnects
+            async with turn_session(release=True) as db:
+                # A new conversation is otherwise only inserted with the transcript
+                await db.execute(
+                    pg_insert(Conversation)
+                    .values(
+                        id=uuid.UUID(conversation_id),
+                        tenant_id=tenant_id,
+                        channel=Channel.WEB_CHAT,
+                        transcript=[],
+                        message_count=0,
+                    )
+                    .on_conflict_do_nothing(index_elements=[Conversation.id])
+                )
                 escalation = Escalation(
                     id=uuid.uuid4(),
                     tenant_id=tenant_id,
@@ -328,16 +504,19 @@ async def escalate_node(state: dict) -> dict:
                     ),
                 )
                 db.add(escalation)
-                await db.commit()
+            escalation_id = escalation.id
+        except Exception:
+            logger.exception("Failed to create escalation record")
 
-                notifier = InAppNotifier()
-                await notifier.notify_escalation(
+        if escalation_id is not None:
+            try:
+                await InAppNotifier().notify_escalation(
                     tenant_id=tenant_id,
-                    escalation_id=str(escalation.id),
+                    escalation_id=str(escalation_id),
                     reason=reason,
                 )
-        except Exception:
-            logger.exception("Failed to create escalation record")
+            except Exception:
+                logger.exception("Failed to notify staff of escalation %s", escalation_id)
 
     if collector:
         collector.end_node("escalate")
@@ -346,101 +525,29 @@ async def escalate_node(state: dict) -> dict:
 
 
 async def create_lead_node(state: dict) -> dict:
-    """Create or update a lead from the conversation."""
-    from app.database import async_session_factory
-    from app.services.lead_service import LeadService
+    """Describe the lead capture for this turn.
 
+    The capture itself (classification if needed, lead write) runs after the
+    response is sent: the chat router records ``state["lead_capture"]`` with the
+    turn and enqueues it on the ``follow_up`` queue once the turn has committed.
+    """
     collector = get_collector()
     if collector:
         collector.start_node("create_lead")
 
     tenant_id = state.get("tenant_id", "")
-    conversation_id = state.get("conversation_id")
-    lead_id = state.get("lead_id")
     messages = state.get("messages", [])
-
-    if not tenant_id or not messages:
-        if collector:
-            collector.end_node("create_lead")
-        return {}
-
     user_messages = [m for m in messages if m.get("role") == "user"]
-    if not user_messages:
-        if collector:
-            collector.end_node("create_lead")
-        return {}
-
-    last_msg = user_messages[-1].get("content", "")
-    if len(last_msg.strip()) < 10:
-        if collector:
-            collector.end_node("create_lead")
-        return {}
+    last_msg = user_messages[-1].get("content", "") if user_messages else ""
 
-    try:
-        llm = _get_llm()
-        classify_prompt = (
-            "Analyze this patient message from a med spa chat and respond in exactly this format:\n"
-            "INTENT: <one of: appointment, pricing, treatment_info,"
-            " complaint, general, emergency>\n"
-            "URGENCY: <1-5 where 1=low, 5=critical>\n"
-            "SUMMARY: <one sentence summary of what the patient wants>\n\n"
-            f"Patient message: {last_msg}"
-        )
-        result = await instrumented_ainvoke(
-            llm, [HumanMessage(content=classify_prompt)], "create_lead"
-        )
-        text = result.content
-
-        intent = "general"
-        urgency = 2
-        summary = last_msg[:100]
-
-        for line in text.strip().split("\n"):
-            line = line.strip()
-            if line.upper().startswith("INTENT:"):
-                intent_val = line.split(":", 1)[1].strip().lower()
-                valid = ("appointment", "pricing", "treatment_info",
-                         "complaint", "general", "emergency")
-                if intent_val in valid:
-                    intent = intent_val
-            elif line.upper().startswith("URGENCY:"):
-                import contextlib
-
-                with contextlib.suppress(ValueError, IndexError):
-                    urgency = min(
-                        5, max(1, int(line.split(":", 1)[1].strip()[0]))
-                    )
-            elif line.upper().startswith("SUMMARY:"):
-                summary = line.split(":", 1)[1].strip()
-
-        async with async_session_factory() as db:
-            lead_service = LeadService(db)
-            if lead_id:
-                lead = await lead_service.update_lead(
-                    tenant_id=tenant_id,
-                    lead_id=lead_id,
-                    intent=intent,
-                    summary=summary,
-                    urgency=urgency,
-                )
-            else:
-                lead = await lead_service.create_lead(
-                    tenant_id=tenant_id,
-                    source="web_chat",
-                    intent=intent,
-                    summary=summary,
-                    urgency=urgency,
-                    conversation_id=conversation_id,
-                )
-            await db.commit()
-            if lead:
-                if collector:
-                    collector.end_node("create_lead")
-                return {"lead_id": str(lead.id), "intent": intent}
-    except Exception:
-        logger.exception("Failed to create/update lead")
+    update: dict = {}
+    if tenant_id and len(last_msg.strip()) >= 10:
+        classification = state.get("classification")
+        update = {"lead_capture": {"message": last_msg, "classification": classification}}
+        if classification is not None:
+            update["intent"] = classification["intent"]
 
     if collector:
         collector.end_node("create_lead")
 
-    return {}
+    return update
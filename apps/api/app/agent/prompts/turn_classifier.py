@@ -0,0 +1,24 @@
+"""Prompt for the combined per-turn classifier (escalation + lead intent)."""
+
+TURN_CLASSIFIER_PROMPT = """You are a medical safety and intake classifier for a med spa AI chatbot.
+Classify the following patient message.
+
+escalation:
+- SAFE: General inquiry about services, pricing, scheduling, etc.
+- MEDICAL: Patient is asking for medical advice, diagnosis, or describing symptoms that \
+need professional attention.
+- ESCALATE: Patient needs human attention for other reasons.
+
+intent:
+- appointment: Wants to schedule, reschedule, or cancel an appointment
+- pricing: Asking about costs or payment
+- treatment_info: Asking about a specific treatment or service
+- complaint: Expressing dissatisfaction
+- emergency: Describing a medical concern that needs immediate attention
+- general: Other inquiries
+
+urgency: 1-5 where 1=low, 5=critical
+
+summary: One sentence summary of what the patient wants.
+
+Patient message: {message}"""
@@ -0,0 +1,74 @@
+"""Process-wide registry of compiled LangGraph graphs.
+
+Building and compiling a StateGraph walks every node and edge, validates the
+topology and allocates channel objects, so doing it per chat message is pure
+overhead. The registry compiles each variant once (at app startup via the
+FastAPI lifespan) and hands the same compiled graph to every request.
+
+A compiled graph without a checkpointer keeps no per-invocation state on the
+instance -- each ``ainvoke``/``astream`` call builds its own channels -- so a
+single instance is safe to share across concurrent requests.
+"""
+
+import logging
+import threading
+from collections.abc import Callable
+
+from langgraph.graph.state import CompiledStateGraph
+
+from app.agent.graph import build_concierge_graph, build_parallel_concierge_graph
+
+logger = logging.getLogger(__name__)
+
+CONCIERGE = "concierge"
+CONCIERGE_PARALLEL = "concierge_parallel"
+
+_BUILDERS: dict[str, Callable[[], CompiledStateGraph]] = {
+    CONCIERGE: build_concierge_graph,
+    CONCIERGE_PARALLEL: build_parallel_concierge_graph,
+}
+
+
+class GraphRegistry:
+    """Compile-once cache of graph variants keyed by name."""
+
+    def __init__(self, builders: dict[str, Callable[[], CompiledStateGraph]]):
+        self._builders = builders
+        self._graphs: dict[str, CompiledStateGraph] = {}
+        self._lock = threading.Lock()
+
+    def compile_all(self) -> None:
+        """Eagerly compile every registered variant (called from the app lifespan)."""
+        for name in self._builders:
+            self.get(name)
+        logger.info("Compiled agent graphs: %s", ", ".join(sorted(self._graphs)))
+
+    def get(self, name: str = CONCIERGE) -> CompiledStateGraph:
+        """Return the shared compiled graph, compiling it on first use."""
+        graph = self._graphs.get(name)
+        if graph is not None:
+            return graph
+
+        builder = self._builders.get(name)
+        if builder is None:
+            raise KeyError(f"Unknown graph variant: {name}")
+
+        # Double-checked so concurrent first requests (or Celery threads) compile once
+        with self._lock:
+            graph = self._graphs.get(name)
+            if graph is None:
+                graph = builder()
+                self._graphs[name] = graph
+        return graph
+
+    def clear(self) -> None:
+        """Drop compiled graphs (used on shutdown and in tests)."""
+        with self._lock:
+            self._graphs.clear()
+
+
+graph_registry = GraphRegistry(_BUILDERS)
+
+
+def get_graph(name: str = CONCIERGE) -> CompiledStateGraph:
+    return graph_registry.get(name)
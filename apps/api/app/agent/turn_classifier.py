@@ -0,0 +1,50 @@
+"""Combined per-turn classification of the last user message.
+
+check_escalation and create_lead used to send separate prompts about the
+same message (one word for escalation; INTENT/URGENCY/SUMMARY lines for the
+lead). One structured call now returns all four fields. check_escalation
+makes it in its LLM layer and passes the lead fields on in
+``ConciergeState.classification``; post-response lead capture
+(``app.services.lead_capture``) only classifies on its own when escalation
+was decided without the LLM.
+"""
+
+from typing import Literal
+
+from langchain_core.messages import HumanMessage
+from pydantic import BaseModel, Field
+
+from app.agent.instrumented_llm import instrumented_structured
+from app.agent.prompts.turn_classifier import TURN_CLASSIFIER_PROMPT
+
+LeadIntentLabel = Literal[
+    "appointment", "pricing", "treatment_info", "complaint", "general", "emergency"
+]
+
+
+# Sent to the model as the response schema (docstring included). Every field
+# is required so OpenAI's strict JSON-schema mode accepts it.
+class TurnClassification(BaseModel):
+    """Classification of one patient message from a med spa chat."""
+
+    escalation: Literal["SAFE", "MEDICAL", "ESCALATE"]
+    intent: LeadIntentLabel
+    # Range is stated in the prompt and clamped here: strict mode rejects minimum/maximum
+    urgency: int = Field(description="1-5 where 1=low, 5=critical")
+    summary: str = Field(description="One sentence summary of what the patient wants")
+
+    def lead_fields(self, message: str) -> dict:
+        """intent/urgency/summary as create_lead stores them."""
+        return {
+            "intent": self.intent,
+            "urgency": min(5, max(1, self.urgency)),
+            "summary": self.summary.strip() or message[:100],
+        }
+
+
+async def classify_turn(llm, message: str, node_name: str) -> TurnClassification:
+    """One structured LLM call; recorded in LLMCallMetric under ``node_name``."""
+    prompt = TURN_CLASSIFIER_PROMPT.format(message=message)
+    return await instrumented_structured(
+        llm, TurnClassification, [HumanMessage(content=prompt)], node_name
+    )
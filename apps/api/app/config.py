@@ -17,6 +17,7 @@ class Settings(BaseSettings):
 
     # Redis
     redis_url: str = "redis://localhost:6379/0"
+    redis_socket_timeout_seconds: float = 0.5
 
     # Clerk Auth
     clerk_secret_key: str = ""
@@ -46,6 +47,96 @@ class Settings(BaseSettings):
 
     # OpenAI
     openai_api_key: str = ""
+    # Shared httpx pool used by every ChatOpenAI / OpenAIEmbeddings instance
+    openai_max_connections: int = 100
+    openai_max_keepalive_connections: int = 20
+    openai_keepalive_expiry_seconds: float = 30.0
+    openai_timeout_seconds: float = 60.0
+    openai_connect_timeout_seconds: float = 5.0
+    openai_max_retries: int = 2
+
+    # Ingestion embedding pipeline
+    embedding_batch_max_tokens: int = 40_000
+    embedding_batch_max_items: int = 256
+    embedding_max_concurrency: int = 4
+    embedding_max_retries: int = 5
+    embedding_backoff_base_seconds: float = 1.0
+    # A processing job whose progress (updated_at) is older than this is presumed
+    # orphaned by a worker crash and can be retried
+    ingestion_stale_after_seconds: int = 15 * 60
+
+    # Retrieval defaults; tenants override them via PATCH /settings
+    rag_similarity_threshold: float = 0.78
+    rag_top_k: int = 5
+    # Upper bound on staleness of cached tenant config if a pub/sub invalidation is missed
+    tenant_config_ttl_seconds: int = 60
+    # Unknown tenant ids (bad widget embeds) are remembered for this long
+    tenant_config_negative_ttl_seconds: int = 30
+    # LRU bound: the public chat endpoint accepts any tenant id string
+    tenant_config_cache_max_entries: int = 10_000
+
+    # "vector" (embedding search only) or "hybrid" (opt-in: vector + full-text, fused
+    # with RRF; full-text hits must still pass the similarity threshold)
+    rag_retrieval_mode: str = "vector"
+    rag_rrf_k: int = 60
+
+    # HNSW candidate list size for retrieval (pgvector default is 40; raised to top_k if lower)
+    rag_hnsw_ef_search: int = 40
+
+    # Query embedding cache (in-process LRU + optional shared Redis tier)
+    embedding_cache_enabled: bool = True
+    embedding_cache_max_entries: int = 10_000
+    embedding_cache_ttl_seconds: int = 7 * 24 * 3600
+    embedding_cache_redis_enabled: bool = False
+
+    # Semantic response cache for single-shot FAQ turns (opt-in)
+    response_cache_enabled: bool = False
+    response_cache_similarity: float = 0.97
+    response_cache_ttl_seconds: int = 24 * 3600
+    response_cache_max_entries_per_tenant: int = 500
+
+    # Share knowledge-base version stamps across processes. Ingestion runs in the
+    # Celery worker, so API-side caches only see its bumps through Redis.
+    knowledge_version_redis_enabled: bool = True
+
+    # In-process NumPy retrieval for small tenant corpora (opt-in; falls back to pgvector)
+    rag_memory_index_enabled: bool = False
+    rag_memory_index_max_bytes: int = 256 * 1024 * 1024
+    rag_memory_index_max_chunks_per_tenant: int = 5000
+
+    # Agent
+    # Most recent messages loaded into the graph state for each chat turn
+    chat_history_max_messages: int = 20
+    # Turns sent to the LLM verbatim; older ones are folded into Conversation.summary
+    chat_memory_window_turns: int = 4
+    # Summarize once at least this many messages have left the window
+    chat_summary_min_new_messages: int = 4
+    # "concierge" checks escalation before generation; "concierge_parallel" runs them
+    # concurrently (opt-in: answer tokens are held until the escalation check resolves)
+    chat_graph_variant: str = "concierge"
+
+    # Escalation: nearest-centroid pre-classifier in front of the LLM layer
+    escalation_centroid_enabled: bool = True
+    # Best label must beat the runner-up by this cosine margin to skip the LLM
+    escalation_centroid_margin: float = 0.05
+    escalation_centroid_min_similarity: float = 0.35
+    # Confirmed (correct=true) examples required per label before the layer activates
+    escalation_centroid_min_examples: int = 20
+    # Share of confident predictions still sent to the LLM to measure disagreement
+    escalation_centroid_audit_rate: float = 0.05
+    escalation_centroid_refresh_seconds: int = 3600
+    # Query embeddings are PHI-derived: they are kept only for audited decisions and
+    # this share of other LLM decisions (the annotation sample), and purged daily --
+    # unlabelled ones after the first window, labelled examples after the second
+    escalation_centroid_label_sample_rate: float = 0.1
+    escalation_embedding_unlabelled_retention_days: int = 14
+    escalation_embedding_retention_days: int = 180
+
+    # Lead reclassification memo: reuse a conversation's lead classification
+    # until new intent keywords appear or this many user turns have passed
+    lead_memo_max_turns: int = 5
+    # A capture still pending after this long failed or was lost; stop reporting it
+    lead_capture_pending_timeout_seconds: int = 300
 
     # Twilio
     twilio_account_sid: str = ""
@@ -1,13 +1,64 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from pgvector import Vector
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.config import settings
 
+
+def encode_vector(value: str | list[float] | Vector) -> bytes:
+    """Encode a vector parameter in pgvector's binary wire format.
+
+    Raw SQL binds plain float lists; ORM ``Vector`` columns bind their text
+    form (``"[0.1,0.2,...]"``), which is parsed back so both keep working.
+    """
+    if isinstance(value, str):
+        value = [float(v) for v in value[1:-1].split(",")] if value != "[]" else []
+    if not isinstance(value, Vector):
+        value = Vector(value)
+    return value.to_binary()
+
+
+def decode_vector(data: bytes) -> Vector:
+    return Vector.from_binary(data)
+
+
+async def _set_vector_codec(conn) -> None:
+    try:
+        await conn.set_type_codec(
+            "vector",
+            schema="public",
+            encoder=encode_vector,
+            decoder=decode_vector,
+            format="binary",
+        )
+    except ValueError as e:
+        # Fresh database before the pgvector extension is created
+        if not str(e).startswith("unknown type"):
+            raise
+
+
+def register_vector_codec(engine: AsyncEngine) -> None:
+    """Send and receive pgvector values in binary on every new asyncpg connection."""
+    if engine.dialect.driver != "asyncpg":
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        dbapi_connection.run_async(_set_vector_codec)
+
+
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_size=20,
     max_overflow=10,
 )
+register_vector_codec(engine)
 
 async_session_factory = async_sessionmaker(
     engine,
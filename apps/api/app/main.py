@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
@@ -31,8 +33,22 @@ limiter = Limiter(key_func=get_remote_address, default_limits=["60/minute"])
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     # Startup
+    from app.agent.registry import graph_registry
+    from app.services.llm_clients import close_llm_clients, init_llm_clients
+    from app.services.redis_client import close_redis
+    from app.services.tenant_config import run_invalidation_listener
+
+    await init_llm_clients()
+    graph_registry.compile_all()
+    tenant_config_listener = asyncio.create_task(run_invalidation_listener())
     yield
     # Shutdown
+    tenant_config_listener.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await tenant_config_listener
+    graph_registry.clear()
+    await close_llm_clients()
+    await close_redis()
 
 
 def create_app() -> FastAPI:
@@ -1,6 +1,8 @@
 from app.models.base import Base
 from app.models.conversation import Conversation
+from app.models.conversation_message import ConversationMessage
 from app.models.escalation import Escalation
+from app.models.ingestion_job import IngestionJob
 from app.models.knowledge_document import KnowledgeDocument
 from app.models.lead import Lead
 from app.models.metrics import (
@@ -10,6 +12,7 @@ from app.models.metrics import (
     RAGRetrievalMetric,
     SystemEvent,
 )
+from app.models.pending_lead_capture import PendingLeadCapture
 from app.models.tenant import Tenant
 
 __all__ = [
@@ -17,8 +20,11 @@ __all__ = [
     "Tenant",
     "Lead",
     "Conversation",
+    "ConversationMessage",
     "KnowledgeDocument",
     "Escalation",
+    "IngestionJob",
+    "PendingLeadCapture",
     "AgentRunMetric",
     "LLMCallMetric",
     "RAGRetrievalMetric",
@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import Enum, ForeignKey, String
+from sqlalchemy import Enum, ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -27,5 +27,13 @@ class Conversation(TenantModel):
         nullable=False,
     )
     external_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Legacy messages only; new ones are appended to conversation_messages
+    # (read both through the conversation_transcripts view)
     transcript: Mapped[list[dict]] = mapped_column(JSONB, default=list)
     summary: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Messages in the transcript (legacy + appended), and how many of the
+    # oldest ones are folded into ``summary``
+    message_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    summary_message_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    # Classification behind the linked lead (see app.services.lead_memo)
+    lead_memo: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
@@ -0,0 +1,85 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Identity,
+    Index,
+    MetaData,
+    String,
+    Table,
+    Text,
+    event,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+from app.models.conversation import Conversation
+
+
+class ConversationMessage(Base):
+    """One chat message, appended once and never rewritten.
+
+    Replaces rewriting ``Conversation.transcript`` on every turn. Messages are
+    ordered by ``id``; ``conversation_transcripts`` reassembles the full
+    transcript (legacy blob first) for API responses.
+    """
+
+    __tablename__ = "conversation_messages"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    conversation_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False
+    )
+    tenant_id: Mapped[str] = mapped_column(String, nullable=False)
+    role: Mapped[str] = mapped_column(String(16), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    # Never loaded; orders a new conversation's INSERT before its first messages
+    conversation: Mapped[Conversation] = relationship(lazy="raise")
+
+    __table_args__ = (Index("ix_conversation_messages_conversation_id", "conversation_id", "id"),)
+
+
+# Read-only compatibility view with the transcript shape ConversationResponse
+# has always returned: the legacy JSONB blob followed by appended messages.
+# Kept out of Base.metadata so create_all never tries to create it as a table.
+CONVERSATION_TRANSCRIPTS_VIEW_SQL = """
+    CREATE OR REPLACE VIEW conversation_transcripts AS
+    SELECT c.id AS conversation_id,
+           COALESCE(c.transcript, '[]'::jsonb) || COALESCE(m.messages, '[]'::jsonb)
+               AS transcript
+    FROM conversations c
+    LEFT JOIN LATERAL (
+        SELECT jsonb_agg(
+                   jsonb_build_object('role', cm.role, 'content', cm.content) ORDER BY cm.id
+               ) AS messages
+        FROM conversation_messages cm
+        WHERE cm.conversation_id = c.id
+    ) m ON true
+"""
+
+conversation_transcripts = Table(
+    "conversation_transcripts",
+    MetaData(),
+    Column("conversation_id", UUID(as_uuid=True), primary_key=True),
+    Column("transcript", JSONB),
+)
+
+event.listen(
+    ConversationMessage.__table__, "after_create", DDL(CONVERSATION_TRANSCRIPTS_VIEW_SQL)
+)
+event.listen(
+    ConversationMessage.__table__,
+    "before_drop",
+    DDL("DROP VIEW IF EXISTS conversation_transcripts"),
+)
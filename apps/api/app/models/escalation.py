@@ -2,9 +2,10 @@ import enum
 
 from sqlalchemy import Enum, ForeignKey, String, Text
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import TenantModel
+from app.models.conversation import Conversation
 
 
 class EscalationStatus(str, enum.Enum):
@@ -33,3 +34,7 @@ class Escalation(TenantModel):
     )
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     assigned_to: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    # Never loaded; declares the FK dependency so a flush inserts a new
+    # conversation before escalations staged against it in the same turn
+    conversation: Mapped[Conversation] = relationship(lazy="raise")
@@ -0,0 +1,37 @@
+import enum
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import TenantModel
+
+
+class IngestionStatus(str, enum.Enum):
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class IngestionJob(TenantModel):
+    """A knowledge base upload waiting for (or going through) the ingestion worker.
+
+    The raw upload is kept on the row so the Celery payload only carries the job
+    id; it is cleared once the document's chunks are committed.
+    """
+
+    __tablename__ = "ingestion_jobs"
+
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    doc_type: Mapped[str] = mapped_column(String, nullable=False)
+    filename: Mapped[str] = mapped_column(String, nullable=False)
+    raw_bytes: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
+    status: Mapped[str] = mapped_column(
+        String(16), nullable=False, default=IngestionStatus.QUEUED.value
+    )
+    total_chunks: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    chunks_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
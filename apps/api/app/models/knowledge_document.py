@@ -1,4 +1,5 @@
-from sqlalchemy import String, Text
+from sqlalchemy import Computed, Index, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 from pgvector.sqlalchemy import Vector
 
@@ -13,3 +14,17 @@ class KnowledgeDocument(TenantModel):
     doc_type: Mapped[str] = mapped_column(String, nullable=False)  # faq, treatment_menu, sop
     chunk_index: Mapped[int | None] = mapped_column(default=None)
     embedding: Mapped[list[float] | None] = mapped_column(Vector(1536), nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Lexical leg of hybrid retrieval; maintained by Postgres, never loaded by default
+    content_tsv: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('english', content)", persisted=True),
+        nullable=True,
+        deferred=True,
+    )
+
+    # HNSW indexes are partial, one per tenant (app.services.vector_index)
+    __table_args__ = (
+        Index("ix_knowledge_documents_tenant_title", "tenant_id", "title"),
+        Index("ix_knowledge_documents_content_tsv", "content_tsv", postgresql_using="gin"),
+    )
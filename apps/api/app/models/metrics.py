@@ -9,6 +9,7 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
+from pgvector.sqlalchemy import Vector
 from sqlalchemy import Boolean, DateTime, Index, Integer, Numeric, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
@@ -26,6 +27,7 @@ class AgentRunMetric(Base):
     conversation_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
 
     total_duration_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    time_to_first_token_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     node_sequence: Mapped[str | None] = mapped_column(String, nullable=True)
     node_durations: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     tools_invoked: Mapped[list | None] = mapped_column(JSONB, nullable=True)
@@ -34,6 +36,11 @@ class AgentRunMetric(Base):
 
     intent_detected: Mapped[str | None] = mapped_column(String(64), nullable=True)
     lead_created: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Where lead capture got intent/urgency/summary: "reused" (escalation's
+    # LLM call), "llm" (its own call) or "memo" (unchanged, no call)
+    lead_classification: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    response_cache_hit: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    db_checkouts: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     total_tokens: Mapped[int] = mapped_column(Integer, default=0)
     total_cost_usd: Mapped[Decimal] = mapped_column(Numeric(10, 6), default=0)
@@ -66,6 +73,8 @@ class LLMCallMetric(Base):
     prompt_tokens: Mapped[int] = mapped_column(Integer, default=0)
     completion_tokens: Mapped[int] = mapped_column(Integer, default=0)
     total_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    # Prompt tokens served from the provider's prompt cache (billed at the cached rate)
+    cached_tokens: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     cost_usd: Mapped[Decimal] = mapped_column(Numeric(10, 6), default=0)
     latency_ms: Mapped[int] = mapped_column(Integer, default=0)
@@ -108,7 +117,12 @@ class RAGRetrievalMetric(Base):
     threshold_violations: Mapped[int] = mapped_column(Integer, default=0)
 
     embedding_latency_ms: Mapped[int] = mapped_column(Integer, default=0)
+    embedding_cache_hit: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
     search_latency_ms: Mapped[int] = mapped_column(Integer, default=0)
+    search_backend: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    retrieval_mode: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    lexical_latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    lexical_hits: Mapped[int | None] = mapped_column(Integer, nullable=True)
     total_latency_ms: Mapped[int] = mapped_column(Integer, default=0)
 
     created_at: Mapped[datetime] = mapped_column(
@@ -132,11 +146,20 @@ class EscalationDecisionMetric(Base):
     agent_run_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
     conversation_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
 
-    detection_method: Mapped[str] = mapped_column(String(16), nullable=False)  # "regex" or "llm"
+    # "regex", "embedding" or "llm"
+    detection_method: Mapped[str] = mapped_column(String(16), nullable=False)
     pattern_matched: Mapped[str | None] = mapped_column(String(64), nullable=True)
     llm_classification: Mapped[str | None] = mapped_column(String(32), nullable=True)
     escalation_reason: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
+    # Centroid pre-classifier ("embedding" method when it decided without the LLM)
+    centroid_label: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    centroid_margin: Mapped[Decimal | None] = mapped_column(Numeric(5, 4), nullable=True)
+    centroid_confident: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    # Query embedding of audited/sampled LLM decisions; labelled rows become centroid
+    # examples. PHI-derived: purged by app.tasks.metrics_retention
+    message_embedding: Mapped[list[float] | None] = mapped_column(Vector(1536), nullable=True)
+
     should_escalate: Mapped[bool] = mapped_column(Boolean, default=False)
     confidence: Mapped[Decimal | None] = mapped_column(Numeric(3, 2), nullable=True)
 
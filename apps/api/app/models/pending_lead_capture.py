@@ -0,0 +1,35 @@
+import uuid
+
+from sqlalchemy import ForeignKey, Integer, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import TenantModel
+from app.models.conversation import Conversation
+
+
+class PendingLeadCapture(TenantModel):
+    """A chat turn's lead capture waiting for (or going through) the follow_up worker.
+
+    Written in the turn's transaction and deleted in the capture's, so a row
+    exists exactly while the capture is outstanding on any worker. The
+    message is kept on the row so the Celery payload only carries the id.
+    """
+
+    __tablename__ = "pending_lead_captures"
+
+    conversation_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("conversations.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    run_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    # intent/urgency/summary when the turn's escalation check already classified it
+    classification: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    # Conversation.message_count including the turn (orders captures of one conversation)
+    message_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Never loaded; orders a new conversation's INSERT before its capture
+    conversation: Mapped[Conversation] = relationship(lazy="raise")
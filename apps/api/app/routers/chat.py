@@ -1,21 +1,37 @@
 """Chat endpoint with SSE streaming."""
 
+import asyncio
 import json
 import logging
 import uuid
+from collections.abc import AsyncIterator
 
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from sqlalchemy import select
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import async_session_factory
 from app.models.conversation import Channel, Conversation
-from app.models.tenant import Tenant
-from app.schemas.chat import ChatRequest
+from app.models.conversation_message import ConversationMessage
+from app.models.pending_lead_capture import PendingLeadCapture
+from app.schemas.chat import ChatLeadStatus, ChatRequest
+from app.services.conversation_memory import (
+    ConversationMemory,
+    needs_summary_update,
+    schedule_summary_update,
+)
 from app.services.langfuse_client import get_langfuse
+from app.services.lead_capture import lead_capture_pending
 from app.services.metrics_collector import MetricsCollector, _metrics_ctx
+from app.services.tenant_config import TenantInfo, get_tenant_info
+from app.services.unit_of_work import UnitOfWork
+from app.tasks.lead_capture import capture_chat_lead
 from app.utils.pii import mask_pii
 
 chat_limiter = Limiter(key_func=get_remote_address)
@@ -24,104 +40,178 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Graph nodes whose LLM tokens are forwarded to the client
+# ("answer" wraps generate_response in the parallel graph)
+_STREAMING_NODES = frozenset({"generate_response", "answer"})
 
-async def _get_tenant(tenant_id: str) -> Tenant | None:
-    """Look up tenant by clerk_org_id or UUID."""
-    async with async_session_factory() as db:
-        # Try as clerk_org_id first
-        result = await db.execute(
-            select(Tenant).where(Tenant.clerk_org_id == tenant_id)
-        )
-        tenant = result.scalar_one_or_none()
-        if tenant:
-            return tenant
-
-        # Try as UUID
-        try:
-            uid = uuid.UUID(tenant_id)
-            result = await db.execute(select(Tenant).where(Tenant.id == uid))
-            return result.scalar_one_or_none()
-        except ValueError:
-            return None
-
-
-async def _get_or_create_conversation(
-    tenant_id: str, conversation_id: str | None
-) -> tuple[str, list[dict]]:
-    """Get existing conversation or create a new one. Returns (id, transcript)."""
-    async with async_session_factory() as db:
-        if conversation_id:
-            try:
-                uid = uuid.UUID(conversation_id)
-                result = await db.execute(
-                    select(Conversation).where(
-                        Conversation.id == uid,
-                        Conversation.tenant_id == tenant_id,
-                    )
-                )
-                conv = result.scalar_one_or_none()
-                if conv:
-                    return str(conv.id), conv.transcript or []
-            except ValueError:
-                pass
-
-        # Create new conversation
-        conv = Conversation(
-            id=uuid.uuid4(),
-            tenant_id=tenant_id,
-            channel=Channel.WEB_CHAT,
-            transcript=[],
-        )
-        db.add(conv)
-        await db.commit()
-        return str(conv.id), []
 
+def _sse(payload: dict) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
 
-async def _save_transcript(
-    conversation_id: str, transcript: list[dict], lead_id: str | None = None
-) -> None:
-    """Persist the updated transcript to the conversation."""
-    async with async_session_factory() as db:
-        uid = uuid.UUID(conversation_id)
-        result = await db.execute(
-            select(Conversation).where(Conversation.id == uid)
-        )
-        conv = result.scalar_one_or_none()
-        if conv:
-            conv.transcript = transcript
-            if lead_id:
-                conv.lead_id = uuid.UUID(lead_id)
-            await db.commit()
 
+async def _get_tenant(db: AsyncSession, tenant_id: str) -> TenantInfo | None:
+    """Look up tenant by clerk_org_id or UUID (cached; no DB query on a hit)."""
+    return await get_tenant_info(db, tenant_id)
 
-@router.post("/chat")
-@chat_limiter.limit("20/minute")
-async def create_chat(request: Request, body: ChatRequest) -> StreamingResponse:
-    """Create a new chat session with streaming response."""
-    # Determine tenant_id: from body (embed widget) or from auth state (dashboard)
-    tenant_id = body.tenant_id or getattr(request.state, "tenant_id", None)
-    if not tenant_id:
-        raise HTTPException(status_code=400, detail="tenant_id is required")
 
-    # Look up tenant for spa name
-    tenant = await _get_tenant(tenant_id)
-    spa_name = tenant.name if tenant else "our med spa"
+async def _load_conversation(
+    db: AsyncSession, tenant_id: str, conversation_id: str | None
+) -> tuple[str, list[dict], bool, ConversationMemory, str | None]:
+    """Load an existing conversation's recent history, or allocate an id for a new one.
 
-    # Get or create conversation
-    conversation_id, transcript = await _get_or_create_conversation(
-        tenant_id, body.conversation_id
+    Returns (id, history, exists, memory, lead_id), where history is at most the last
+    ``chat_history_max_messages`` messages: appended rows are read newest-first
+    with a LIMIT, and the legacy JSONB transcript is only fetched when those
+    don't fill the window. A new conversation is only inserted by
+    ``_append_messages`` with the rest of the turn's writes.
+    """
+    if conversation_id:
+        try:
+            uid = uuid.UUID(conversation_id)
+        except ValueError:
+            uid = None
+        if uid is not None:
+            result = await db.execute(
+                select(
+                    Conversation.id,
+                    Conversation.summary,
+                    Conversation.summary_message_count,
+                    Conversation.message_count,
+                    Conversation.lead_id,
+                    func.coalesce(func.jsonb_array_length(Conversation.transcript), 0).label(
+                        "legacy_count"
+                    ),
+                ).where(
+                    Conversation.id == uid,
+                    Conversation.tenant_id == tenant_id,
+                )
+            )
+            row = result.first()
+            if row:
+                memory = ConversationMemory(
+                    summary=row.summary,
+                    summary_message_count=row.summary_message_count,
+                    message_count=row.message_count,
+                )
+                history = await _load_history(db, row.id, row.legacy_count)
+                lead_id = str(row.lead_id) if row.lead_id else None
+                return str(row.id), history, True, memory, lead_id
+
+    return str(uuid.uuid4()), [], False, ConversationMemory(), None
+
+
+async def _load_history(
+    db: AsyncSession, conversation_uid: uuid.UUID, legacy_count: int
+) -> list[dict]:
+    limit = settings.chat_history_max_messages
+    result = await db.execute(
+        select(ConversationMessage.role, ConversationMessage.content)
+        .where(ConversationMessage.conversation_id == conversation_uid)
+        .order_by(ConversationMessage.id.desc())
+        .limit(limit)
     )
+    history = [{"role": role, "content": content} for role, content in reversed(result.all())]
 
-    # Add user message to transcript
-    transcript.append({"role": "user", "content": body.message})
+    if legacy_count and len(history) < limit:
+        legacy = await db.scalar(
+            select(Conversation.transcript).where(Conversation.id == conversation_uid)
+        )
+        history = list(legacy or [])[-(limit - len(history)):] + history
+    return history
 
-    async def generate():
-        from app.agent.graph import build_concierge_graph
 
-        # Set up metrics collector
-        collector = MetricsCollector(tenant_id, conversation_id)
-        token = _metrics_ctx.set(collector)
-        collector.start_run()
+async def _append_messages(
+    db: AsyncSession,
+    tenant_id: str,
+    conversation_id: str,
+    exists: bool,
+    messages: list[dict],
+) -> None:
+    """Append the turn's messages (creating the conversation on its first turn).
+
+    Existing messages are never rewritten; the conversation row itself only
+    gets its ``updated_at`` touched (the lead is linked by post-response
+    lead capture). On a first turn ``escalate_node`` may already have
+    committed the conversation with its escalation, so it is upserted.
+    """
+    uid = uuid.UUID(conversation_id)
+    if exists:
+        await db.execute(
+            update(Conversation)
+            .where(Conversation.id == uid)
+            .values(
+                updated_at=func.now(),
+                message_count=Conversation.message_count + len(messages),
+            )
+        )
+    else:
+        await db.execute(
+            pg_insert(Conversation)
+            .values(
+                id=uid,
+                tenant_id=tenant_id,
+                channel=Channel.WEB_CHAT,
+                transcript=[],
+                message_count=len(messages),
+            )
+            .on_conflict_do_update(
+                index_elements=[Conversation.id],
+                set_={
+                    "updated_at": func.now(),
+                    "message_count": Conversation.message_count + len(messages),
+                },
+            )
+        )
+    db.add_all(
+        ConversationMessage(
+            conversation_id=uid, tenant_id=tenant_id, role=m["role"], content=m["content"]
+        )
+        for m in messages
+    )
+    await db.flush()
+
+
+async def _enqueue_lead_capture(pending_id: uuid.UUID) -> None:
+    # Publishing is a blocking broker round trip; keep it off the event loop.
+    # The turn is already committed, so a broker failure only loses the lead,
+    # and the pending row stops counting after lead_capture_pending_timeout_seconds.
+    try:
+        await run_in_threadpool(capture_chat_lead.delay, str(pending_id))
+    except Exception:
+        logger.exception("Failed to enqueue lead capture %s", pending_id)
+
+
+async def _run_turn(
+    uow: UnitOfWork, tenant_id: str, user_message: str, requested_conversation_id: str | None
+) -> AsyncIterator[str]:
+    from app.agent.nodes import _escalation_signal_ctx
+    from app.agent.registry import get_graph
+
+    # Set up metrics collector
+    collector = MetricsCollector(tenant_id)
+    token = _metrics_ctx.set(collector)
+    collector.start_run()
+    signal_token = _escalation_signal_ctx.set(asyncio.Event())
+
+    conversation_id = requested_conversation_id
+    streamed_tokens = False
+
+    try:
+        async with uow.use() as db:
+            # Look up tenant for spa name
+            tenant = await _get_tenant(db, tenant_id)
+            (
+                conversation_id,
+                history,
+                conversation_exists,
+                memory,
+                lead_id,
+            ) = await _load_conversation(db, tenant_id, requested_conversation_id)
+        spa_name = tenant.name if tenant else "our med spa"
+        collector.set_conversation_id(conversation_id)
+
+        # The graph sees the recent history plus the new user message
+        transcript = history + [{"role": "user", "content": user_message}]
 
         # Set up Langfuse trace if enabled
         langfuse = get_langfuse()
@@ -130,97 +220,190 @@ async def create_chat(request: Request, body: ChatRequest) -> StreamingResponse:
                 trace = langfuse.trace(
                     name=f"chat-{conversation_id}",
                     user_id=tenant_id,
-                    input=mask_pii(body.message),
+                    input=mask_pii(user_message),
                 )
                 collector.set_langfuse_trace_id(trace.id)
             except Exception:
                 logger.debug("Failed to create Langfuse trace", exc_info=True)
 
-        graph = build_concierge_graph()
+        graph = get_graph(settings.chat_graph_variant)
 
         initial_state = {
             "messages": transcript,
+            "summary": memory.summary,
+            "summarized_count": memory.summarized_in(len(history)),
             "tenant_id": tenant_id,
             "spa_name": spa_name,
-            "lead_id": None,
+            "lead_id": lead_id,
             "conversation_id": conversation_id,
             "should_escalate": False,
             "escalation_reason": None,
+            "classification": None,
             "intent": None,
+            "lead_capture": None,
             "context": "",
             "response": "",
         }
 
-        try:
-            # Run the graph (non-streaming for now)
-            result = await graph.ainvoke(initial_state)
-
-            response_text = result.get("response", "")
-            lead_id = result.get("lead_id")
-            was_escalated = result.get("should_escalate", False)
-            intent = result.get("intent")
-
-            # Stream the response token by token
-            words = response_text.split(" ")
-            for i, word in enumerate(words):
-                token_str = word if i == 0 else " " + word
-                yield f"data: {json.dumps({'type': 'token', 'content': token_str})}\n\n"
+        result: dict = dict(initial_state)
+        escalated = False
+        # Tokens are held back until check_escalation has put its decision in
+        # state, so an answer that escalation replaces never reaches the client
+        escalation_resolved = False
+        held: list[str] = []
+
+        # Forward LLM tokens as they are generated; "updates" carries each
+        # node's state delta so we can rebuild the final state as we go.
+        async for mode, chunk in graph.astream(
+            initial_state, stream_mode=["messages", "updates"]
+        ):
+            if mode == "updates":
+                for node_update in chunk.values():
+                    if node_update:
+                        result.update(node_update)
+                escalated = escalated or bool(result.get("should_escalate"))
+                if "check_escalation" in chunk:
+                    escalation_resolved = True
+                    if held and not escalated:
+                        collector.mark_first_token()
+                        streamed_tokens = True
+                        yield _sse({"type": "token", "content": "".join(held)})
+                    held.clear()
+                continue
+
+            message, metadata = chunk
+            if escalated or metadata.get("langgraph_node") not in _STREAMING_NODES:
+                continue
+            content = message.content
+            if not isinstance(content, str) or not content:
+                continue
+            if not escalation_resolved:
+                held.append(content)
+                continue
+            if not streamed_tokens:
+                collector.mark_first_token()
+                streamed_tokens = True
+            yield _sse({"type": "token", "content": content})
+
+        response_text = result.get("response", "")
+        was_escalated = result.get("should_escalate", False)
+        intent = result.get("intent")
+        lead_capture = None if was_escalated else result.get("lead_capture")
+
+        if was_escalated and streamed_tokens:
+            # Last resort: escalation was flagged after tokens went out
+            yield _sse({"type": "replace", "content": response_text})
+        elif not streamed_tokens:
+            # Nothing was streamed (escalated, cached or non-streaming answer)
+            collector.mark_first_token()
+            yield _sse({"type": "token", "content": response_text})
+
+        # Stage this turn's messages and metrics, then commit the turn's writes in
+        # one transaction (an escalation was already committed by escalate_node)
+        async with uow.use() as db:
+            await _append_messages(
+                db,
+                tenant_id,
+                conversation_id,
+                conversation_exists,
+                [
+                    {"role": "user", "content": user_message},
+                    {"role": "assistant", "content": response_text},
+                ],
+            )
+            # Lead capture runs on the follow_up queue after the turn commits;
+            # the row marks it pending and carries the message to the worker
+            pending_capture = None
+            if lead_capture:
+                pending_capture = PendingLeadCapture(
+                    id=uuid.uuid4(),
+                    tenant_id=tenant_id,
+                    conversation_id=uuid.UUID(conversation_id),
+                    run_id=collector.run_id,
+                    message_count=memory.message_count + 2,
+                    **lead_capture,
+                )
+                db.add(pending_capture)
+                await db.flush()
+            # Metrics go in a savepoint: a failure there never loses the transcript
+            await collector.flush(
+                db,
+                final_node="escalate" if was_escalated else "create_lead",
+                was_escalated=was_escalated,
+                intent_detected=intent,
+                # Set by lead capture, in the same transaction as the lead
+                lead_created=False,
+                db_checkouts=uow.checkouts,
+                commit=False,
+            )
+        await uow.commit()
 
-            # Add assistant response to transcript
-            transcript.append({"role": "assistant", "content": response_text})
+        # Capture the lead after the response; lead_id is polled from /chat/{id}/lead
+        if pending_capture is not None:
+            await _enqueue_lead_capture(pending_capture.id)
 
-            # Save updated transcript
-            await _save_transcript(conversation_id, transcript, lead_id)
+        # Fold turns that just left the prompt window into the rolling summary
+        if needs_summary_update(memory.message_count + 2, memory.summary_message_count):
+            schedule_summary_update(uuid.UUID(conversation_id), collector.run_id)
 
-            # Flush metrics (non-blocking)
+        # Update Langfuse trace with output
+        if langfuse and collector._langfuse_trace_id:
             try:
-                async with async_session_factory() as metrics_db:
-                    await collector.flush(
-                        metrics_db,
-                        final_node="escalate" if was_escalated else "create_lead",
-                        was_escalated=was_escalated,
-                        intent_detected=intent,
-                        lead_created=lead_id is not None,
-                    )
+                langfuse.trace(
+                    id=collector._langfuse_trace_id,
+                    output=mask_pii(response_text),
+                    metadata={
+                        "was_escalated": was_escalated,
+                        "intent": intent,
+                        "lead_capture": lead_capture is not None,
+                        "total_tokens": collector._total_tokens,
+                    },
+                )
+                langfuse.flush()
             except Exception:
-                logger.exception("Failed to flush metrics")
-
-            # Update Langfuse trace with output
-            if langfuse and collector._langfuse_trace_id:
-                try:
-                    langfuse.trace(
-                        id=collector._langfuse_trace_id,
-                        output=mask_pii(response_text),
-                        metadata={
-                            "was_escalated": was_escalated,
-                            "intent": intent,
-                            "lead_created": lead_id is not None,
-                            "total_tokens": collector._total_tokens,
-                        },
-                    )
-                    langfuse.flush()
-                except Exception:
-                    logger.debug("Failed to finalize Langfuse trace", exc_info=True)
-
-            # Send done event with metadata
-            done_data = {
-                "type": "done",
-                "conversation_id": conversation_id,
-                "lead_id": lead_id,
-                "escalated": was_escalated,
-            }
-            yield f"data: {json.dumps(done_data)}\n\n"
-
-        except Exception:
-            logger.exception("Chat generation failed")
-            error_msg = (
-                "I apologize, but I'm having trouble responding right now. "
-                "Please try again or contact the spa directly for assistance."
-            )
-            yield f"data: {json.dumps({'type': 'token', 'content': error_msg})}\n\n"
-            yield f"data: {json.dumps({'type': 'error', 'conversation_id': conversation_id})}\n\n"
-        finally:
-            _metrics_ctx.reset(token)
+                logger.debug("Failed to finalize Langfuse trace", exc_info=True)
+
+        # Send done event with metadata
+        done_data = {
+            "type": "done",
+            "conversation_id": conversation_id,
+            # The conversation's lead as of this turn; a new or updated
+            # lead is captured afterwards while lead_pending is true
+            "lead_id": lead_id,
+            "lead_pending": lead_capture is not None,
+            "escalated": was_escalated,
+        }
+        yield _sse(done_data)
+
+    except Exception:
+        logger.exception("Chat generation failed")
+        error_msg = (
+            "I apologize, but I'm having trouble responding right now. "
+            "Please try again or contact the spa directly for assistance."
+        )
+        # Replace any partially streamed answer rather than appending to it
+        yield _sse({"type": "replace" if streamed_tokens else "token", "content": error_msg})
+        yield _sse({"type": "error", "conversation_id": conversation_id})
+    finally:
+        _escalation_signal_ctx.reset(signal_token)
+        _metrics_ctx.reset(token)
+
+
+@router.post("/chat")
+@chat_limiter.limit("20/minute")
+async def create_chat(request: Request, body: ChatRequest) -> StreamingResponse:
+    """Create a new chat session with streaming response."""
+    # Determine tenant_id: from body (embed widget) or from auth state (dashboard)
+    tenant_id = body.tenant_id or getattr(request.state, "tenant_id", None)
+    if not tenant_id:
+        raise HTTPException(status_code=400, detail="tenant_id is required")
+
+    async def generate():
+        # One session for the whole turn: the tenant/conversation reads share
+        # retrieval's checkout, and every write is committed once at the end
+        async with UnitOfWork(async_session_factory) as uow:
+            async for event in _run_turn(uow, tenant_id, body.message, body.conversation_id):
+                yield event
 
     return StreamingResponse(generate(), media_type="text/event-stream")
 
@@ -235,3 +418,35 @@ async def send_message(
     # Reuse the main chat handler with the conversation_id
     body.conversation_id = conversation_id
     return await create_chat(request, body)
+
+
+@router.get("/chat/{conversation_id}/lead")
+async def get_chat_lead(
+    conversation_id: str,
+    request: Request,
+    tenant_id: str | None = None,
+) -> ChatLeadStatus:
+    """Lead captured for a conversation (``pending`` while a capture is still running)."""
+    tenant_id = tenant_id or getattr(request.state, "tenant_id", None)
+    if not tenant_id:
+        raise HTTPException(status_code=400, detail="tenant_id is required")
+    try:
+        uid = uuid.UUID(conversation_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Conversation not found") from None
+
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(Conversation.lead_id).where(
+                Conversation.id == uid, Conversation.tenant_id == tenant_id
+            )
+        )
+        row = result.first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        pending = await lead_capture_pending(db, uid)
+    return ChatLeadStatus(
+        conversation_id=conversation_id,
+        lead_id=str(row.lead_id) if row.lead_id else None,
+        pending=pending,
+    )
@@ -4,14 +4,30 @@ import uuid
 
 from fastapi import APIRouter, HTTPException
 from sqlalchemy import func, select
+from sqlalchemy.orm import defer
 
 from app.deps import DbSession, TenantId
 from app.models.conversation import Conversation
+from app.models.conversation_message import conversation_transcripts
 from app.schemas.conversation import ConversationResponse, PaginatedConversationResponse
 
 router = APIRouter()
 
 
+def _to_response(conv: Conversation, transcript: list[dict] | None) -> ConversationResponse:
+    """Build the response with the transcript read from ``conversation_transcripts``."""
+    return ConversationResponse(
+        id=conv.id,
+        tenant_id=conv.tenant_id,
+        lead_id=conv.lead_id,
+        channel=conv.channel,
+        transcript=transcript or [],
+        summary=conv.summary,
+        created_at=conv.created_at,
+        updated_at=conv.updated_at,
+    )
+
+
 @router.get("/conversations", response_model=PaginatedConversationResponse)
 async def list_conversations(
     db: DbSession,
@@ -22,6 +38,7 @@ async def list_conversations(
     """List conversations for the current tenant."""
     result = await db.execute(
         select(Conversation)
+        .options(defer(Conversation.transcript))
         .where(Conversation.tenant_id == tenant_id)
         .order_by(Conversation.created_at.desc())
         .limit(limit)
@@ -29,6 +46,15 @@ async def list_conversations(
     )
     conversations = result.scalars().all()
 
+    transcripts: dict = {}
+    if conversations:
+        transcript_result = await db.execute(
+            select(conversation_transcripts).where(
+                conversation_transcripts.c.conversation_id.in_([c.id for c in conversations])
+            )
+        )
+        transcripts = dict(transcript_result.tuples().all())
+
     count_result = await db.execute(
         select(func.count(Conversation.id))
         .where(Conversation.tenant_id == tenant_id)
@@ -36,7 +62,7 @@ async def list_conversations(
     total = count_result.scalar_one()
 
     return PaginatedConversationResponse(
-        items=[ConversationResponse.model_validate(c) for c in conversations],
+        items=[_to_response(c, transcripts.get(c.id)) for c in conversations],
         total_count=total,
     )
 
@@ -50,12 +76,18 @@ async def get_conversation(
     """Get a conversation with full transcript."""
     uid = uuid.UUID(conversation_id)
     result = await db.execute(
-        select(Conversation).where(
+        select(Conversation, conversation_transcripts.c.transcript)
+        .join(
+            conversation_transcripts,
+            conversation_transcripts.c.conversation_id == Conversation.id,
+        )
+        .options(defer(Conversation.transcript))
+        .where(
             Conversation.id == uid,
             Conversation.tenant_id == tenant_id,
         )
     )
-    conv = result.scalar_one_or_none()
-    if not conv:
+    row = result.first()
+    if not row:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    return ConversationResponse.model_validate(conv)
+    return _to_response(row.Conversation, row.transcript)
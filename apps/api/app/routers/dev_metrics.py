@@ -14,6 +14,10 @@ def _cutoff(hours: int) -> datetime:
     return datetime.now(UTC) - timedelta(hours=hours)
 
 
+def _pct(part: int, whole: int) -> float:
+    return round(part / whole * 100, 2) if whole else 0.0
+
+
 # ---------- Overview ----------
 
 
@@ -42,7 +46,19 @@ async def dev_overview(
             " COALESCE(percentile_cont(0.95) WITHIN GROUP"
             " (ORDER BY total_duration_ms),0) as p95_latency,"
             " COALESCE(percentile_cont(0.99) WITHIN GROUP"
-            " (ORDER BY total_duration_ms),0) as p99_latency"
+            " (ORDER BY total_duration_ms),0) as p99_latency,"
+            " COALESCE(AVG(time_to_first_token_ms),0) as avg_ttft,"
+            " COALESCE(percentile_cont(0.95) WITHIN GROUP"
+            " (ORDER BY time_to_first_token_ms),0) as p95_ttft,"
+            " COALESCE(AVG(CASE WHEN response_cache_hit THEN 1.0 ELSE 0.0 END)"
+            " FILTER (WHERE response_cache_hit IS NOT NULL)*100,0)"
+            " as response_cache_hit_rate,"
+            " COALESCE(AVG(db_checkouts),0) as avg_db_checkouts,"
+            " COUNT(*) FILTER (WHERE lead_classification = 'memo') as lead_memo_hits,"
+            " COUNT(*) FILTER (WHERE lead_classification = 'llm') as lead_llm_calls,"
+            " (SELECT COUNT(*) FROM llm_call_metrics"
+            " WHERE created_at >= :cutoff AND agent_run_id IS NOT NULL)"
+            " as run_llm_calls"
             " FROM agent_run_metrics"
             " WHERE created_at >= :cutoff"
         ),
@@ -73,6 +89,22 @@ async def dev_overview(
         "p50_latency_ms": round(float(run_row.p50_latency), 1),
         "p95_latency_ms": round(float(run_row.p95_latency), 1),
         "p99_latency_ms": round(float(run_row.p99_latency), 1),
+        "avg_ttft_ms": round(float(run_row.avg_ttft), 1),
+        "p95_ttft_ms": round(float(run_row.p95_ttft), 1),
+        "response_cache_hit_rate": round(float(run_row.response_cache_hit_rate), 2),
+        "avg_db_checkouts": round(float(run_row.avg_db_checkouts), 2),
+        # LLM calls per chat turn (classification, answer, lead capture)
+        "avg_llm_calls_per_run": (
+            round(run_row.run_llm_calls / run_row.total_runs, 2) if run_row.total_runs else 0.0
+        ),
+        "avg_tokens_per_run": (
+            round(int(run_row.total_tokens) / run_row.total_runs, 1) if run_row.total_runs else 0.0
+        ),
+        # Lead reclassification calls the memo skipped, of those it would have made
+        "lead_memo_hits": run_row.lead_memo_hits,
+        "lead_reclassification_saved_rate": _pct(
+            run_row.lead_memo_hits, run_row.lead_memo_hits + run_row.lead_llm_calls
+        ),
     }
 
 
@@ -132,6 +164,8 @@ async def llm_breakdown(
         text(
             "SELECT model, COUNT(*) as calls,"
             " COALESCE(SUM(total_tokens),0) as tokens,"
+            " COALESCE(SUM(prompt_tokens),0) as prompt_tokens,"
+            " COALESCE(SUM(cached_tokens),0) as cached_tokens,"
             " COALESCE(SUM(cost_usd),0) as cost,"
             " COALESCE(AVG(latency_ms),0) as avg_latency,"
             " COALESCE(percentile_cont(0.95) WITHIN GROUP"
@@ -151,6 +185,13 @@ async def llm_breakdown(
             "model": row.model,
             "calls": row.calls,
             "tokens": int(row.tokens),
+            "cached_tokens": int(row.cached_tokens),
+            # Share of prompt tokens served from the provider's prompt cache
+            "prompt_cache_rate": (
+                round(float(row.cached_tokens) / float(row.prompt_tokens) * 100, 2)
+                if row.prompt_tokens
+                else 0.0
+            ),
             "cost": round(float(row.cost), 6),
             "avg_latency_ms": round(float(row.avg_latency), 1),
             "p95_latency_ms": round(float(row.p95_latency), 1),
@@ -297,7 +338,28 @@ async def rag_quality(
             " COALESCE(AVG(avg_similarity),0) as avg_similarity,"
             " COALESCE(AVG(CASE WHEN chunks_returned = 0"
             " THEN 1.0 ELSE 0.0 END)*100,0) as zero_result_rate,"
-            " COALESCE(AVG(chunks_returned),0) as avg_chunks"
+            " COALESCE(AVG(chunks_returned),0) as avg_chunks,"
+            " COALESCE(AVG(CASE WHEN embedding_cache_hit"
+            " THEN 1.0 ELSE 0.0 END) FILTER (WHERE embedding_cache_hit"
+            " IS NOT NULL)*100,0) as embedding_cache_hit_rate,"
+            " COALESCE(AVG(embedding_latency_ms) FILTER"
+            " (WHERE embedding_cache_hit),0) as embedding_latency_hit,"
+            " COALESCE(AVG(embedding_latency_ms) FILTER"
+            " (WHERE NOT embedding_cache_hit),0) as embedding_latency_miss,"
+            " COALESCE(AVG(CASE WHEN search_backend = 'memory'"
+            " THEN 1.0 ELSE 0.0 END) FILTER (WHERE search_backend"
+            " IS NOT NULL)*100,0) as memory_search_rate,"
+            " COALESCE(AVG(search_latency_ms) FILTER"
+            " (WHERE search_backend = 'memory'),0) as search_latency_memory,"
+            " COALESCE(AVG(search_latency_ms) FILTER"
+            " (WHERE search_backend = 'pgvector'),0) as search_latency_pgvector,"
+            " COALESCE(AVG(CASE WHEN retrieval_mode = 'hybrid'"
+            " THEN 1.0 ELSE 0.0 END) FILTER (WHERE retrieval_mode"
+            " IS NOT NULL)*100,0) as hybrid_rate,"
+            " COALESCE(AVG(lexical_latency_ms) FILTER"
+            " (WHERE retrieval_mode = 'hybrid'),0) as lexical_latency,"
+            " COALESCE(AVG(lexical_hits) FILTER"
+            " (WHERE retrieval_mode = 'hybrid'),0) as lexical_hits"
             " FROM rag_retrieval_metrics"
             " WHERE created_at >= :cutoff"
         ),
@@ -327,6 +389,15 @@ async def rag_quality(
         "avg_similarity": round(float(agg.avg_similarity), 4),
         "zero_result_rate": round(float(agg.zero_result_rate), 2),
         "avg_chunks": round(float(agg.avg_chunks), 1),
+        "embedding_cache_hit_rate": round(float(agg.embedding_cache_hit_rate), 2),
+        "avg_embedding_latency_hit_ms": round(float(agg.embedding_latency_hit), 1),
+        "avg_embedding_latency_miss_ms": round(float(agg.embedding_latency_miss), 1),
+        "memory_search_rate": round(float(agg.memory_search_rate), 2),
+        "avg_search_latency_memory_ms": round(float(agg.search_latency_memory), 1),
+        "avg_search_latency_pgvector_ms": round(float(agg.search_latency_pgvector), 1),
+        "hybrid_retrieval_rate": round(float(agg.hybrid_rate), 2),
+        "avg_lexical_latency_ms": round(float(agg.lexical_latency), 1),
+        "avg_lexical_hits": round(float(agg.lexical_hits), 1),
         "timeseries": [
             {
                 "time": row.bucket.isoformat(),
@@ -352,8 +423,9 @@ async def rag_retrievals(
         text("""
             SELECT id, tenant_id, query_text, chunks_returned,
                    chunks_above_threshold, avg_similarity, max_similarity,
-                   min_similarity, embedding_latency_ms, search_latency_ms,
-                   total_latency_ms, created_at
+                   min_similarity, embedding_latency_ms, embedding_cache_hit,
+                   search_latency_ms, search_backend, retrieval_mode,
+                   lexical_latency_ms, lexical_hits, total_latency_ms, created_at
             FROM rag_retrieval_metrics
             WHERE created_at >= :cutoff
             ORDER BY created_at DESC
@@ -374,7 +446,12 @@ async def rag_retrievals(
             "max_similarity": round(float(row.max_similarity), 4) if row.max_similarity else None,
             "min_similarity": round(float(row.min_similarity), 4) if row.min_similarity else None,
             "embedding_latency_ms": row.embedding_latency_ms,
+            "embedding_cache_hit": row.embedding_cache_hit,
             "search_latency_ms": row.search_latency_ms,
+            "search_backend": row.search_backend,
+            "retrieval_mode": row.retrieval_mode,
+            "lexical_latency_ms": row.lexical_latency_ms,
+            "lexical_hits": row.lexical_hits,
             "total_latency_ms": row.total_latency_ms,
             "created_at": row.created_at.isoformat(),
         }
@@ -434,14 +511,50 @@ async def escalation_analysis(
     )
     pattern_rows = pattern_result.fetchall()
 
+    # Centroid pre-classifier: LLM calls skipped, and agreement where both ran
+    centroid_result = await db.execute(
+        text("""
+            SELECT
+                COUNT(*) FILTER (WHERE detection_method IN ('embedding', 'llm')) as classified,
+                COUNT(*) FILTER (WHERE detection_method = 'embedding') as skipped,
+                COUNT(*) FILTER (
+                    WHERE detection_method = 'llm' AND centroid_label IS NOT NULL
+                ) as compared,
+                COUNT(*) FILTER (
+                    WHERE detection_method = 'llm' AND centroid_label <> llm_classification
+                ) as disagreed,
+                COUNT(*) FILTER (
+                    WHERE detection_method = 'llm' AND centroid_confident
+                ) as audited,
+                COUNT(*) FILTER (
+                    WHERE detection_method = 'llm' AND centroid_confident
+                      AND centroid_label <> llm_classification
+                ) as audited_disagreed
+            FROM escalation_decision_metrics
+            WHERE created_at >= :cutoff
+        """),
+        {"cutoff": cutoff},
+    )
+    centroid = centroid_result.one()
+
     total_decisions = sum(r.count for r in method_rows)
     regex_triggers = sum(r.escalated for r in method_rows if r.detection_method == "regex")
     llm_triggers = sum(r.escalated for r in method_rows if r.detection_method == "llm")
+    embedding_triggers = sum(
+        r.escalated for r in method_rows if r.detection_method == "embedding"
+    )
 
     return {
         "total_decisions": total_decisions,
         "regex_triggers": regex_triggers,
         "llm_triggers": llm_triggers,
+        "embedding_triggers": embedding_triggers,
+        # Share of post-regex decisions made by the centroid layer without an LLM call
+        "skipped_llm_rate": _pct(centroid.skipped, centroid.classified),
+        # Centroid label vs LLM label, over every LLM decision that had a prediction
+        # (mostly the uncertain margin) and over the audited confident ones
+        "centroid_disagreement_rate": _pct(centroid.disagreed, centroid.compared),
+        "audited_disagreement_rate": _pct(centroid.audited_disagreed, centroid.audited),
         "method_breakdown": [
             {
                 "method": row.detection_method,
@@ -1,12 +1,21 @@
 """Knowledge base document management endpoints."""
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.deps import DbSession, TenantId
+from app.models.ingestion_job import IngestionJob, IngestionStatus
 from app.models.knowledge_document import KnowledgeDocument
-from app.schemas.knowledge import KnowledgeDocumentResponse
+from app.schemas.knowledge import IngestionJobResponse, KnowledgeDocumentResponse
+from app.services.knowledge_version import bump_knowledge_version
 from app.services.rag import RAGService
+from app.tasks.document_ingestion import ingest_document
 
 router = APIRouter()
 
@@ -30,15 +39,24 @@ async def list_documents(
     return [KnowledgeDocumentResponse.model_validate(d) for d in docs]
 
 
-@router.post("/knowledge-base", response_model=KnowledgeDocumentResponse)
+@router.post(
+    "/knowledge-base",
+    response_model=IngestionJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def upload_document(
     db: DbSession,
     tenant_id: TenantId,
     file: UploadFile = File(...),
     title: str = Form(...),
     doc_type: str = Form("faq"),
-) -> KnowledgeDocumentResponse:
-    """Upload and embed a knowledge base document (PDF or text)."""
+) -> IngestionJobResponse:
+    """Queue a knowledge base document (PDF or text) for ingestion.
+
+    The raw upload is stored on an ingestion job and parsing, chunking and
+    embedding happen on the ``ingestion`` Celery queue; poll
+    ``/knowledge-base/jobs/{job_id}`` for progress.
+    """
     if not file.filename:
         raise HTTPException(status_code=400, detail="File is required")
 
@@ -49,42 +67,88 @@ async def upload_document(
         raise HTTPException(
             status_code=413, detail="File too large. Maximum size is 10MB."
         )
-
-    if file.filename.lower().endswith(".pdf"):
-        # Extract text from PDF
-        try:
-            from PyPDF2 import PdfReader
-            import io
-
-            reader = PdfReader(io.BytesIO(raw_bytes))
-            pages = [page.extract_text() or "" for page in reader.pages]
-            content = "\n\n".join(pages)
-        except Exception as e:
-            raise HTTPException(
-                status_code=400, detail=f"Failed to parse PDF: {e}"
-            )
-    else:
-        # Plain text / markdown
-        content = raw_bytes.decode("utf-8", errors="replace")
-
-    if not content.strip():
+    if not raw_bytes.strip():
         raise HTTPException(status_code=400, detail="Document is empty")
 
-    # Chunk, embed, and store
-    rag = RAGService(db)
-    documents = await rag.ingest_document(
+    job = IngestionJob(
+        id=uuid.uuid4(),
         tenant_id=tenant_id,
         title=title,
-        content=content,
         doc_type=doc_type,
+        filename=file.filename,
+        raw_bytes=raw_bytes,
+        status=IngestionStatus.QUEUED.value,
     )
+    db.add(job)
     await db.commit()
+    await db.refresh(job)
+
+    # Only the job id goes over the broker; the worker reads the bytes from DB
+    await _enqueue(job)
+    return IngestionJobResponse.model_validate(job)
+
+
+async def _enqueue(job: IngestionJob) -> None:
+    # Publishing is a blocking broker round trip; keep it off the event loop
+    await run_in_threadpool(ingest_document.delay, str(job.id))
+
+
+def _is_retryable(job: IngestionJob) -> bool:
+    """Failed, still queued, or processing with no progress since the stale cutoff."""
+    if job.status in (IngestionStatus.FAILED.value, IngestionStatus.QUEUED.value):
+        return True
+    if job.status != IngestionStatus.PROCESSING.value or job.updated_at is None:
+        return False
+    stale_before = datetime.now(UTC) - timedelta(seconds=settings.ingestion_stale_after_seconds)
+    return job.updated_at < stale_before
+
+
+async def _get_job(db: AsyncSession, tenant_id: str, job_id: uuid.UUID) -> IngestionJob:
+    result = await db.execute(
+        select(IngestionJob).where(
+            IngestionJob.id == job_id,
+            IngestionJob.tenant_id == tenant_id,
+        )
+    )
+    job = result.scalar_one_or_none()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return job
+
+
+@router.get("/knowledge-base/jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_ingestion_job(
+    job_id: uuid.UUID,
+    db: DbSession,
+    tenant_id: TenantId,
+) -> IngestionJobResponse:
+    """Get the status and progress of a document ingestion job."""
+    job = await _get_job(db, tenant_id, job_id)
+    return IngestionJobResponse.model_validate(job)
 
-    if not documents:
-        raise HTTPException(status_code=400, detail="No content could be extracted")
 
-    # Return the first chunk as the document representation
-    return KnowledgeDocumentResponse.model_validate(documents[0])
+@router.post("/knowledge-base/jobs/{job_id}/retry", response_model=IngestionJobResponse)
+async def retry_ingestion_job(
+    job_id: uuid.UUID,
+    db: DbSession,
+    tenant_id: TenantId,
+) -> IngestionJobResponse:
+    """Re-queue a failed, stuck queued, or stale processing ingestion job.
+
+    A processing job counts as stale (its worker crashed) once it has made no
+    progress for ``ingestion_stale_after_seconds``; if its worker is in fact
+    alive, the job's advisory lock turns the duplicate delivery into a no-op.
+    Completed and actively processing jobs are returned unchanged, so retrying
+    is idempotent.
+    """
+    job = await _get_job(db, tenant_id, job_id)
+    if _is_retryable(job):
+        job.status = IngestionStatus.QUEUED.value
+        job.error = None
+        await db.commit()
+        await db.refresh(job)
+        await _enqueue(job)
+    return IngestionJobResponse.model_validate(job)
 
 
 @router.delete("/knowledge-base/{document_title}")
@@ -99,4 +163,5 @@ async def delete_document(
     await db.commit()
     if count == 0:
         raise HTTPException(status_code=404, detail="Document not found")
+    await bump_knowledge_version(tenant_id)
     return {"status": "deleted", "chunks_removed": str(count)}
@@ -1,11 +1,13 @@
 """Tenant settings endpoints."""
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from sqlalchemy import select
 
+from app.agent.escalation_patterns import CATEGORIES
 from app.deps import DbSession, TenantId
 from app.models.tenant import Tenant
+from app.services.tenant_config import publish_tenant_config_change
 
 router = APIRouter()
 
@@ -19,7 +21,20 @@ class TenantSettingsUpdate(BaseModel):
     notification_phone: str | None = None
     widget_color: str | None = None
     widget_position: str | None = None
-    similarity_threshold: float | None = None
+    similarity_threshold: float | None = Field(default=None, ge=0.0, le=1.0)
+    top_k: int | None = Field(default=None, ge=1, le=20)
+    # Extra literal phrases per escalation category, e.g. {"complaint": ["charged twice"]}
+    escalation_rules: dict[str, list[str]] | None = None
+
+    @field_validator("escalation_rules")
+    @classmethod
+    def _known_categories(cls, value: dict[str, list[str]] | None):
+        if value is not None:
+            known = {c.name for c in CATEGORIES}
+            unknown = sorted(set(value) - known)
+            if unknown:
+                raise ValueError(f"Unknown escalation categories: {', '.join(unknown)}")
+        return value
 
 
 async def _get_tenant(db, tenant_id: str) -> Tenant | None:
@@ -76,6 +91,8 @@ async def update_settings(
         "widget_color": body.widget_color,
         "widget_position": body.widget_position,
         "similarity_threshold": body.similarity_threshold,
+        "top_k": body.top_k,
+        "escalation_rules": body.escalation_rules,
     }
     for key, value in settings_fields.items():
         if value is not None:
@@ -84,6 +101,7 @@ async def update_settings(
 
     await db.commit()
     await db.refresh(tenant)
+    await publish_tenant_config_change(tenant)
 
     return {
         "name": tenant.name,
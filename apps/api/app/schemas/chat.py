@@ -5,3 +5,9 @@ class ChatRequest(BaseModel):
     message: str = Field(..., min_length=1, max_length=4000)
     conversation_id: str | None = None
     tenant_id: str | None = None  # Required for embed widget (public endpoint)
+
+
+class ChatLeadStatus(BaseModel):
+    conversation_id: str
+    lead_id: str | None
+    pending: bool  # a lead capture for the conversation is still running
@@ -20,3 +20,21 @@ class KnowledgeDocumentResponse(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class IngestionJobResponse(BaseModel):
+    id: uuid.UUID
+    tenant_id: str
+    title: str
+    doc_type: str
+    filename: str
+    status: str
+    total_chunks: int | None
+    chunks_done: int
+    attempts: int
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
+    completed_at: datetime | None
+
+    model_config = {"from_attributes": True}
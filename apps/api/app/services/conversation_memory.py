@@ -0,0 +1,203 @@
+"""Sliding-window conversation memory with a rolling summary.
+
+Sending the whole history on every turn makes prompt tokens and latency grow
+with conversation length. Instead the prompt carries the last
+``chat_memory_window_turns`` turns verbatim and a summary of everything older
+(``Conversation.summary``, built with ``SUMMARY_GENERATOR_PROMPT``).
+
+The summary is updated incrementally after the turn commits, in a background
+task: once at least ``chat_summary_min_new_messages`` messages have left the
+window they are folded into the previous summary, and
+``Conversation.summary_message_count`` records how many messages it covers.
+Until that lands, messages that left the window but are not summarized yet
+stay in the prompt verbatim, so nothing falls through the gap. The summary
+LLM call is recorded against the run of the turn that scheduled it.
+"""
+
+import asyncio
+import contextvars
+import logging
+import uuid
+from dataclasses import dataclass
+
+from langchain_core.messages import HumanMessage
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.agent.instrumented_llm import instrumented_ainvoke
+from app.agent.prompts.summary_generator import SUMMARY_GENERATOR_PROMPT
+from app.config import settings
+from app.models.conversation import Conversation
+from app.models.conversation_message import ConversationMessage
+from app.services.metrics_collector import MetricsCollector, _metrics_ctx
+
+logger = logging.getLogger(__name__)
+
+_ROLE_LABELS = {"user": "Patient", "assistant": "Assistant"}
+
+
+@dataclass(frozen=True)
+class ConversationMemory:
+    """Summary state of a conversation as loaded at the start of a turn."""
+
+    summary: str | None = None
+    summary_message_count: int = 0
+    message_count: int = 0
+
+    def summarized_in(self, history_len: int) -> int:
+        """How many of the last ``history_len`` messages the summary already covers."""
+        first_loaded = self.message_count - history_len
+        return max(0, min(history_len, self.summary_message_count - first_loaded))
+
+
+def window_messages() -> int:
+    return settings.chat_memory_window_turns * 2
+
+
+def select_prompt_messages(messages: list[dict], summarized_count: int) -> list[dict]:
+    """Messages to send verbatim: the window plus anything not yet summarized."""
+    start = min(summarized_count, len(messages) - window_messages())
+    return messages[max(0, start):]
+
+
+def format_transcript(messages: list[dict], previous_summary: str | None = None) -> str:
+    lines = []
+    if previous_summary:
+        lines.append(f"(Summary of the earlier conversation: {previous_summary})")
+    for msg in messages:
+        lines.append(f"{_ROLE_LABELS.get(msg['role'], msg['role'])}: {msg['content']}")
+    return "\n".join(lines)
+
+
+def needs_summary_update(message_count: int, summary_message_count: int) -> bool:
+    outside_window = message_count - window_messages() - summary_message_count
+    return outside_window >= settings.chat_summary_min_new_messages
+
+
+async def _load_message_range(
+    db: AsyncSession, conversation_id: uuid.UUID, legacy_count: int, start: int, stop: int
+) -> list[dict]:
+    """Transcript messages ``[start, stop)``: legacy JSONB entries first, then appended rows."""
+    messages: list[dict] = []
+    if start < legacy_count:
+        legacy = await db.scalar(
+            select(Conversation.transcript).where(Conversation.id == conversation_id)
+        )
+        messages.extend((legacy or [])[start:min(stop, legacy_count)])
+    if stop > legacy_count:
+        result = await db.execute(
+            select(ConversationMessage.role, ConversationMessage.content)
+            .where(ConversationMessage.conversation_id == conversation_id)
+            .order_by(ConversationMessage.id)
+            .offset(max(0, start - legacy_count))
+            .limit(stop - max(start, legacy_count))
+        )
+        messages.extend({"role": role, "content": content} for role, content in result.all())
+    return messages
+
+
+async def update_summary(
+    conversation_id: uuid.UUID,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+    llm=None,
+    run_id: uuid.UUID | None = None,
+) -> bool:
+    """Fold messages that left the window into the conversation summary.
+
+    Returns True if the summary was updated. The write is conditional on
+    ``summary_message_count`` being unchanged, so a concurrent update (another
+    worker) can never move the summary backwards. The LLM call is recorded
+    against ``run_id`` (the turn that scheduled the update).
+    """
+    if session_factory is None:
+        from app.database import async_session_factory as session_factory
+    if llm is None:
+        from app.services.llm_clients import get_llm_clients
+
+        llm = get_llm_clients().chat("gpt-4o-mini", max_tokens=256)
+
+    async with session_factory() as db:
+        result = await db.execute(
+            select(
+                Conversation.tenant_id,
+                Conversation.summary,
+                Conversation.summary_message_count,
+                Conversation.message_count,
+                func.coalesce(func.jsonb_array_length(Conversation.transcript), 0).label(
+                    "legacy_count"
+                ),
+            ).where(Conversation.id == conversation_id)
+        )
+        row = result.first()
+        if row is None or not needs_summary_update(row.message_count, row.summary_message_count):
+            return False
+
+        target = row.message_count - window_messages()
+        messages = await _load_message_range(
+            db, conversation_id, row.legacy_count, row.summary_message_count, target
+        )
+        # Don't hold a connection while the LLM runs
+        await db.rollback()
+
+        prompt = SUMMARY_GENERATOR_PROMPT.format(
+            transcript=format_transcript(messages, row.summary)
+        )
+        collector = MetricsCollector(row.tenant_id, str(conversation_id))
+        if run_id is not None:
+            collector.run_id = run_id
+        token = _metrics_ctx.set(collector)
+        try:
+            response = await instrumented_ainvoke(
+                llm, [HumanMessage(content=prompt)], "update_summary"
+            )
+        except Exception:
+            # Keep the failed call in the metrics before giving up
+            await collector.flush_deferred(db)
+            await db.commit()
+            raise
+        finally:
+            _metrics_ctx.reset(token)
+
+        updated = False
+        summary = str(response.content).strip()
+        if summary:
+            result = await db.execute(
+                update(Conversation)
+                .where(
+                    Conversation.id == conversation_id,
+                    Conversation.summary_message_count == row.summary_message_count,
+                )
+                .values(summary=summary, summary_message_count=target)
+                .execution_options(synchronize_session=False)
+            )
+            updated = result.rowcount == 1
+        await collector.flush_deferred(db)
+        await db.commit()
+        return updated
+
+
+_in_flight: set[uuid.UUID] = set()
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def _run_update(conversation_id: uuid.UUID, run_id: uuid.UUID) -> None:
+    try:
+        await update_summary(conversation_id, run_id=run_id)
+    except Exception:
+        logger.warning("Conversation summary update failed for %s", conversation_id, exc_info=True)
+    finally:
+        _in_flight.discard(conversation_id)
+
+
+def schedule_summary_update(conversation_id: uuid.UUID, run_id: uuid.UUID) -> None:
+    """Update the summary in the background (at most one update per conversation at a time).
+
+    Runs in a fresh context so it doesn't inherit the finished turn's metrics
+    collector or unit of work.
+    """
+    if conversation_id in _in_flight:
+        return
+    _in_flight.add(conversation_id)
+    task = asyncio.create_task(_run_update(conversation_id, run_id), context=contextvars.Context())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
@@ -0,0 +1,149 @@
+"""Content-addressed cache for query embeddings.
+
+Patients ask the same handful of questions ("how much is botox", "what are your
+hours") across every tenant, so the embedding for a normalized query is cached
+by its SHA-256 and shared between tenants. Two tiers:
+
+- an in-process LRU bounded by entry count, with a per-entry TTL
+- an optional Redis tier (``settings.embedding_cache_redis_enabled``) shared by
+  all workers, using Redis key expiry for the same TTL
+
+Vectors are stored as packed float32 bytes (6 KB for 1536 dims instead of
+~30 KB as JSON). Redis errors degrade to a miss; the cache never fails a search.
+"""
+
+import hashlib
+import logging
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "emb:v1:"
+
+
+def normalize_query(text: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share a key."""
+    return " ".join(text.casefold().split())
+
+
+def cache_key(model: str, text: str) -> str:
+    digest = hashlib.sha256(f"{model}\x00{normalize_query(text)}".encode()).hexdigest()
+    return f"{_KEY_PREFIX}{digest}"
+
+
+def encode_embedding(embedding: list[float]) -> bytes:
+    return array("f", embedding).tobytes()
+
+
+def decode_embedding(payload: bytes) -> list[float]:
+    values = array("f")
+    values.frombytes(payload)
+    return values.tolist()
+
+
+class EmbeddingCache:
+    """Two-tier (LRU + optional Redis) cache of float32-packed embeddings."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: int,
+        redis_enabled: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._redis_enabled = redis_enabled
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> tuple[list[float] | None, str]:
+        """Look up an embedding. Returns (embedding, source) with source in memory/redis/miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, payload = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return decode_embedding(payload), "memory"
+            del self._entries[key]
+
+        if self._redis_enabled:
+            payload = await self._redis_get(key)
+            if payload is not None:
+                self._store_local(key, payload)
+                self.redis_hits += 1
+                return decode_embedding(payload), "redis"
+
+        self.misses += 1
+        return None, "miss"
+
+    async def put(self, key: str, embedding: list[float]) -> None:
+        payload = encode_embedding(embedding)
+        self._store_local(key, payload)
+        if self._redis_enabled:
+            await self._redis_set(key, payload)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.redis_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.redis_hits) / lookups if lookups else 0.0,
+        }
+
+    def _store_local(self, key: str, payload: bytes) -> None:
+        self._entries[key] = (self._clock() + self._ttl, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def _redis_get(self, key: str) -> bytes | None:
+        from app.services.redis_client import get_redis
+
+        try:
+            return await get_redis().get(key)
+        except Exception:
+            logger.debug("Embedding cache Redis read failed", exc_info=True)
+            return None
+
+    async def _redis_set(self, key: str, payload: bytes) -> None:
+        from app.services.redis_client import get_redis
+
+        try:
+            await get_redis().set(key, payload, ex=self._ttl)
+        except Exception:
+            logger.debug("Embedding cache Redis write failed", exc_info=True)
+
+
+_cache_instance: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Return the process-wide embedding cache, or None if disabled."""
+    global _cache_instance
+
+    if not settings.embedding_cache_enabled:
+        return None
+
+    if _cache_instance is None:
+        _cache_instance = EmbeddingCache(
+            max_entries=settings.embedding_cache_max_entries,
+            ttl_seconds=settings.embedding_cache_ttl_seconds,
+            redis_enabled=settings.embedding_cache_redis_enabled,
+        )
+    return _cache_instance
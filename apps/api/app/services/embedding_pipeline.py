@@ -0,0 +1,161 @@
+"""Batched, concurrent embedding of document chunks for ingestion.
+
+Sending every chunk of a large document in one ``aembed_documents`` call runs
+into request-size limits and serializes the whole upload behind one slow call.
+Instead chunks are grouped into batches bounded by an estimated token budget
+and an item count, embedded concurrently under a semaphore, retried with
+exponential backoff on rate limits / transient errors, and yielded as each
+batch finishes so callers can write rows while later batches are in flight.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+
+import openai
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_MAX_BACKOFF_SECONDS = 30.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap upper-bound token estimate (~3 chars/token for English prose)."""
+    return len(text) // 3 + 1
+
+
+def plan_batches(chunks: list[str], max_tokens: int, max_items: int) -> list[tuple[int, list[str]]]:
+    """Group chunks into (start_index, texts) batches within the token and item budgets."""
+    batches: list[tuple[int, list[str]]] = []
+    start = 0
+    current: list[str] = []
+    current_tokens = 0
+
+    for i, chunk in enumerate(chunks):
+        tokens = estimate_tokens(chunk)
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_items):
+            batches.append((start, current))
+            start, current, current_tokens = i, [], 0
+        current.append(chunk)
+        current_tokens += tokens
+
+    if current:
+        batches.append((start, current))
+    return batches
+
+
+@dataclass
+class EmbeddingBatch:
+    start: int  # index of the batch's first chunk in the document
+    texts: list[str]
+    embeddings: list[list[float]]
+
+
+@dataclass
+class IngestionStats:
+    total_chunks: int
+    total_batches: int
+    chunks_done: int = 0
+    batches_done: int = 0
+    retries: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def chunks_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.chunks_done / elapsed if elapsed > 0 else 0.0
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(
+        exc,
+        openai.RateLimitError
+        | openai.APITimeoutError
+        | openai.APIConnectionError
+        | openai.InternalServerError,
+    ):
+        return True
+    return getattr(exc, "status_code", None) in _RETRYABLE_STATUS
+
+
+def _retry_after(exc: Exception) -> float | None:
+    response = getattr(exc, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+async def embed_in_batches(
+    chunks: list[str],
+    embed_fn: EmbedFn,
+    stats: IngestionStats | None = None,
+    max_tokens: int | None = None,
+    max_items: int | None = None,
+    concurrency: int | None = None,
+    max_retries: int | None = None,
+    backoff_base: float | None = None,
+) -> AsyncIterator[EmbeddingBatch]:
+    """Embed chunks in concurrent batches, yielding each batch as it completes.
+
+    Batches may complete out of order; ``EmbeddingBatch.start`` gives each
+    batch's position in ``chunks``. If ``stats`` is given it is updated in place.
+    """
+    max_tokens = max_tokens or settings.embedding_batch_max_tokens
+    max_items = max_items or settings.embedding_batch_max_items
+    concurrency = concurrency or settings.embedding_max_concurrency
+    max_retries = settings.embedding_max_retries if max_retries is None else max_retries
+    backoff = settings.embedding_backoff_base_seconds if backoff_base is None else backoff_base
+
+    batches = plan_batches(chunks, max_tokens, max_items)
+    if stats is not None:
+        stats.total_batches = len(batches)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _run(start: int, texts: list[str]) -> EmbeddingBatch:
+        async with semaphore:
+            attempt = 0
+            while True:
+                try:
+                    return EmbeddingBatch(start, texts, await embed_fn(texts))
+                except Exception as exc:
+                    if attempt >= max_retries or not _is_retryable(exc):
+                        raise
+                    attempt += 1
+                    delay = _retry_after(exc)
+                    if delay is None:
+                        jitter = 0.5 + random.random()  # noqa: S311 -- not crypto
+                        delay = min(_MAX_BACKOFF_SECONDS, backoff * 2 ** (attempt - 1)) * jitter
+                    logger.warning(
+                        "Embedding batch at chunk %d failed (%s), retry %d/%d in %.1fs",
+                        start, type(exc).__name__, attempt, max_retries, delay,
+                    )
+                    if stats is not None:
+                        stats.retries += 1
+                    await asyncio.sleep(delay)
+
+    tasks = [asyncio.ensure_future(_run(start, texts)) for start, texts in batches]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            batch = await next_done
+            if stats is not None:
+                stats.chunks_done += len(batch.texts)
+                stats.batches_done += 1
+            yield batch
+    finally:
+        for task in tasks:
+            task.cancel()
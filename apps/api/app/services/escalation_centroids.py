@@ -0,0 +1,194 @@
+"""Embedding-centroid pre-classifier for the escalation LLM layer.
+
+Messages that pass the pattern layer used to cost a gpt-4o-mini
+classification call each. This layer scores the message's query embedding
+(already computed for RAG, served from the embedding cache) against one
+centroid per label (SAFE, MEDICAL, ESCALATE). The centroids are averaged from
+past decisions that annotators confirmed (``EscalationDecisionMetric.correct``).
+When the best label clearly beats the runner-up, its answer is used and the
+LLM call is skipped. Messages in the uncertain margin, and a small audit
+sample of confident ones, still go to the LLM. Both predictions are then
+recorded, which gives the disagreement rate.
+
+Centroids are loaded from Postgres (pgvector's ``avg(vector)``) into memory
+and refreshed in the background once they are older than
+``escalation_centroid_refresh_seconds``. Until every label has
+``escalation_centroid_min_examples`` confirmed examples the layer stays
+inactive.
+
+Query embeddings are derived from patient messages, so they are treated as
+PHI: only audited decisions and a sample of other LLM decisions keep one
+(the rows offered for annotation), they never leave the database, and
+``purge_expired_embeddings`` clears them once their retention has passed.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+LABELS = ("SAFE", "MEDICAL", "ESCALATE")
+
+# Label of a confirmed decision: the LLM's classification, or the centroid's
+# when the LLM was skipped
+HARVEST_CENTROIDS_SQL = text("""
+    SELECT COALESCE(llm_classification, centroid_label) AS label,
+           AVG(message_embedding) AS centroid,
+           COUNT(*) AS examples
+    FROM escalation_decision_metrics
+    WHERE correct IS TRUE
+      AND message_embedding IS NOT NULL
+      AND COALESCE(llm_classification, centroid_label) IN ('SAFE', 'MEDICAL', 'ESCALATE')
+    GROUP BY 1
+""")
+
+
+# Unlabelled embeddings only wait for annotation; labelled ones serve as
+# examples until the longer retention expires
+PURGE_EMBEDDINGS_SQL = text("""
+    UPDATE escalation_decision_metrics
+    SET message_embedding = NULL
+    WHERE message_embedding IS NOT NULL
+      AND (
+        (correct IS NULL AND created_at < now() - make_interval(days => :unlabelled_days))
+        OR created_at < now() - make_interval(days => :labelled_days)
+      )
+""")
+
+
+@dataclass(frozen=True)
+class CentroidPrediction:
+    label: str
+    similarity: float
+    margin: float  # best minus runner-up cosine similarity
+    confident: bool
+
+
+def _unit(vec) -> np.ndarray | None:
+    arr = np.asarray(vec, dtype=np.float32)
+    norm = float(np.linalg.norm(arr))
+    return arr / norm if norm else None
+
+
+class EscalationCentroids:
+    """Nearest-centroid classifier over unit-normalized embeddings."""
+
+    def __init__(self, centroids: dict[str, np.ndarray], margin: float, min_similarity: float):
+        self.labels = list(centroids)
+        self._matrix = np.vstack([centroids[label] for label in self.labels])
+        self._margin = margin
+        self._min_similarity = min_similarity
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows,
+        min_examples: int,
+        margin: float,
+        min_similarity: float,
+    ) -> "EscalationCentroids | None":
+        """Build from (label, centroid, examples) rows; None unless every label qualifies."""
+        centroids: dict[str, np.ndarray] = {}
+        for label, centroid, examples in rows:
+            unit = _unit(centroid) if centroid is not None else None
+            if label in LABELS and examples >= min_examples and unit is not None:
+                centroids[label] = unit
+        if set(centroids) != set(LABELS):
+            return None
+        return cls(centroids, margin, min_similarity)
+
+    def classify(self, embedding: list[float]) -> CentroidPrediction | None:
+        query = _unit(embedding)
+        if query is None or query.shape[0] != self._matrix.shape[1]:
+            return None
+        scores = self._matrix @ query
+        best, runner_up = np.argsort(scores)[::-1][:2]
+        similarity = float(scores[best])
+        margin = similarity - float(scores[runner_up])
+        return CentroidPrediction(
+            label=self.labels[best],
+            similarity=similarity,
+            margin=margin,
+            confident=margin >= self._margin and similarity >= self._min_similarity,
+        )
+
+
+class CentroidStore:
+    """Holds the current classifier and refreshes it in the background when stale."""
+
+    def __init__(self, refresh_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self._refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._classifier: EscalationCentroids | None = None
+        self._loaded_at: float | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    def get(self) -> EscalationCentroids | None:
+        """Current classifier (None until enough labels exist); never waits on the database."""
+        stale = self._loaded_at is None or self._clock() - self._loaded_at >= self._refresh_seconds
+        if stale and (self._refresh_task is None or self._refresh_task.done()):
+            # Fresh context: the refresh must not join the current chat turn
+            self._refresh_task = asyncio.create_task(
+                self._refresh_logged(), context=contextvars.Context()
+            )
+        return self._classifier
+
+    async def _refresh_logged(self) -> None:
+        try:
+            await self.refresh()
+        except Exception:
+            logger.warning("Escalation centroid refresh failed", exc_info=True)
+            # Retry after the normal interval rather than on every message
+            self._loaded_at = self._clock()
+
+    async def refresh(
+        self, session_factory: async_sessionmaker[AsyncSession] | None = None
+    ) -> EscalationCentroids | None:
+        if session_factory is None:
+            from app.database import async_session_factory as session_factory
+
+        async with session_factory() as db:
+            result = await db.execute(HARVEST_CENTROIDS_SQL)
+            rows = result.all()
+        self._classifier = EscalationCentroids.from_rows(
+            rows,
+            min_examples=settings.escalation_centroid_min_examples,
+            margin=settings.escalation_centroid_margin,
+            min_similarity=settings.escalation_centroid_min_similarity,
+        )
+        self._loaded_at = self._clock()
+        return self._classifier
+
+
+async def purge_expired_embeddings(db: AsyncSession) -> int:
+    """Clear query embeddings past their retention; returns the number of rows purged."""
+    result = await db.execute(
+        PURGE_EMBEDDINGS_SQL,
+        {
+            "unlabelled_days": settings.escalation_embedding_unlabelled_retention_days,
+            "labelled_days": settings.escalation_embedding_retention_days,
+        },
+    )
+    await db.commit()
+    return result.rowcount
+
+
+_store: CentroidStore | None = None
+
+
+def get_centroid_store() -> CentroidStore:
+    global _store
+
+    if _store is None:
+        _store = CentroidStore(refresh_seconds=settings.escalation_centroid_refresh_seconds)
+    return _store
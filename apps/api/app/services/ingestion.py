@@ -0,0 +1,153 @@
+"""Background knowledge base ingestion (upload job -> parsed, chunked, embedded rows)."""
+
+import io
+import logging
+import uuid
+import zlib
+from datetime import UTC, datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import undefer
+
+from app.models.ingestion_job import IngestionJob, IngestionStatus
+from app.services.embedding_pipeline import IngestionStats
+from app.services.knowledge_version import bump_knowledge_version
+from app.services.rag import RAGService
+from app.services.vector_index import ensure_tenant_vector_index
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentParseError(ValueError):
+    """The upload could not be turned into text; retrying will not help."""
+
+
+def extract_text(filename: str, raw_bytes: bytes) -> str:
+    """Extract plain text from an uploaded PDF or text/markdown file."""
+    if filename.lower().endswith(".pdf"):
+        try:
+            from PyPDF2 import PdfReader
+
+            reader = PdfReader(io.BytesIO(raw_bytes))
+            pages = [page.extract_text() or "" for page in reader.pages]
+        except Exception as e:
+            raise DocumentParseError(f"Failed to parse PDF: {e}") from e
+        return "\n\n".join(pages)
+
+    # Plain text / markdown
+    return raw_bytes.decode("utf-8", errors="replace")
+
+
+def _job_lock_key(job_id: uuid.UUID) -> int:
+    """Stable signed 32-bit key for pg_try_advisory_xact_lock."""
+    return zlib.crc32(job_id.bytes) - 2**31
+
+
+async def _set_job(db: AsyncSession, job_id: uuid.UUID, **values) -> None:
+    await db.execute(update(IngestionJob).where(IngestionJob.id == job_id).values(**values))
+    await db.commit()
+
+
+async def run_ingestion_job(
+    session_factory: async_sessionmaker[AsyncSession],
+    job_id: uuid.UUID,
+) -> dict[str, str]:
+    """Parse, chunk, embed and store the document attached to an ingestion job.
+
+    Safe to run more than once for the same job (Celery redelivery, manual
+    retry): the chunks and the job's ``completed`` status are committed in one
+    transaction, a completed job is a no-op, and a transaction-scoped advisory
+    lock keeps two workers from ingesting the same job concurrently. Progress
+    is written through a separate session so it is visible while the chunk
+    transaction is still open.
+    """
+    async with session_factory() as db, session_factory() as progress_db:
+        locked = await db.scalar(select(func.pg_try_advisory_xact_lock(_job_lock_key(job_id))))
+        if not locked:
+            return {"status": "in_progress", "job_id": str(job_id)}
+
+        job = await db.get(IngestionJob, job_id, options=[undefer(IngestionJob.raw_bytes)])
+        if job is None:
+            return {"status": "not_found", "job_id": str(job_id)}
+        if job.status == IngestionStatus.COMPLETED.value:
+            return {"status": IngestionStatus.COMPLETED.value, "job_id": str(job_id)}
+        if job.raw_bytes is None:
+            await _set_job(
+                progress_db,
+                job_id,
+                status=IngestionStatus.FAILED.value,
+                error="Upload data is no longer available",
+            )
+            return {"status": IngestionStatus.FAILED.value, "job_id": str(job_id)}
+
+        await _set_job(
+            progress_db,
+            job_id,
+            status=IngestionStatus.PROCESSING.value,
+            attempts=job.attempts + 1,
+            chunks_done=0,
+            total_chunks=None,
+            error=None,
+        )
+
+        async def _on_progress(stats: IngestionStats) -> None:
+            await _set_job(
+                progress_db,
+                job_id,
+                total_chunks=stats.total_chunks,
+                chunks_done=stats.chunks_done,
+            )
+
+        try:
+            content = extract_text(job.filename, job.raw_bytes)
+            if not content.strip():
+                raise DocumentParseError("Document is empty")
+
+            result = await RAGService(db).ingest_document(
+                tenant_id=job.tenant_id,
+                title=job.title,
+                content=content,
+                doc_type=job.doc_type,
+                on_progress=_on_progress,
+            )
+            if not result.total_chunks:
+                raise DocumentParseError("No content could be extracted")
+
+            job.status = IngestionStatus.COMPLETED.value
+            job.total_chunks = result.total_chunks
+            job.chunks_done = result.total_chunks
+            job.error = None
+            job.raw_bytes = None
+            job.completed_at = datetime.now(UTC)
+            tenant_id = job.tenant_id
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.exception("Ingestion job %s failed", job_id)
+            await _set_job(progress_db, job_id, status=IngestionStatus.FAILED.value, error=str(e))
+            if isinstance(e, DocumentParseError):
+                return {"status": IngestionStatus.FAILED.value, "job_id": str(job_id)}
+            raise
+
+    if result.changed:
+        await bump_knowledge_version(tenant_id)
+
+    # The ANN index is created at onboarding; this only repairs a missing or
+    # invalid one. Search still works without it, so a failure is not fatal.
+    try:
+        async with session_factory() as index_db:
+            conn = await index_db.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+            await ensure_tenant_vector_index(conn, tenant_id)
+    except Exception:
+        logger.exception("Failed to build vector index for tenant %s", tenant_id)
+
+    logger.info(
+        "Ingestion job %s completed: %d chunks (%d embedded, %d unchanged, %d deleted)",
+        job_id,
+        result.total_chunks,
+        result.embedded,
+        result.unchanged,
+        result.deleted,
+    )
+    return {"status": IngestionStatus.COMPLETED.value, "job_id": str(job_id)}
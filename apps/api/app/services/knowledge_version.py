@@ -0,0 +1,52 @@
+"""Per-tenant knowledge-base version stamps.
+
+Every change to a tenant's corpus (ingest, delete) bumps the tenant's version.
+Caches derived from the corpus store the version they were built at and treat
+any mismatch as a miss, so invalidation needs no fan-out to cache owners.
+
+With ``knowledge_version_redis_enabled`` the counter lives in Redis (INCR) so a
+bump from one process -- e.g. a Celery ingestion worker -- is seen by every API
+worker; otherwise it is process-local. When Redis is enabled but the read
+fails the version is unknown: a process-local counter would miss bumps made
+by other processes, so callers bypass their caches instead.
+"""
+
+import logging
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "kbver:"
+
+_local_versions: dict[str, int] = {}
+
+
+async def get_knowledge_version(tenant_id: str) -> int | None:
+    """Current corpus version for a tenant (0 if never changed, None if unknown)."""
+    if settings.knowledge_version_redis_enabled:
+        from app.services.redis_client import get_redis
+
+        try:
+            value = await get_redis().get(f"{_KEY_PREFIX}{tenant_id}")
+        except Exception:
+            logger.warning("Knowledge version Redis read failed", exc_info=True)
+            return None
+        return int(value) if value is not None else 0
+    return _local_versions.get(tenant_id, 0)
+
+
+async def bump_knowledge_version(tenant_id: str) -> int:
+    """Mark a tenant's corpus as changed and return the new version."""
+    version = _local_versions.get(tenant_id, 0) + 1
+    _local_versions[tenant_id] = version
+
+    if settings.knowledge_version_redis_enabled:
+        from app.services.redis_client import get_redis
+
+        try:
+            version = int(await get_redis().incr(f"{_KEY_PREFIX}{tenant_id}"))
+            _local_versions[tenant_id] = version
+        except Exception:
+            logger.warning("Knowledge version Redis bump failed for %s", tenant_id, exc_info=True)
+    return version
@@ -0,0 +1,232 @@
+"""Post-response lead capture.
+
+Lead capture used to run inside the graph (``create_lead_node``) before the
+SSE stream finished, so its LLM classification and DB write added to the
+latency the patient sees although they never see the result. Now the node
+only describes the job. The chat router records it as a
+``PendingLeadCapture`` row in the turn's transaction and, once the turn has
+committed, enqueues its id on the Celery ``follow_up`` queue; the ``done``
+event goes out without waiting for it.
+
+The worker runs the capture in its own session and transaction:
+
+- the lead is created, or the conversation's existing lead updated, and
+  ``Conversation.lead_id`` is set; the conversation row is locked so two
+  captures for one conversation (or two workers) can't create two leads
+- the turn's ``AgentRunMetric`` row is updated with ``lead_created`` and
+  ``intent_detected`` in the same transaction, so the metric is exact: it is
+  true exactly when a lead was written for that run
+- the pending row is deleted in that transaction too, so a redelivered task
+  is a no-op and the row exists exactly while the capture is outstanding
+
+Once a conversation has a lead, the classification memo in
+``app.services.lead_memo`` decides whether a message needs reclassifying.
+Captures of one conversation may finish out of order; one for an older turn
+than the memo's never overwrites the lead. Clients learn the ``lead_id`` by
+polling ``GET /chat/{conversation_id}/lead``, which reports ``pending`` from
+the pending rows, so any API worker can answer it.
+"""
+
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.models.conversation import Conversation
+from app.models.pending_lead_capture import PendingLeadCapture
+from app.services.lead_memo import LeadMemo, reclassify_reason, remember
+from app.services.lead_service import LeadService
+from app.services.metrics_collector import MetricsCollector, _metrics_ctx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LeadCaptureJob:
+    tenant_id: str
+    conversation_id: str
+    run_id: uuid.UUID  # the turn's AgentRunMetric row
+    message: str  # last user message
+    classification: dict | None = None  # intent/urgency/summary if the turn already has them
+    message_count: int | None = None  # Conversation.message_count after the turn
+
+
+async def _claim(db: AsyncSession, pending_id: uuid.UUID | None) -> bool:
+    """Delete the pending row in the capture's transaction; False if another run took it."""
+    if pending_id is None:
+        return True
+    result = await db.execute(
+        delete(PendingLeadCapture)
+        .where(PendingLeadCapture.id == pending_id)
+        .returning(PendingLeadCapture.id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.first() is not None
+
+
+async def capture_lead(
+    job: LeadCaptureJob,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+    llm=None,
+    pending_id: uuid.UUID | None = None,
+) -> str | None:
+    """Create or update the conversation's lead and return its id.
+
+    An existing lead is left alone when the classification memo says the
+    message can't have changed it (no LLM call), when a fresh classification
+    matches the memo, or when the memo is from a later turn (no write).
+    With ``pending_id`` the capture commits only if it deletes that pending
+    row; None is returned when another run already did.
+    """
+    from app.agent.turn_classifier import classify_turn
+
+    if session_factory is None:
+        from app.database import async_session_factory as session_factory
+
+    conversation_uid = uuid.UUID(job.conversation_id)
+    conversation_filter = (
+        Conversation.id == conversation_uid,
+        Conversation.tenant_id == job.tenant_id,
+    )
+    async with session_factory() as db:
+        result = await db.execute(
+            select(
+                Conversation.lead_id, Conversation.lead_memo, Conversation.message_count
+            ).where(*conversation_filter)
+        )
+        row = result.first()
+    message_count = job.message_count
+    if message_count is None:
+        message_count = row.message_count if row is not None else 0
+    memo = LeadMemo.from_json(row.lead_memo) if row is not None and row.lead_id else None
+
+    # LLM calls made here are recorded against the turn's run
+    collector = MetricsCollector(job.tenant_id, job.conversation_id)
+    collector.run_id = job.run_id
+
+    classified = job.classification
+    source = "reused"
+    if classified is None:
+        if reclassify_reason(memo, job.message, message_count) is None:
+            async with session_factory() as db:
+                if not await _claim(db, pending_id):
+                    return None
+                await collector.flush_deferred(
+                    db, intent_detected=memo.intent, lead_created=False, lead_classification="memo"
+                )
+                await db.commit()
+            return str(row.lead_id)
+
+        if llm is None:
+            from app.agent.nodes import _get_llm
+
+            llm = _get_llm()
+        token = _metrics_ctx.set(collector)
+        try:
+            classification = await classify_turn(llm, job.message, "create_lead")
+        finally:
+            _metrics_ctx.reset(token)
+        classified = classification.lead_fields(job.message)
+        source = "llm"
+
+    async with session_factory() as db:
+        locked = (
+            await db.execute(
+                select(Conversation.lead_id, Conversation.lead_memo)
+                .where(*conversation_filter)
+                .with_for_update()
+            )
+        ).first()
+        if not await _claim(db, pending_id):
+            await db.rollback()
+            return None
+        lead_id = locked.lead_id if locked is not None else None
+        memo = LeadMemo.from_json(locked.lead_memo) if lead_id else None
+        # A capture for a later turn already landed: it describes the lead better
+        stale = memo is not None and memo.message_count > message_count
+        if stale:
+            memo_json = locked.lead_memo
+        else:
+            memo_json = remember(memo, classified, job.message, message_count).to_json()
+
+        lead_service = LeadService(db)
+        lead = None
+        if lead_id and memo is not None and (stale or memo.matches(classified)):
+            lead = await lead_service.get_lead(job.tenant_id, str(lead_id))
+            written = False
+        elif lead_id:
+            lead = await lead_service.update_lead(
+                tenant_id=job.tenant_id, lead_id=str(lead_id), **classified
+            )
+            written = lead is not None
+        if lead is None:
+            lead = await lead_service.create_lead(
+                tenant_id=job.tenant_id,
+                source="web_chat",
+                conversation_id=job.conversation_id,
+                **classified,
+            )
+            written = True
+        await db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_uid)
+            .values(
+                lead_id=lead.id,
+                lead_memo=memo_json,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await collector.flush_deferred(
+            db,
+            intent_detected=classified["intent"],
+            lead_created=written,
+            lead_classification=source,
+        )
+        await db.commit()
+        return str(lead.id)
+
+
+async def run_pending_capture(
+    pending_id: uuid.UUID,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> str | None:
+    """Run a capture the chat router recorded; a no-op once it has completed."""
+    if session_factory is None:
+        from app.database import async_session_factory as session_factory
+
+    async with session_factory() as db:
+        pending = await db.get(PendingLeadCapture, pending_id)
+    if pending is None:
+        return None
+    job = LeadCaptureJob(
+        tenant_id=pending.tenant_id,
+        conversation_id=str(pending.conversation_id),
+        run_id=pending.run_id,
+        message=pending.message,
+        classification=pending.classification,
+        message_count=pending.message_count,
+    )
+    return await capture_lead(job, session_factory, pending_id=pending_id)
+
+
+async def lead_capture_pending(db: AsyncSession, conversation_id: uuid.UUID) -> bool:
+    """Whether a capture for the conversation is still outstanding on any worker.
+
+    Rows older than ``lead_capture_pending_timeout_seconds`` belong to captures
+    that failed for good or were never delivered, so clients stop polling.
+    """
+    cutoff = datetime.now(UTC) - timedelta(seconds=settings.lead_capture_pending_timeout_seconds)
+    return bool(
+        await db.scalar(
+            select(
+                exists().where(
+                    PendingLeadCapture.conversation_id == conversation_id,
+                    PendingLeadCapture.created_at > cutoff,
+                )
+            )
+        )
+    )
@@ -0,0 +1,111 @@
+"""Per-conversation memo of the lead classification.
+
+Once a conversation has a lead, lead capture used to reclassify
+intent/urgency/summary on every later message and rewrite the lead, although
+most follow-ups ("what about Saturday?", "thanks!") don't change what the
+patient wants. ``Conversation.lead_memo`` records the classification behind
+the lead, and a cheap change detector decides whether a new message could
+plausibly change it:
+
+- the message contains keywords of an intent the conversation hasn't shown
+  yet (``"how much"`` in a booking conversation), or
+- ``lead_memo_max_turns`` user turns have passed since the last
+  classification (catches drift the keywords miss)
+
+Otherwise the memo is reused and the LLM call and lead write are skipped.
+``AgentRunMetric.lead_classification`` records the outcome per turn, which
+gives the fraction of calls saved.
+"""
+
+import re
+from dataclasses import dataclass
+
+from app.agent.escalation_patterns import expand_template
+from app.config import settings
+
+# Phrases that point to an intent; "general" has none and emergencies and
+# complaints are mostly caught by escalation before lead capture runs
+INTENT_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "appointment": (
+        "book{ing|}", "schedul{e|ing}", "appointment", "reschedule", "cancel",
+        "availab{le|ility}", "opening{s|}", "consultation",
+    ),
+    "pricing": (
+        "price{s|}", "pricing", "cost{s|}", "how much", "fee{s|}", "discount{s|}",
+        "special{s|}", "financing", "payment plan", "membership",
+    ),
+    "treatment_info": (
+        "downtime", "recovery", "results", "how long {does|do|will}", "difference between",
+        "does it hurt", "how many {sessions|units|treatments}",
+    ),
+    "complaint": ("refund", "unhappy", "disappointed", "not happy", "complain"),
+}
+
+
+def _intent_pattern(templates: tuple[str, ...]) -> re.Pattern:
+    phrases = sorted(set().union(*(expand_template(t) for t in templates)), key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, phrases)) + r")\b")
+
+
+_INTENT_PATTERNS = {intent: _intent_pattern(t) for intent, t in INTENT_KEYWORDS.items()}
+
+
+def keyword_intents(message: str) -> frozenset[str]:
+    """Intents whose keywords appear in the message."""
+    text = message.lower()
+    return frozenset(intent for intent, p in _INTENT_PATTERNS.items() if p.search(text))
+
+
+@dataclass(frozen=True)
+class LeadMemo:
+    intent: str
+    urgency: int
+    message_count: int  # Conversation.message_count when last classified
+    keywords: frozenset[str] = frozenset()  # keyword intents seen in classified messages
+
+    @classmethod
+    def from_json(cls, data: dict | None) -> "LeadMemo | None":
+        if not data:
+            return None
+        return cls(
+            intent=data["intent"],
+            urgency=data["urgency"],
+            message_count=data["message_count"],
+            keywords=frozenset(data.get("keywords", ())),
+        )
+
+    def to_json(self) -> dict:
+        return {
+            "intent": self.intent,
+            "urgency": self.urgency,
+            "message_count": self.message_count,
+            "keywords": sorted(self.keywords),
+        }
+
+    def matches(self, classified: dict) -> bool:
+        """Whether a fresh classification leaves the lead as it is."""
+        return (classified["intent"], classified["urgency"]) == (self.intent, self.urgency)
+
+
+def remember(
+    previous: LeadMemo | None, classified: dict, message: str, message_count: int
+) -> LeadMemo:
+    """Memo after classifying ``message`` (the conversation's ``message_count``-th)."""
+    seen = previous.keywords if previous is not None else frozenset()
+    return LeadMemo(
+        intent=classified["intent"],
+        urgency=classified["urgency"],
+        message_count=message_count,
+        keywords=seen | keyword_intents(message),
+    )
+
+
+def reclassify_reason(memo: LeadMemo | None, message: str, message_count: int) -> str | None:
+    """Why the message needs an LLM classification, or None to reuse the memo."""
+    if memo is None:
+        return "no_memo"
+    if keyword_intents(message) - memo.keywords - {memo.intent}:
+        return "new_keywords"
+    if message_count - memo.message_count >= settings.lead_memo_max_turns * 2:
+        return "turn_count"
+    return None
@@ -0,0 +1,106 @@
+"""Process-wide OpenAI chat/embedding clients backed by pooled httpx clients.
+
+ChatOpenAI and OpenAIEmbeddings each create their own HTTP client unless one
+is passed in, so building them per call repeats DNS, TCP and TLS setup on every
+turn. The factory owns one keep-alive pool per process (opened/closed by the
+FastAPI lifespan) and caches one model wrapper per configuration; the wrappers
+are stateless between calls and safe to share across concurrent requests.
+"""
+
+import logging
+
+import httpx
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+class LLMClientFactory:
+    """Owns the shared httpx pools and hands out cached LangChain model wrappers."""
+
+    def __init__(self) -> None:
+        limits = httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry_seconds,
+        )
+        timeout = httpx.Timeout(
+            settings.openai_timeout_seconds,
+            connect=settings.openai_connect_timeout_seconds,
+        )
+        self._async_http = httpx.AsyncClient(limits=limits, timeout=timeout)
+        # LangChain falls back to the sync client for .invoke(); keep it pooled too
+        self._sync_http = httpx.Client(limits=limits, timeout=timeout)
+        self._chat_models: dict[tuple[str, int], ChatOpenAI] = {}
+        self._embedders: dict[str, OpenAIEmbeddings] = {}
+
+    def chat(self, model: str, max_tokens: int) -> ChatOpenAI:
+        key = (model, max_tokens)
+        llm = self._chat_models.get(key)
+        if llm is None:
+            llm = ChatOpenAI(
+                model=model,
+                api_key=settings.openai_api_key,
+                max_tokens=max_tokens,
+                max_retries=settings.openai_max_retries,
+                stream_usage=True,  # token usage arrives on the final chunk when streaming
+                http_async_client=self._async_http,
+                http_client=self._sync_http,
+            )
+            self._chat_models[key] = llm
+        return llm
+
+    def embeddings(self, model: str = EMBEDDING_MODEL) -> OpenAIEmbeddings:
+        embedder = self._embedders.get(model)
+        if embedder is None:
+            embedder = OpenAIEmbeddings(
+                model=model,
+                api_key=settings.openai_api_key,
+                max_retries=settings.openai_max_retries,
+                http_async_client=self._async_http,
+                http_client=self._sync_http,
+            )
+            self._embedders[model] = embedder
+        return embedder
+
+    async def aclose(self) -> None:
+        await self._async_http.aclose()
+        self._sync_http.close()
+        self._chat_models.clear()
+        self._embedders.clear()
+
+
+_factory: LLMClientFactory | None = None
+
+
+def get_llm_clients() -> LLMClientFactory:
+    """Return the process-wide factory, creating it lazily outside the app lifespan."""
+    global _factory
+
+    if _factory is None:
+        _factory = LLMClientFactory()
+    return _factory
+
+
+async def init_llm_clients() -> LLMClientFactory:
+    """Open the shared pools (called from the FastAPI lifespan)."""
+    factory = get_llm_clients()
+    logger.info(
+        "OpenAI client pool ready (max_connections=%d, keepalive=%d)",
+        settings.openai_max_connections,
+        settings.openai_max_keepalive_connections,
+    )
+    return factory
+
+
+async def close_llm_clients() -> None:
+    """Close the shared pools. Also used by worker code that runs its own event loop."""
+    global _factory
+
+    if _factory is not None:
+        await _factory.aclose()
+        _factory = None
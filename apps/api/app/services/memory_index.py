@@ -0,0 +1,207 @@
+"""In-process exact vector search for small tenant corpora.
+
+Most spas have a few hundred to a couple of thousand chunks. For those, a
+brute-force scan of an L2-normalized float32 matrix (one matrix-vector
+product plus ``argpartition``) takes well under a millisecond and is exact,
+which beats a round trip to pgvector. Each tenant's matrix is loaded lazily
+on first query, kept in LRU order under a byte budget, and stamped with the
+tenant's knowledge-base version so any ingest/delete (see
+``knowledge_version``) triggers a reload on the next query.
+
+Tenants above ``rag_memory_index_max_chunks_per_tenant`` are not loaded;
+``search`` returns None and the caller falls back to pgvector. It does the
+same while the tenant's knowledge version can't be read.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.services.knowledge_version import get_knowledge_version
+
+logger = logging.getLogger(__name__)
+
+_LOAD_SQL = text("""
+    SELECT id, title, content, doc_type, chunk_index, embedding
+    FROM knowledge_documents
+    WHERE tenant_id = :tenant_id AND embedding IS NOT NULL
+    ORDER BY title, chunk_index
+    LIMIT :limit
+""")
+
+
+def _as_array(embedding) -> np.ndarray:
+    # Binary pgvector codec yields pgvector.Vector; anything else is list-like
+    if hasattr(embedding, "to_numpy"):
+        return embedding.to_numpy()
+    return np.asarray(embedding, dtype=np.float32)
+
+
+@dataclass
+class TenantMatrix:
+    version: int
+    vectors: np.ndarray  # (n, dim) float32, C-contiguous, rows L2-normalized
+    rows: list[dict]
+    nbytes: int
+
+    @classmethod
+    def build(cls, version: int, rows: list[dict], embeddings: list) -> "TenantMatrix":
+        if embeddings:
+            vectors = np.stack([_as_array(e) for e in embeddings]).astype(np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0.0] = 1.0
+            vectors = np.ascontiguousarray(vectors / norms)
+        else:
+            vectors = np.empty((0, 0), dtype=np.float32)
+        nbytes = vectors.nbytes + sum(len(r["content"]) for r in rows)
+        return cls(version=version, vectors=vectors, rows=rows, nbytes=nbytes)
+
+    def search(self, query_embedding: list[float], top_k: int, threshold: float) -> list[dict]:
+        """Exact top-k rows by cosine similarity at or above ``threshold``."""
+        n = len(self.rows)
+        if n == 0 or top_k <= 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0:
+            return []
+        scores = self.vectors @ (query / norm)
+
+        k = min(top_k, n)
+        candidates = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(n)
+        candidates = candidates[np.argsort(-scores[candidates])]
+        return [
+            {**self.rows[i], "similarity": float(scores[i])}
+            for i in candidates
+            if scores[i] >= threshold
+        ]
+
+
+class MemoryVectorIndex:
+    """Per-tenant float32 matrices with LRU eviction under a memory budget."""
+
+    def __init__(self, max_bytes: int, max_chunks_per_tenant: int):
+        self._max_bytes = max_bytes
+        self._max_chunks = max_chunks_per_tenant
+        self._tenants: OrderedDict[str, TenantMatrix] = OrderedDict()
+        self._oversized: dict[str, int] = {}  # tenant -> version found too large
+        self._load_locks: dict[str, asyncio.Lock] = {}
+        self._bytes = 0
+
+        self.searches = 0
+        self.loads = 0
+        self.evictions = 0
+
+    async def search(
+        self,
+        db: AsyncSession,
+        tenant_id: str,
+        query_embedding: list[float],
+        top_k: int,
+        threshold: float,
+    ) -> list[dict] | None:
+        """Exact top-k by cosine similarity, or None if the tenant isn't servable here."""
+        version = await get_knowledge_version(tenant_id)
+        if version is None or self._oversized.get(tenant_id) == version:
+            return None
+
+        matrix = self._tenants.get(tenant_id)
+        if matrix is None or matrix.version != version:
+            matrix = await self._load(db, tenant_id, version)
+            if matrix is None:
+                return None
+        self._tenants.move_to_end(tenant_id)
+        self.searches += 1
+        return matrix.search(query_embedding, top_k, threshold)
+
+    def invalidate(self, tenant_id: str) -> None:
+        matrix = self._tenants.pop(tenant_id, None)
+        if matrix is not None:
+            self._bytes -= matrix.nbytes
+        self._oversized.pop(tenant_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "tenants": len(self._tenants),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "searches": self.searches,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
+
+    async def _load(
+        self, db: AsyncSession, tenant_id: str, version: int
+    ) -> TenantMatrix | None:
+        # Single-flight: concurrent first queries for a tenant share one load
+        lock = self._load_locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            matrix = self._tenants.get(tenant_id)
+            if matrix is not None and matrix.version == version:
+                return matrix
+
+            result = await db.execute(
+                _LOAD_SQL, {"tenant_id": tenant_id, "limit": self._max_chunks + 1}
+            )
+            records = result.fetchall()
+            if len(records) > self._max_chunks:
+                self.invalidate(tenant_id)
+                self._oversized[tenant_id] = version
+                return None
+
+            rows = [
+                {
+                    "id": str(r.id),
+                    "title": r.title,
+                    "content": r.content,
+                    "doc_type": r.doc_type,
+                    "chunk_index": r.chunk_index,
+                }
+                for r in records
+            ]
+            matrix = TenantMatrix.build(version, rows, [r.embedding for r in records])
+            self.invalidate(tenant_id)
+            if matrix.nbytes > self._max_bytes:
+                self._oversized[tenant_id] = version
+                return None
+
+            self._tenants[tenant_id] = matrix
+            self._bytes += matrix.nbytes
+            self.loads += 1
+            self._evict_to_budget(keep=tenant_id)
+            return matrix
+
+    def _evict_to_budget(self, keep: str) -> None:
+        while self._bytes > self._max_bytes and len(self._tenants) > 1:
+            oldest = next(iter(self._tenants))
+            if oldest == keep:
+                self._tenants.move_to_end(oldest)
+                continue
+            self._bytes -= self._tenants.pop(oldest).nbytes
+            self.evictions += 1
+            logger.debug("Evicted in-memory vector index for tenant %s", oldest)
+
+
+_index_instance: MemoryVectorIndex | None = None
+
+
+def get_memory_index() -> MemoryVectorIndex | None:
+    """Return the process-wide in-memory index, or None unless opted in."""
+    global _index_instance
+
+    if not settings.rag_memory_index_enabled:
+        return None
+
+    if _index_instance is None:
+        _index_instance = MemoryVectorIndex(
+            max_bytes=settings.rag_memory_index_max_bytes,
+            max_chunks_per_tenant=settings.rag_memory_index_max_chunks_per_tenant,
+        )
+    return _index_instance
@@ -10,6 +10,7 @@ import time
 import uuid
 from decimal import Decimal
 
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.metrics import (
@@ -39,6 +40,8 @@ class MetricsCollector:
         self.conversation_id = uuid.UUID(conversation_id) if conversation_id else None
 
         self._run_start: float = 0
+        self._first_token_ms: int | None = None
+        self._response_cache_hit: bool | None = None
         self._node_starts: dict[str, float] = {}
         self._node_durations: dict[str, int] = {}
         self._node_sequence: list[str] = []
@@ -55,6 +58,15 @@ class MetricsCollector:
     def start_run(self) -> None:
         self._run_start = time.perf_counter()
 
+    def mark_first_token(self) -> None:
+        """Record time-to-first-token (first content byte sent to the client)."""
+        if self._first_token_ms is None and self._run_start:
+            self._first_token_ms = int((time.perf_counter() - self._run_start) * 1000)
+
+    @property
+    def time_to_first_token_ms(self) -> int | None:
+        return self._first_token_ms
+
     def start_node(self, name: str) -> None:
         self._node_starts[name] = time.perf_counter()
         self._node_sequence.append(name)
@@ -71,6 +83,7 @@ class MetricsCollector:
         prompt_tokens: int = 0,
         completion_tokens: int = 0,
         total_tokens: int = 0,
+        cached_tokens: int = 0,
         cost_usd: Decimal = Decimal("0"),
         latency_ms: int = 0,
         success: bool = True,
@@ -83,6 +96,7 @@ class MetricsCollector:
             "prompt_tokens": prompt_tokens,
             "completion_tokens": completion_tokens,
             "total_tokens": total_tokens,
+            "cached_tokens": cached_tokens,
             "cost_usd": cost_usd,
             "latency_ms": latency_ms,
             "success": success,
@@ -106,6 +120,11 @@ class MetricsCollector:
         embedding_latency_ms: int = 0,
         search_latency_ms: int = 0,
         total_latency_ms: int = 0,
+        embedding_cache_hit: bool | None = None,
+        search_backend: str | None = None,
+        retrieval_mode: str | None = None,
+        lexical_latency_ms: int | None = None,
+        lexical_hits: int | None = None,
     ) -> None:
         self._rag_retrievals.append({
             "query_text": query_text[:512],
@@ -116,7 +135,12 @@ class MetricsCollector:
             "min_similarity": Decimal(str(min_similarity)) if min_similarity is not None else None,
             "threshold_used": Decimal(str(threshold_used)),
             "embedding_latency_ms": embedding_latency_ms,
+            "embedding_cache_hit": embedding_cache_hit,
             "search_latency_ms": search_latency_ms,
+            "search_backend": search_backend,
+            "retrieval_mode": retrieval_mode,
+            "lexical_latency_ms": lexical_latency_ms,
+            "lexical_hits": lexical_hits,
             "total_latency_ms": total_latency_ms,
         })
 
@@ -129,6 +153,10 @@ class MetricsCollector:
         escalation_reason: str | None = None,
         confidence: float | None = None,
         latency_ms: int = 0,
+        centroid_label: str | None = None,
+        centroid_margin: float | None = None,
+        centroid_confident: bool | None = None,
+        message_embedding: list[float] | None = None,
     ) -> None:
         self._escalation_decisions.append({
             "detection_method": detection_method,
@@ -138,8 +166,20 @@ class MetricsCollector:
             "escalation_reason": escalation_reason,
             "confidence": Decimal(str(confidence)) if confidence is not None else None,
             "latency_ms": latency_ms,
+            "centroid_label": centroid_label,
+            "centroid_margin": (
+                Decimal(str(round(centroid_margin, 4))) if centroid_margin is not None else None
+            ),
+            "centroid_confident": centroid_confident,
+            "message_embedding": message_embedding,
         })
 
+    def record_response_cache(self, hit: bool) -> None:
+        self._response_cache_hit = hit
+
+    def set_conversation_id(self, conversation_id: str) -> None:
+        self.conversation_id = uuid.UUID(conversation_id)
+
     def set_langfuse_trace_id(self, trace_id: str) -> None:
         self._langfuse_trace_id = trace_id
 
@@ -150,61 +190,136 @@ class MetricsCollector:
         was_escalated: bool = False,
         intent_detected: str | None = None,
         lead_created: bool = False,
+        db_checkouts: int | None = None,
+        commit: bool = True,
     ) -> None:
-        """Batch-insert all collected metrics in one transaction."""
+        """Batch-insert all collected metrics in one transaction.
+
+        With ``commit=False`` the rows are written in a savepoint of the
+        caller's transaction (a chat turn's unit of work), so a metrics
+        failure never rolls back the turn's own writes.
+        """
+        fields = {
+            "final_node": final_node,
+            "was_escalated": was_escalated,
+            "intent_detected": intent_detected,
+            "lead_created": lead_created,
+            "db_checkouts": db_checkouts,
+        }
         try:
-            total_duration_ms = (
-                int((time.perf_counter() - self._run_start) * 1000) if self._run_start else 0
-            )
+            if commit:
+                self._add_rows(db, **fields)
+                await db.commit()
+            else:
+                async with db.begin_nested():
+                    self._add_rows(db, **fields)
+        except Exception:
+            logger.exception("Failed to flush metrics for run %s", self.run_id)
+            if commit:
+                await db.rollback()
 
-            # Agent run metric
-            run = AgentRunMetric(
-                id=self.run_id,
+    async def flush_deferred(
+        self,
+        db: AsyncSession,
+        intent_detected: str | None = None,
+        lead_created: bool | None = None,
+        lead_classification: str | None = None,
+    ) -> None:
+        """Record work done after the run's row was flushed (lead capture, summary update).
+
+        Adds the LLM calls made since, and updates the run's totals and any
+        outcome fields given, in a savepoint of the caller's transaction so
+        they commit together with the work they describe.
+        """
+        try:
+            async with db.begin_nested():
+                for call in self._llm_calls:
+                    db.add(LLMCallMetric(
+                        tenant_id=self.tenant_id,
+                        conversation_id=self.conversation_id,
+                        agent_run_id=self.run_id,
+                        **call,
+                    ))
+                values: dict = {
+                    "total_tokens": AgentRunMetric.total_tokens + self._total_tokens,
+                    "total_cost_usd": AgentRunMetric.total_cost_usd + self._total_cost,
+                }
+                if lead_created is not None:
+                    values["lead_created"] = lead_created
+                if lead_classification is not None:
+                    values["lead_classification"] = lead_classification
+                if intent_detected is not None:
+                    values["intent_detected"] = intent_detected
+                if self._error:
+                    values["error"] = True
+                await db.execute(
+                    update(AgentRunMetric)
+                    .where(AgentRunMetric.id == self.run_id)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+        except Exception:
+            logger.exception("Failed to flush deferred metrics for run %s", self.run_id)
+
+    def _add_rows(
+        self,
+        db: AsyncSession,
+        final_node: str | None,
+        was_escalated: bool,
+        intent_detected: str | None,
+        lead_created: bool,
+        db_checkouts: int | None,
+    ) -> None:
+        total_duration_ms = (
+            int((time.perf_counter() - self._run_start) * 1000) if self._run_start else 0
+        )
+
+        # Agent run metric
+        run = AgentRunMetric(
+            id=self.run_id,
+            tenant_id=self.tenant_id,
+            conversation_id=self.conversation_id,
+            total_duration_ms=total_duration_ms,
+            time_to_first_token_ms=self._first_token_ms,
+            response_cache_hit=self._response_cache_hit,
+            db_checkouts=db_checkouts,
+            node_sequence=">".join(self._node_sequence),
+            node_durations=self._node_durations,
+            tools_invoked=[c["node_name"] for c in self._llm_calls],
+            final_node=final_node or (self._node_sequence[-1] if self._node_sequence else None),
+            was_escalated=was_escalated,
+            intent_detected=intent_detected,
+            lead_created=lead_created,
+            total_tokens=self._total_tokens,
+            total_cost_usd=self._total_cost,
+            error=self._error,
+            langfuse_trace_id=self._langfuse_trace_id,
+        )
+        db.add(run)
+
+        # LLM call metrics
+        for call in self._llm_calls:
+            db.add(LLMCallMetric(
                 tenant_id=self.tenant_id,
                 conversation_id=self.conversation_id,
-                total_duration_ms=total_duration_ms,
-                node_sequence=">".join(self._node_sequence),
-                node_durations=self._node_durations,
-                tools_invoked=[c["node_name"] for c in self._llm_calls],
-                final_node=final_node or (self._node_sequence[-1] if self._node_sequence else None),
-                was_escalated=was_escalated,
-                intent_detected=intent_detected,
-                lead_created=lead_created,
-                total_tokens=self._total_tokens,
-                total_cost_usd=self._total_cost,
-                error=self._error,
+                agent_run_id=self.run_id,
                 langfuse_trace_id=self._langfuse_trace_id,
-            )
-            db.add(run)
-
-            # LLM call metrics
-            for call in self._llm_calls:
-                db.add(LLMCallMetric(
-                    tenant_id=self.tenant_id,
-                    conversation_id=self.conversation_id,
-                    agent_run_id=self.run_id,
-                    langfuse_trace_id=self._langfuse_trace_id,
-                    **call,
-                ))
-
-            # RAG retrieval metrics
-            for retrieval in self._rag_retrievals:
-                db.add(RAGRetrievalMetric(
-                    tenant_id=self.tenant_id,
-                    agent_run_id=self.run_id,
-                    **retrieval,
-                ))
-
-            # Escalation decision metrics
-            for decision in self._escalation_decisions:
-                db.add(EscalationDecisionMetric(
-                    tenant_id=self.tenant_id,
-                    agent_run_id=self.run_id,
-                    conversation_id=self.conversation_id,
-                    **decision,
-                ))
-
-            await db.commit()
-        except Exception:
-            logger.exception("Failed to flush metrics for run %s", self.run_id)
-            await db.rollback()
+                **call,
+            ))
+
+        # RAG retrieval metrics
+        for retrieval in self._rag_retrievals:
+            db.add(RAGRetrievalMetric(
+                tenant_id=self.tenant_id,
+                agent_run_id=self.run_id,
+                **retrieval,
+            ))
+
+        # Escalation decision metrics
+        for decision in self._escalation_decisions:
+            db.add(EscalationDecisionMetric(
+                tenant_id=self.tenant_id,
+                agent_run_id=self.run_id,
+                conversation_id=self.conversation_id,
+                **decision,
+            ))
@@ -1,14 +1,27 @@
 """RAG (Retrieval-Augmented Generation) service."""
 
+import asyncio
+import hashlib
+import logging
 import time
 import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from sqlalchemy import text
+from sqlalchemy import delete, func, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.models.knowledge_document import KnowledgeDocument
+from app.services.embedding_cache import cache_key, get_embedding_cache
+from app.services.embedding_pipeline import IngestionStats, embed_in_batches
+from app.services.knowledge_writer import ChunkRecord, copy_chunks
+from app.services.llm_clients import EMBEDDING_MODEL, get_llm_clients
+from app.services.memory_index import get_memory_index
+
+logger = logging.getLogger(__name__)
+
 
 # --- Text chunking ---
 
@@ -25,24 +38,154 @@ def chunk_text(text_content: str) -> list[str]:
     return _splitter.split_text(text_content)
 
 
+def content_hash(chunk: str) -> str:
+    """SHA-256 of a chunk's text (matches the migration 007 backfill)."""
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class IngestionResult:
+    total_chunks: int
+    embedded: int
+    unchanged: int
+    deleted: int
+    reindexed: int
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.embedded or self.deleted or self.reindexed)
+
+
 # --- Embedding helpers ---
 
 
 async def _get_embeddings(texts: list[str]) -> list[list[float]]:
-    """Get embeddings via OpenAI text-embedding-3-small."""
-    from langchain_openai import OpenAIEmbeddings
+    """Get embeddings via OpenAI text-embedding-3-small (shared client pool)."""
+    return await get_llm_clients().embeddings().aembed_documents(texts)
+
+
+_inflight_embeddings: dict[str, asyncio.Future] = {}
+
 
-    embedder = OpenAIEmbeddings(
-        model="text-embedding-3-small",
-        api_key=settings.openai_api_key,
-    )
-    return await embedder.aembed_documents(texts)
+async def _embed_query(query: str) -> tuple[list[float], str]:
+    """Embed a query through the embedding cache.
+
+    Returns (embedding, cache_source) where cache_source is "memory", "redis",
+    "miss" or "disabled". Concurrent misses for the same query (retrieval and
+    the escalation check run in parallel) share one API call; a caller being
+    cancelled doesn't cancel it for the others.
+    """
+    cache = get_embedding_cache()
+    if cache is None:
+        result = await _get_embeddings([query])
+        return result[0], "disabled"
+
+    key = cache_key(EMBEDDING_MODEL, query)
+    embedding, source = await cache.get(key)
+    if embedding is not None:
+        return embedding, source
+
+    pending = _inflight_embeddings.get(key)
+    if pending is None:
+
+        async def _fetch() -> list[float]:
+            try:
+                result = await _get_embeddings([query])
+                await cache.put(key, result[0])
+                return result[0]
+            finally:
+                _inflight_embeddings.pop(key, None)
+
+        pending = _inflight_embeddings[key] = asyncio.ensure_future(_fetch())
+    return await asyncio.shield(pending), source
 
 
 async def _get_query_embedding(query: str) -> list[float]:
     """Get embedding for a single query."""
-    result = await _get_embeddings([query])
-    return result[0]
+    embedding, _ = await _embed_query(query)
+    return embedding
+
+
+async def _timed[T](awaitable: Awaitable[T]) -> tuple[T, int]:
+    start = time.perf_counter()
+    result = await awaitable
+    return result, int((time.perf_counter() - start) * 1000)
+
+
+# --- Retrieval query ---
+
+# Transaction-local planner/index settings for the retrieval query below.
+# Custom plans let the planner match the tenant's partial HNSW index (see
+# app.services.vector_index); ef_search bounds the HNSW candidate list.
+_SEARCH_SETTINGS_SQL = text("""
+    SELECT set_config('plan_cache_mode', 'force_custom_plan', true),
+           set_config('hnsw.ef_search', :ef_search, true)
+""")
+
+# The distance is computed once per candidate. The inner ORDER BY/LIMIT is
+# exactly the shape the tenant's HNSW index (vector_cosine_ops) can serve, so the
+# threshold is applied afterwards: folding it into the inner WHERE would make
+# the scan filter rather than stop after top_k. ``query_embedding`` is bound
+# as a float list and sent as a binary pgvector value (see
+# app.database.register_vector_codec).
+NEAREST_CHUNKS_SQL = text("""
+    SELECT id, title, content, doc_type, chunk_index, distance
+    FROM (
+        SELECT id, title, content, doc_type, chunk_index,
+               embedding <=> :query_embedding AS distance
+        FROM knowledge_documents
+        WHERE tenant_id = :tenant_id
+        ORDER BY distance
+        LIMIT :top_k
+    ) AS nearest
+    WHERE distance <= :max_distance
+    ORDER BY distance
+""")
+
+# Full-text leg of hybrid retrieval. plainto_tsquery ANDs every term, which
+# misses chunks that only mention the product name from a longer question, so
+# the terms are OR-ed and ranked by cover density (normalized by length, 32).
+# A single shared word is not evidence of relevance: matches must also pass the
+# similarity threshold, so the tenant's threshold still decides whether any
+# context is found. The leg adds chunks the vector candidate list cut off and
+# boosts those both legs agree on.
+LEXICAL_CHUNKS_SQL = text("""
+    SELECT id, title, content, doc_type, chunk_index,
+           embedding <=> :query_embedding AS distance,
+           ts_rank_cd(content_tsv, q, 32) AS rank
+    FROM knowledge_documents,
+         to_tsquery(
+             'english', replace(plainto_tsquery('english', :query)::text, ' & ', ' | ')
+         ) AS q
+    WHERE tenant_id = :tenant_id
+      AND content_tsv @@ q
+      AND (embedding <=> :query_embedding) <= :max_distance
+    ORDER BY rank DESC
+    LIMIT :limit
+""")
+
+# Each leg fetches this many times top_k candidates before fusion
+_HYBRID_CANDIDATE_FACTOR = 2
+
+
+def reciprocal_rank_fusion(legs: list[list[dict]], k: int = 60) -> list[dict]:
+    """Merge ranked result lists by reciprocal rank fusion.
+
+    Each chunk scores ``sum(1 / (k + rank))`` over the lists it appears in, so
+    a chunk ranked moderately by both legs beats one ranked highly by only
+    one. Rows are matched by id; the first row seen with a similarity is kept
+    so vector scores survive fusion. Results carry ``rrf_score``.
+    """
+    scores: dict[str, float] = {}
+    rows: dict[str, dict] = {}
+    for leg in legs:
+        for rank, row in enumerate(leg, start=1):
+            scores[row["id"]] = scores.get(row["id"], 0.0) + 1.0 / (k + rank)
+            kept = rows.get(row["id"])
+            if kept is None or (kept["similarity"] is None and row["similarity"] is not None):
+                rows[row["id"]] = row
+    ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+    return [{**rows[chunk_id], "rrf_score": scores[chunk_id]} for chunk_id in ranked]
 
 
 # --- RAG Service ---
@@ -58,61 +201,142 @@ class RAGService:
         title: str,
         content: str,
         doc_type: str,
-    ) -> list[KnowledgeDocument]:
-        """Chunk, embed, and store a document."""
+        on_progress: Callable[[IngestionStats], Awaitable[None]] | None = None,
+    ) -> IngestionResult:
+        """Chunk, embed, and store a document, diffing against any existing version.
+
+        Chunks of a previously ingested document with the same title are
+        matched by content hash: unchanged chunks are kept (re-indexed if they
+        moved), only new or edited chunks are embedded, and chunks that no
+        longer appear are deleted. New chunks are embedded in concurrent
+        token-budgeted batches and streamed into a single bulk COPY;
+        ``on_progress`` is awaited after every batch.
+
+        Callers bump the tenant's knowledge version after committing when
+        ``result.changed`` -- bumping earlier would let a concurrent reader
+        cache the pre-commit corpus under the new version.
+        """
         chunks = chunk_text(content)
         if not chunks:
-            return []
-
-        embeddings = await _get_embeddings(chunks)
-
-        documents = []
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings, strict=True)):
-            doc = KnowledgeDocument(
-                id=uuid.uuid4(),
-                tenant_id=tenant_id,
-                title=title,
-                content=chunk,
-                doc_type=doc_type,
-                chunk_index=i,
-                embedding=embedding,
+            return IngestionResult(total_chunks=0, embedded=0, unchanged=0, deleted=0, reindexed=0)
+
+        # Serialize concurrent re-uploads of the same document
+        await self.db.execute(
+            select(func.pg_advisory_xact_lock(func.hashtext(f"{tenant_id}:{title}")))
+        )
+        existing = await self.db.execute(
+            select(
+                KnowledgeDocument.id,
+                KnowledgeDocument.chunk_index,
+                KnowledgeDocument.doc_type,
+                KnowledgeDocument.content_hash,
+            ).where(
+                KnowledgeDocument.tenant_id == tenant_id,
+                KnowledgeDocument.title == title,
             )
-            self.db.add(doc)
-            documents.append(doc)
+        )
+        reusable: dict[str, list] = {}
+        for row in existing:
+            reusable.setdefault(row.content_hash, []).append(row)
+
+        hashes = [content_hash(chunk) for chunk in chunks]
+        moved: list[dict] = []
+        new_positions: list[int] = []
+        for index, chunk_hash in enumerate(hashes):
+            candidates = reusable.get(chunk_hash)
+            if not candidates:
+                new_positions.append(index)
+                continue
+            row = candidates.pop()
+            if row.chunk_index != index or row.doc_type != doc_type:
+                moved.append({"id": row.id, "chunk_index": index, "doc_type": doc_type})
+
+        stale_ids = [row.id for rows in reusable.values() for row in rows]
+        if stale_ids:
+            await self.db.execute(
+                delete(KnowledgeDocument).where(KnowledgeDocument.id.in_(stale_ids))
+            )
+        if moved:
+            await self.db.execute(update(KnowledgeDocument), moved)
+
+        new_texts = [chunks[i] for i in new_positions]
+        stats = IngestionStats(total_chunks=len(new_texts), total_batches=0)
+
+        async def _records() -> AsyncIterator[ChunkRecord]:
+            async for batch in embed_in_batches(new_texts, _get_embeddings, stats=stats):
+                for offset, embedding in enumerate(batch.embeddings):
+                    position = new_positions[batch.start + offset]
+                    yield (
+                        uuid.uuid4(),
+                        tenant_id,
+                        title,
+                        chunks[position],
+                        doc_type,
+                        position,
+                        embedding,
+                        hashes[position],
+                    )
+                if on_progress is not None:
+                    await on_progress(stats)
+
+        embedded = await copy_chunks(self.db, _records()) if new_texts else 0
+        result = IngestionResult(
+            total_chunks=len(chunks),
+            embedded=embedded,
+            unchanged=len(chunks) - embedded,
+            deleted=len(stale_ids),
+            reindexed=len(moved),
+        )
 
-        await self.db.flush()
-        return documents
+        logger.info(
+            "Ingested %r for %s: %d chunks (%d embedded, %d unchanged, %d deleted) "
+            "in %.2fs, %.1f chunks/s, %d retries",
+            title,
+            tenant_id,
+            result.total_chunks,
+            result.embedded,
+            result.unchanged,
+            result.deleted,
+            stats.elapsed_seconds,
+            stats.chunks_per_second,
+            stats.retries,
+        )
 
-    async def search(
+        return result
+
+    async def _nearest_chunks(
         self,
         tenant_id: str,
-        query: str,
-        top_k: int = 5,
-        threshold: float = 0.78,
-    ) -> list[dict]:
-        """Retrieve relevant document chunks via cosine similarity."""
-        query_embedding = await _get_query_embedding(query)
+        query_embedding: list[float],
+        top_k: int,
+        threshold: float,
+        ef_search: int | None = None,
+    ) -> tuple[list[dict], str]:
+        """Top-k chunks by cosine similarity, dropping those below ``threshold``.
+
+        Served from the in-process index when enabled and the tenant fits in
+        it, otherwise from pgvector. Returns (results, backend) where backend
+        is "memory" or "pgvector".
+        """
+        memory_index = get_memory_index()
+        if memory_index is not None:
+            results = await memory_index.search(
+                self.db, tenant_id, query_embedding, top_k, threshold
+            )
+            if results is not None:
+                return results, "memory"
 
+        ef_search = max(ef_search or settings.rag_hnsw_ef_search, top_k)
+        await self.db.execute(_SEARCH_SETTINGS_SQL, {"ef_search": str(ef_search)})
         result = await self.db.execute(
-            text("""
-                SELECT id, title, content, doc_type, chunk_index,
-                       1 - (embedding <=> CAST(:query_embedding AS vector)) AS similarity
-                FROM knowledge_documents
-                WHERE tenant_id = :tenant_id
-                  AND embedding IS NOT NULL
-                  AND (1 - (embedding <=> CAST(:query_embedding AS vector))) >= :threshold
-                ORDER BY embedding <=> CAST(:query_embedding AS vector)
-                LIMIT :top_k
-            """),
+            NEAREST_CHUNKS_SQL,
             {
-                "query_embedding": str(query_embedding),
+                "query_embedding": query_embedding,
                 "tenant_id": tenant_id,
-                "threshold": threshold,
+                "max_distance": 1 - threshold,
                 "top_k": top_k,
             },
         )
-
-        rows = result.fetchall()
         return [
             {
                 "id": str(row.id),
@@ -120,62 +344,103 @@ class RAGService:
                 "content": row.content,
                 "doc_type": row.doc_type,
                 "chunk_index": row.chunk_index,
-                "similarity": float(row.similarity),
+                "similarity": 1 - float(row.distance),
             }
-            for row in rows
-        ]
+            for row in result
+        ], "pgvector"
 
-    async def search_with_stats(
+    async def _lexical_chunks(
         self,
         tenant_id: str,
         query: str,
-        top_k: int = 5,
-        threshold: float = 0.78,
-    ) -> tuple[str, dict]:
-        """Search, format context, and return stats for metrics collection."""
-        total_start = time.perf_counter()
-
-        # Time embedding separately
-        embed_start = time.perf_counter()
-        query_embedding = await _get_query_embedding(query)
-        embedding_latency_ms = int((time.perf_counter() - embed_start) * 1000)
-
-        # Time DB search separately
-        search_start = time.perf_counter()
+        query_embedding: list[float],
+        limit: int,
+        threshold: float,
+    ) -> list[dict]:
+        """Top chunks by full-text rank (any query term matches) above ``threshold``."""
         result = await self.db.execute(
-            text("""
-                SELECT id, title, content, doc_type, chunk_index,
-                       1 - (embedding <=> CAST(:query_embedding AS vector)) AS similarity
-                FROM knowledge_documents
-                WHERE tenant_id = :tenant_id
-                  AND embedding IS NOT NULL
-                  AND (1 - (embedding <=> CAST(:query_embedding AS vector))) >= :threshold
-                ORDER BY embedding <=> CAST(:query_embedding AS vector)
-                LIMIT :top_k
-            """),
+            LEXICAL_CHUNKS_SQL,
             {
-                "query_embedding": str(query_embedding),
                 "tenant_id": tenant_id,
-                "threshold": threshold,
-                "top_k": top_k,
+                "query": query,
+                "query_embedding": query_embedding,
+                "max_distance": 1 - threshold,
+                "limit": limit,
             },
         )
-        rows = result.fetchall()
-        search_latency_ms = int((time.perf_counter() - search_start) * 1000)
-        total_latency_ms = int((time.perf_counter() - total_start) * 1000)
-
-        results = [
+        return [
             {
                 "id": str(row.id),
                 "title": row.title,
                 "content": row.content,
                 "doc_type": row.doc_type,
                 "chunk_index": row.chunk_index,
-                "similarity": float(row.similarity),
+                "similarity": 1 - float(row.distance),
             }
-            for row in rows
+            for row in result
         ]
 
+    async def _retrieve(
+        self,
+        tenant_id: str,
+        query: str,
+        top_k: int,
+        threshold: float,
+        ef_search: int | None,
+    ) -> tuple[list[dict], dict]:
+        """Run the configured retrieval mode; returns (results, per-leg timings)."""
+        mode = settings.rag_retrieval_mode
+        hybrid = mode == "hybrid"
+        candidates = top_k * _HYBRID_CANDIDATE_FACTOR if hybrid else top_k
+
+        (query_embedding, cache_source), embedding_latency_ms = await _timed(_embed_query(query))
+        (vector, search_backend), search_latency_ms = await _timed(
+            self._nearest_chunks(tenant_id, query_embedding, candidates, threshold, ef_search)
+        )
+        if hybrid:
+            lexical, lexical_latency_ms = await _timed(
+                self._lexical_chunks(tenant_id, query, query_embedding, candidates, threshold)
+            )
+            results = reciprocal_rank_fusion([vector, lexical], k=settings.rag_rrf_k)[:top_k]
+        else:
+            results, lexical, lexical_latency_ms = vector, None, None
+
+        return results, {
+            "retrieval_mode": mode,
+            "cache_source": cache_source,
+            "embedding_latency_ms": embedding_latency_ms,
+            "search_latency_ms": search_latency_ms,
+            "search_backend": search_backend,
+            "lexical_latency_ms": lexical_latency_ms,
+            "lexical_hits": len(lexical) if lexical is not None else None,
+        }
+
+    async def search(
+        self,
+        tenant_id: str,
+        query: str,
+        top_k: int = 5,
+        threshold: float = 0.78,
+        ef_search: int | None = None,
+    ) -> list[dict]:
+        """Retrieve relevant document chunks (vector or hybrid, per ``rag_retrieval_mode``)."""
+        results, _ = await self._retrieve(tenant_id, query, top_k, threshold, ef_search)
+        return results
+
+    async def search_with_stats(
+        self,
+        tenant_id: str,
+        query: str,
+        top_k: int = 5,
+        threshold: float = 0.78,
+        ef_search: int | None = None,
+    ) -> tuple[str, dict]:
+        """Search, format context, and return stats for metrics collection."""
+        total_start = time.perf_counter()
+        results, timings = await self._retrieve(tenant_id, query, top_k, threshold, ef_search)
+        total_latency_ms = int((time.perf_counter() - total_start) * 1000)
+        cache_source = timings["cache_source"]
+
         # Compute stats
         similarities = [r["similarity"] for r in results]
         stats = {
@@ -185,8 +450,15 @@ class RAGService:
             "max_similarity": max(similarities) if similarities else None,
             "min_similarity": min(similarities) if similarities else None,
             "threshold_used": threshold,
-            "embedding_latency_ms": embedding_latency_ms,
-            "search_latency_ms": search_latency_ms,
+            "embedding_latency_ms": timings["embedding_latency_ms"],
+            "embedding_cache_hit": (
+                None if cache_source == "disabled" else cache_source != "miss"
+            ),
+            "search_latency_ms": timings["search_latency_ms"],
+            "search_backend": timings["search_backend"],
+            "retrieval_mode": timings["retrieval_mode"],
+            "lexical_latency_ms": timings["lexical_latency_ms"],
+            "lexical_hits": timings["lexical_hits"],
             "total_latency_ms": total_latency_ms,
         }
 
@@ -209,7 +481,7 @@ class RAGService:
         return context
 
     async def delete_document_chunks(self, tenant_id: str, title: str) -> int:
-        """Delete all chunks for a document by title."""
+        """Delete all chunks for a document by title (callers bump the version after commit)."""
         result = await self.db.execute(
             text("""
                 DELETE FROM knowledge_documents
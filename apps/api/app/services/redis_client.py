@@ -0,0 +1,32 @@
+"""Shared async Redis client for API-side caches."""
+
+import logging
+
+import redis.asyncio as aioredis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis_instance: aioredis.Redis | None = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Return the process-wide Redis client (connections are pooled and lazy)."""
+    global _redis_instance
+
+    if _redis_instance is None:
+        _redis_instance = aioredis.from_url(
+            settings.redis_url,
+            socket_timeout=settings.redis_socket_timeout_seconds,
+            socket_connect_timeout=settings.redis_socket_timeout_seconds,
+        )
+    return _redis_instance
+
+
+async def close_redis() -> None:
+    global _redis_instance
+
+    if _redis_instance is not None:
+        await _redis_instance.aclose()
+        _redis_instance = None
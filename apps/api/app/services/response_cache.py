@@ -0,0 +1,150 @@
+"""Semantic cache of generated answers for single-shot FAQ questions.
+
+An entry is keyed by tenant, the L2-normalized query embedding and the tenant's
+knowledge-base version. A lookup hits when an entry for the same tenant and
+version lies within ``response_cache_similarity`` (cosine) of the query, so
+"how much is botox?" and "what does botox cost" can share an answer. Any
+ingest/delete bumps the version (see ``knowledge_version``), which makes every
+older entry for that tenant unreachable; they are dropped on the next lookup.
+
+Entries are per process. Each tenant's embeddings are kept as one float32
+matrix so a lookup is a single matrix-vector product.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _TenantEntries:
+    version: int
+    vectors: np.ndarray  # (n, dim) float32, rows L2-normalized
+    responses: list[str] = field(default_factory=list)
+    expires_at: list[float] = field(default_factory=list)
+
+
+def _normalize(embedding: list[float]) -> np.ndarray | None:
+    vec = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vec))
+    if norm == 0.0:
+        return None
+    return vec / norm
+
+
+class ResponseCache:
+    """Per-tenant semantic answer cache with version-stamped invalidation."""
+
+    def __init__(
+        self,
+        similarity: float,
+        ttl_seconds: int,
+        max_entries_per_tenant: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._similarity = similarity
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries_per_tenant
+        self._clock = clock
+        self._tenants: dict[str, _TenantEntries] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, tenant_id: str, version: int, embedding: list[float]) -> str | None:
+        entries = self._current(tenant_id, version)
+        query = _normalize(embedding)
+        if entries is None or query is None or not entries.responses:
+            self.misses += 1
+            return None
+
+        scores = entries.vectors @ query
+        best = int(np.argmax(scores))
+        if scores[best] >= self._similarity and entries.expires_at[best] > self._clock():
+            self.hits += 1
+            return entries.responses[best]
+
+        self.misses += 1
+        return None
+
+    def store(self, tenant_id: str, version: int, embedding: list[float], response: str) -> None:
+        vec = _normalize(embedding)
+        if vec is None or not response:
+            return
+
+        existing = self._tenants.get(tenant_id)
+        if existing is not None and existing.version > version:
+            return  # corpus changed while this answer was being generated
+
+        entries = self._current(tenant_id, version)
+        if entries is None:
+            empty = np.empty((0, vec.shape[0]), dtype=np.float32)
+            entries = _TenantEntries(version=version, vectors=empty)
+            self._tenants[tenant_id] = entries
+
+        self._evict_expired(entries)
+        if len(entries.responses) >= self._max_entries:
+            # Oldest-first: entries are appended in insertion order
+            entries.vectors = entries.vectors[1:]
+            entries.responses.pop(0)
+            entries.expires_at.pop(0)
+
+        entries.vectors = np.vstack([entries.vectors, vec[np.newaxis, :]])
+        entries.responses.append(response)
+        entries.expires_at.append(self._clock() + self._ttl)
+
+    def invalidate(self, tenant_id: str) -> None:
+        self._tenants.pop(tenant_id, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "tenants": len(self._tenants),
+            "entries": sum(len(e.responses) for e in self._tenants.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _current(self, tenant_id: str, version: int) -> _TenantEntries | None:
+        entries = self._tenants.get(tenant_id)
+        if entries is not None and entries.version != version:
+            # Corpus changed since these answers were generated
+            del self._tenants[tenant_id]
+            return None
+        return entries
+
+    def _evict_expired(self, entries: _TenantEntries) -> None:
+        now = self._clock()
+        keep = [i for i, exp in enumerate(entries.expires_at) if exp > now]
+        if len(keep) == len(entries.expires_at):
+            return
+        entries.vectors = entries.vectors[keep]
+        entries.responses = [entries.responses[i] for i in keep]
+        entries.expires_at = [entries.expires_at[i] for i in keep]
+
+
+_cache_instance: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the process-wide response cache, or None unless opted in."""
+    global _cache_instance
+
+    if not settings.response_cache_enabled:
+        return None
+
+    if _cache_instance is None:
+        _cache_instance = ResponseCache(
+            similarity=settings.response_cache_similarity,
+            ttl_seconds=settings.response_cache_ttl_seconds,
+            max_entries_per_tenant=settings.response_cache_max_entries_per_tenant,
+        )
+    return _cache_instance
@@ -0,0 +1,236 @@
+"""Per-tenant metadata and runtime configuration cached in-process.
+
+Chat resolves the tenant (for its name) and retrieval reads its overrides
+stored in ``Tenant.settings`` on every message, so both are read once per
+process and kept in memory. Unknown tenant ids are cached too (for a shorter
+TTL) so a misconfigured widget can't turn every message into a miss. Entries are
+dropped when ``update_settings`` publishes an invalidation on a Redis pub/sub
+channel that every API worker listens to (see ``run_invalidation_listener``),
+so changes propagate within a round trip. A TTL bounds staleness if a message
+is missed (Redis down, listener reconnecting). The chat endpoint is public, so
+the cache is an LRU bounded by entry count: random tenant ids can't grow it.
+
+The chat tenant id may be the Clerk org id or the tenant's UUID (embed
+widget), so entries are keyed by whichever form was looked up and
+invalidations carry both.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import redis.asyncio as aioredis
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agent.escalation_patterns import normalize_tenant_rules
+from app.config import settings
+from app.models.tenant import Tenant
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "tenant-config:invalidate"
+
+
+@dataclass(frozen=True)
+class TenantConfig:
+    similarity_threshold: float
+    top_k: int
+    # Extra escalation phrases per category (see escalation_patterns)
+    escalation_rules: tuple[tuple[str, tuple[str, ...]], ...] = ()
+
+    @classmethod
+    def defaults(cls) -> "TenantConfig":
+        return cls(
+            similarity_threshold=settings.rag_similarity_threshold,
+            top_k=settings.rag_top_k,
+        )
+
+    @classmethod
+    def from_settings(cls, tenant_settings: dict | None) -> "TenantConfig":
+        """Apply a tenant's JSONB overrides on top of the global defaults."""
+        config = cls.defaults()
+        tenant_settings = tenant_settings or {}
+        threshold = tenant_settings.get("similarity_threshold")
+        top_k = tenant_settings.get("top_k")
+        return cls(
+            similarity_threshold=(
+                float(threshold) if threshold is not None else config.similarity_threshold
+            ),
+            top_k=int(top_k) if top_k is not None else config.top_k,
+            escalation_rules=normalize_tenant_rules(tenant_settings.get("escalation_rules")),
+        )
+
+
+@dataclass(frozen=True)
+class TenantInfo:
+    id: uuid.UUID
+    clerk_org_id: str
+    name: str
+    config: TenantConfig
+
+
+def tenant_filter(tenant_id: str):
+    """WHERE clause matching a tenant by Clerk org id or UUID in one query."""
+    try:
+        return or_(Tenant.clerk_org_id == tenant_id, Tenant.id == uuid.UUID(tenant_id))
+    except ValueError:
+        return Tenant.clerk_org_id == tenant_id
+
+
+class TenantConfigCache:
+    """In-process TTL + LRU cache of ``TenantInfo`` (or None if unknown) keyed by tenant id."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        negative_ttl_seconds: float | None = None,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._ttl = ttl_seconds
+        self._negative_ttl = ttl_seconds if negative_ttl_seconds is None else negative_ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, TenantInfo | None]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    async def get_info(self, db: AsyncSession, tenant_id: str) -> TenantInfo | None:
+        """Cached tenant metadata, loading it through ``db`` on a miss.
+
+        ``db`` is only used on a miss, so a session that is never executed on
+        never checks out a connection.
+        """
+        hit, info = self.lookup(tenant_id)
+        if hit:
+            return info
+
+        self.misses += 1
+        result = await db.execute(
+            select(Tenant.id, Tenant.clerk_org_id, Tenant.name, Tenant.settings)
+            .where(tenant_filter(tenant_id))
+            .limit(1)
+        )
+        row = result.first()
+        if row is None:
+            self._store(tenant_id, self._negative_ttl, None)
+            return None
+
+        info = TenantInfo(
+            id=row.id,
+            clerk_org_id=row.clerk_org_id,
+            name=row.name,
+            config=TenantConfig.from_settings(row.settings),
+        )
+        self._store(tenant_id, self._ttl, info)
+        return info
+
+    def lookup(self, tenant_id: str) -> tuple[bool, TenantInfo | None]:
+        """(hit, info) from the cache alone, for callers that would rather not take a session."""
+        entry = self._entries.get(tenant_id)
+        if entry is not None:
+            if entry[0] > self._clock():
+                self._entries.move_to_end(tenant_id)
+                self.hits += 1
+                return True, entry[1]
+            del self._entries[tenant_id]
+        return False, None
+
+    async def get(self, db: AsyncSession, tenant_id: str) -> TenantConfig:
+        """Cached config for a tenant (global defaults for unknown tenants)."""
+        info = await self.get_info(db, tenant_id)
+        return info.config if info is not None else TenantConfig.defaults()
+
+    def invalidate(self, *tenant_ids: str) -> None:
+        for tenant_id in tenant_ids:
+            self._entries.pop(tenant_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _store(self, tenant_id: str, ttl: float, info: TenantInfo | None) -> None:
+        self._entries[tenant_id] = (self._clock() + ttl, info)
+        self._entries.move_to_end(tenant_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+_cache_instance: TenantConfigCache | None = None
+
+
+def get_tenant_config_cache() -> TenantConfigCache:
+    global _cache_instance
+
+    if _cache_instance is None:
+        _cache_instance = TenantConfigCache(
+            ttl_seconds=settings.tenant_config_ttl_seconds,
+            negative_ttl_seconds=settings.tenant_config_negative_ttl_seconds,
+            max_entries=settings.tenant_config_cache_max_entries,
+        )
+    return _cache_instance
+
+
+async def get_tenant_config(db: AsyncSession, tenant_id: str) -> TenantConfig:
+    return await get_tenant_config_cache().get(db, tenant_id)
+
+
+async def get_tenant_info(db: AsyncSession, tenant_id: str) -> TenantInfo | None:
+    return await get_tenant_config_cache().get_info(db, tenant_id)
+
+
+async def publish_tenant_config_change(tenant: Tenant) -> None:
+    """Drop a tenant's cached entries here and in every other worker (call after commit)."""
+    tenant_ids = (tenant.clerk_org_id, str(tenant.id))
+    get_tenant_config_cache().invalidate(*tenant_ids)
+
+    from app.services.redis_client import get_redis
+
+    try:
+        await get_redis().publish(INVALIDATION_CHANNEL, " ".join(tenant_ids))
+    except Exception:
+        logger.warning(
+            "Tenant config invalidation publish failed for %s", tenant.clerk_org_id, exc_info=True
+        )
+
+
+async def run_invalidation_listener() -> None:
+    """Apply invalidations published by other workers until cancelled.
+
+    Uses its own connection without a read timeout (the shared client's short
+    socket timeout would break a blocking subscribe). When the connection is
+    lost the whole cache is cleared once, since invalidations may have been
+    missed; failed reconnects leave it alone, so an outage doesn't turn every
+    lookup into a DB query.
+    """
+    cache = get_tenant_config_cache()
+    disconnected = False
+    while True:
+        client = aioredis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=settings.redis_socket_timeout_seconds,
+        )
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                if disconnected:
+                    logger.info("Tenant config listener reconnected")
+                    disconnected = False
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        cache.invalidate(*message["data"].decode().split())
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            if not disconnected:
+                logger.warning("Tenant config listener disconnected; retrying", exc_info=True)
+                cache.clear()
+                disconnected = True
+            await asyncio.sleep(1.0)
+        finally:
+            await client.aclose()
@@ -0,0 +1,141 @@
+"""Request-scoped unit of work for a chat turn.
+
+A chat turn used to open a fresh session (and pool checkout, and usually a
+commit) for each step: tenant lookup, conversation load, retrieval, lead or
+escalation write, transcript save and metrics flush. ``UnitOfWork`` gives the
+whole turn one ``AsyncSession`` that graph nodes reach through
+``turn_session()`` (like ``get_collector()`` for metrics):
+
+- reads share the session's transaction; ``turn_session(release=True)`` ends
+  it afterwards so no connection is held while the LLM generates
+- writes are only staged (added/flushed) and the router commits them together
+  at the end of the turn with ``commit()``; safety-critical ones (escalations)
+  commit on their own with ``turn_session(release=True)`` instead, so a
+  failure later in the turn can't lose them
+- ``after_commit`` defers side effects (notifications) until the data exists
+
+Outside a chat turn (tools, scripts, tests) ``turn_session()`` falls back to a
+short-lived session that commits on exit, so nodes work either way.
+"""
+
+import asyncio
+import contextvars
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+_uow_ctx: contextvars.ContextVar["UnitOfWork | None"] = contextvars.ContextVar(
+    "_uow_ctx", default=None
+)
+
+
+def get_unit_of_work() -> "UnitOfWork | None":
+    return _uow_ctx.get()
+
+
+class UnitOfWork:
+    """One lazily-connected session shared by every step of a chat turn."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session = session_factory()
+        self._lock = asyncio.Lock()
+        self._after_commit: list[Callable[[], Awaitable[None]]] = []
+        self._token: contextvars.Token | None = None
+
+        # Each transaction the session begins is one connection checkout
+        self.checkouts = 0
+        self.commits = 0
+        self._wrote = False
+        event.listen(self.session.sync_session, "after_begin", self._on_begin)
+        event.listen(self.session.sync_session, "after_flush", self._on_flush)
+
+    def _on_begin(self, session, transaction, connection) -> None:
+        self.checkouts += 1
+        self._wrote = False
+
+    def _on_flush(self, session, flush_context) -> None:
+        self._wrote = True
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._token = _uow_ctx.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._token is not None:
+            _uow_ctx.reset(self._token)
+            self._token = None
+        await self.session.close()
+
+    @asynccontextmanager
+    async def use(self, release: bool = False) -> AsyncIterator[AsyncSession]:
+        """Exclusive access to the shared session (parallel graph branches serialize here).
+
+        With ``release`` the transaction is ended afterwards so the connection
+        goes back to the pool: rolled back if it only read, committed if it
+        wrote. If the block is interrupted (e.g. the answer branch cancelled
+        mid-query) the connection is discarded rather than reused in an
+        unknown state.
+        """
+        async with self._lock:
+            try:
+                yield self.session
+            except asyncio.CancelledError:
+                await asyncio.shield(self.session.invalidate())
+                raise
+            except Exception:
+                await self.session.rollback()
+                raise
+            if release:
+                await self._end_transaction()
+
+    async def _end_transaction(self) -> None:
+        if self._wrote or self.session.new or self.session.dirty or self.session.deleted:
+            await self.session.commit()
+            self.commits += 1
+            self._wrote = False
+        elif self.session.in_transaction():
+            await self.session.rollback()
+
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        self._after_commit.append(callback)
+
+    async def commit(self) -> None:
+        """Commit everything staged during the turn, then run deferred callbacks."""
+        async with self._lock:
+            await self._end_transaction()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception:
+                logger.exception("after_commit callback failed")
+
+
+@asynccontextmanager
+async def turn_session(release: bool = False) -> AsyncIterator[AsyncSession]:
+    """The current turn's shared session, or a standalone one that commits on exit."""
+    uow = get_unit_of_work()
+    if uow is not None:
+        async with uow.use(release=release) as session:
+            yield session
+        return
+
+    from app.database import async_session_factory
+
+    async with async_session_factory() as session:
+        yield session
+        await session.commit()
+
+
+async def after_commit(callback: Callable[[], Awaitable[None]]) -> None:
+    """Run ``callback`` once the current turn commits (immediately outside a turn)."""
+    uow = get_unit_of_work()
+    if uow is not None:
+        uow.after_commit(callback)
+    else:
+        await callback()
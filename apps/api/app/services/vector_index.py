@@ -0,0 +1,87 @@
+"""Per-tenant HNSW indexes on knowledge_documents.embedding.
+
+A single global HNSW index makes every tenant's ANN search walk a graph
+built over all tenants' vectors and then discard the other tenants' hits,
+so recall at small top_k falls as more spas are onboarded. Instead each
+tenant gets a partial index (``WHERE tenant_id = '<tenant>'``) whose graph
+only contains its own chunks. The index is created when the tenant is
+onboarded (``provision_tenant_vector_indexes``), while it has no chunks and
+the build is instant; ingestion re-checks it as a safety net. A tenant
+without one falls back to the tenant_id btree plus an exact sort.
+
+Partial indexes are only matched when the planner sees the tenant_id value,
+so retrieval runs with ``plan_cache_mode = force_custom_plan`` (see
+``RAGService._nearest_chunks``).
+"""
+
+import hashlib
+import logging
+from collections.abc import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+_indexed_tenants: set[str] = set()
+
+
+def tenant_index_name(tenant_id: str) -> str:
+    digest = hashlib.sha1(tenant_id.encode("utf-8"), usedforsecurity=False).hexdigest()[:16]
+    return f"ix_knowledge_embedding_{digest}"
+
+
+def tenant_index_ddl(tenant_id: str, concurrently: bool = True) -> str:
+    """CREATE INDEX statement for a tenant (DDL can't take bind parameters)."""
+    literal = "'" + tenant_id.replace("'", "''") + "'"
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS "
+        f"{tenant_index_name(tenant_id)} ON knowledge_documents "
+        f"USING hnsw (embedding vector_cosine_ops) WHERE tenant_id = {literal}"
+    )
+
+
+async def ensure_tenant_vector_index(conn: AsyncConnection, tenant_id: str) -> bool:
+    """Create the tenant's partial HNSW index if it is missing or invalid.
+
+    ``conn`` must be in AUTOCOMMIT mode: the index is built CONCURRENTLY so
+    onboarding a tenant never blocks other tenants' ingestion. Returns True
+    if an index was (re)built.
+    """
+    if tenant_id in _indexed_tenants:
+        return False
+
+    name = tenant_index_name(tenant_id)
+    valid = await conn.scalar(
+        text("""
+            SELECT i.indisvalid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name
+        """),
+        {"name": name},
+    )
+    if valid:
+        _indexed_tenants.add(tenant_id)
+        return False
+
+    if valid is False:
+        # Left behind by an interrupted CREATE INDEX CONCURRENTLY
+        await conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+    await conn.exec_driver_sql(tenant_index_ddl(tenant_id))
+    _indexed_tenants.add(tenant_id)
+    logger.info("Built HNSW index %s for tenant %s", name, tenant_id)
+    return True
+
+
+async def provision_tenant_vector_indexes(engine: AsyncEngine, tenant_ids: Iterable[str]) -> None:
+    """Create a newly onboarded tenant's partial HNSW indexes.
+
+    Pass every identifier the tenant's chunks may be stored under (Clerk org
+    id and tenant UUID), so its first queries never run without an index.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for tenant_id in tenant_ids:
+            await ensure_tenant_vector_index(conn, tenant_id)
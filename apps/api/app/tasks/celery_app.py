@@ -1,6 +1,7 @@
 """Celery application configuration."""
 
 from celery import Celery
+from celery.schedules import crontab
 
 from app.config import settings
 
@@ -24,4 +25,16 @@ celery_app.conf.update(
         "app.tasks.send_notification.*": {"queue": "notifications"},
         "app.tasks.document_ingestion.*": {"queue": "ingestion"},
     },
+    # Run by `celery beat`
+    beat_schedule={
+        "purge-escalation-embeddings": {
+            "task": "purge_escalation_embeddings",
+            "schedule": crontab(hour=3, minute=0),
+        },
+    },
+    imports=[
+        "app.tasks.document_ingestion",
+        "app.tasks.lead_capture",
+        "app.tasks.metrics_retention",
+    ],
 )
@@ -1,17 +1,42 @@
 """Celery task for knowledge base document ingestion."""
 
+import asyncio
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.database import register_vector_codec
+from app.services.ingestion import run_ingestion_job
+from app.services.llm_clients import close_llm_clients
+from app.services.redis_client import close_redis
 from app.tasks.celery_app import celery_app
 
 
-@celery_app.task(name="document_ingestion")
-def ingest_document(document_id: str) -> dict[str, str]:
-    """Process and embed a knowledge base document.
+async def _run(job_id: uuid.UUID) -> dict[str, str]:
+    # Each task gets its own event loop, so it can't reuse the API's pooled
+    # engine or HTTP clients -- open unpooled connections and close them after.
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    register_vector_codec(engine)
+    try:
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        return await run_ingestion_job(factory, job_id)
+    finally:
+        await close_llm_clients()
+        await close_redis()
+        await engine.dispose()
+
+
+@celery_app.task(name="document_ingestion", queue="ingestion", acks_late=True)
+def ingest_document(job_id: str) -> dict[str, str]:
+    """Process and embed an uploaded knowledge base document.
 
     Pipeline:
-    1. Fetch document from DB by ID
-    2. Chunk text (512 tokens, 50-token overlap)
-    3. Embed chunks via OpenAI text-embedding-3-small
-    4. Store embeddings in pgvector
+    1. Fetch the ingestion job (raw upload bytes) from DB by ID
+    2. Extract text (PDF or plain text)
+    3. Chunk text (512 chars, 50-char overlap)
+    4. Embed chunks in batches via OpenAI text-embedding-3-small
+    5. Store chunks in pgvector and mark the job completed (one transaction)
     """
-    # TODO: Implement
-    return {"status": "ingested", "document_id": document_id}
+    return asyncio.run(_run(uuid.UUID(job_id)))
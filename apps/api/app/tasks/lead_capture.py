@@ -0,0 +1,44 @@
+"""Celery task for post-response chat lead capture."""
+
+import asyncio
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.services.lead_capture import run_pending_capture
+from app.services.llm_clients import close_llm_clients
+from app.services.redis_client import close_redis
+from app.tasks.celery_app import celery_app
+
+
+async def _run(pending_id: uuid.UUID) -> str | None:
+    # Own event loop per task: open an unpooled engine and close clients after
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    try:
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        return await run_pending_capture(pending_id, factory)
+    finally:
+        await close_llm_clients()
+        await close_redis()
+        await engine.dispose()
+
+
+@celery_app.task(
+    name="lead_capture",
+    queue="follow_up",
+    acks_late=True,
+    autoretry_for=(Exception,),
+    max_retries=3,
+    retry_backoff=True,
+)
+def capture_chat_lead(pending_id: str) -> dict[str, str | None]:
+    """Classify a chat turn and create or update the conversation's lead.
+
+    The payload is the ``PendingLeadCapture`` id only; the message is read
+    from DB. The capture deletes that row as it commits, so a redelivered
+    or retried task does nothing once it has succeeded.
+    """
+    lead_id = asyncio.run(_run(uuid.UUID(pending_id)))
+    return {"pending_id": pending_id, "lead_id": lead_id}
@@ -0,0 +1,32 @@
+"""Celery task enforcing retention of PHI-derived metrics data."""
+
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.services.escalation_centroids import purge_expired_embeddings
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+async def _run() -> int:
+    # Own event loop per task: open an unpooled engine and dispose of it after
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    try:
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as db:
+            return await purge_expired_embeddings(db)
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="purge_escalation_embeddings")
+def purge_escalation_embeddings() -> dict[str, int]:
+    """Clear escalation decision embeddings past their retention (scheduled daily)."""
+    purged = asyncio.run(_run())
+    logger.info("Purged %d escalation decision embeddings", purged)
+    return {"purged": purged}
@@ -0,0 +1,55 @@
+"""Throughput of the batched embedding pipeline against a simulated embeddings API.
+
+The fake API charges a fixed round-trip latency plus a per-item cost, which is
+roughly how text-embedding-3-small behaves. No network or API key is needed.
+
+Usage (from apps/api):
+    python -m benchmarks.bench_embedding_pipeline [chunks]
+"""
+
+import asyncio
+import sys
+import time
+
+from app.services.embedding_pipeline import IngestionStats, embed_in_batches
+
+ROUND_TRIP_S = 0.25
+PER_ITEM_S = 0.002
+DIM = 1536
+
+
+async def _fake_embed(texts: list[str]) -> list[list[float]]:
+    await asyncio.sleep(ROUND_TRIP_S + PER_ITEM_S * len(texts))
+    return [[0.0] * DIM for _ in texts]
+
+
+async def _single_call(chunks: list[str]) -> float:
+    start = time.perf_counter()
+    await _fake_embed(chunks)
+    return len(chunks) / (time.perf_counter() - start)
+
+
+async def _pipeline(chunks: list[str], concurrency: int, max_items: int) -> IngestionStats:
+    stats = IngestionStats(total_chunks=len(chunks), total_batches=0)
+    async for _ in embed_in_batches(
+        chunks, _fake_embed, stats=stats, concurrency=concurrency, max_items=max_items
+    ):
+        pass
+    return stats
+
+
+async def main(n_chunks: int) -> None:
+    chunks = ["Botox: $12 per unit. Treats fine lines and forehead wrinkles. " * 8] * n_chunks
+    print(f"chunks={n_chunks} (simulated {ROUND_TRIP_S * 1000:.0f}ms RTT + "
+          f"{PER_ITEM_S * 1000:.0f}ms/item)")
+    print(f"{'single call':<28} {await _single_call(chunks):8.1f} chunks/s")
+    for concurrency in (1, 4, 8):
+        stats = await _pipeline(chunks, concurrency, max_items=128)
+        print(
+            f"{f'pipeline c={concurrency} batch=128':<28} {stats.chunks_per_second:8.1f} chunks/s"
+            f"  ({stats.total_batches} batches)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,98 @@
+"""Escalation pattern throughput: four sequential regexes vs the single-pass engine.
+
+Runs over a synthetic corpus of chat messages (mostly benign, some with one or
+more escalation phrases) with 0 and 200 extra tenant phrases. The sequential
+baseline is the previous design: one case-insensitive alternation per
+category, searched in priority order. "sequential (all)" runs every category
+to report all matches, which is what the engine does in one scan;
+"sequential (first)" is the old first-hit behaviour.
+
+Usage (from apps/api):
+    python -m benchmarks.bench_escalation_patterns [messages]
+"""
+
+import random
+import re
+import sys
+import time
+
+from app.agent.escalation_patterns import (
+    CATEGORIES,
+    DEFAULT_RULES,
+    expand_template,
+    get_pattern_engine,
+    normalize_tenant_rules,
+)
+
+_FILLER = [
+    "hi", "there", "I", "was", "wondering", "how", "much", "botox", "costs", "per", "unit", "and",
+    "whether", "you", "have", "any", "openings", "this", "weekend", "for", "a", "consultation",
+    "about", "lip", "filler", "or", "a", "hydrafacial", "my", "friend", "recommended", "your",
+    "spa", "and", "said", "the", "staff", "were", "lovely", "thanks", "so", "much",
+]
+_PHRASES = [
+    "allergic reaction", "call 911", "worst", "file a complaint", "speak to a real person",
+    "phone number", "is it safe to", "swelling after", "blood thinner",
+]
+
+
+def _corpus(n: int, rng: random.Random) -> list[str]:
+    messages = []
+    for _ in range(n):
+        words = rng.choices(_FILLER, k=rng.randint(8, 60))
+        if rng.random() < 0.2:
+            for phrase in rng.sample(_PHRASES, rng.randint(1, 3)):
+                words.insert(rng.randrange(len(words) + 1), phrase)
+        messages.append(" ".join(words))
+    return messages
+
+
+def _tenant_rules(count: int) -> tuple:
+    names = [c.name for c in CATEGORIES]
+    raw: dict[str, list[str]] = {}
+    for i in range(count):
+        raw.setdefault(names[i % len(names)], []).append(f"custom phrase {i}")
+    return normalize_tenant_rules(raw)
+
+
+def _sequential(tenant_rules: tuple) -> list[re.Pattern]:
+    extra = dict(tenant_rules)
+    patterns = []
+    for category in CATEGORIES:
+        phrases = set().union(*(expand_template(t) for t in DEFAULT_RULES[category.name]))
+        phrases.update(extra.get(category.name, ()))
+        longest_first = sorted(phrases, key=len, reverse=True)
+        patterns.append(re.compile("|".join(map(re.escape, longest_first)), re.IGNORECASE))
+    return patterns
+
+
+def _throughput(label: str, fn, messages: list[str]) -> None:
+    start = time.perf_counter()
+    for message in messages:
+        fn(message)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<22} {len(messages) / elapsed:>12,.0f} msg/s  ({elapsed * 1000:8.1f}ms)")
+
+
+def main(n: int) -> None:
+    messages = _corpus(n, random.Random(0))  # noqa: S311 -- synthetic benchmark data
+    for extra in (0, 200):
+        rules = _tenant_rules(extra)
+        patterns = _sequential(rules)
+        engine = get_pattern_engine(rules)
+        print(f"{n:,} messages, {extra} tenant phrases")
+        _throughput(
+            "sequential (all)",
+            lambda m, patterns=patterns: [p for p in patterns if p.search(m)],
+            messages,
+        )
+        _throughput(
+            "sequential (first)",
+            lambda m, patterns=patterns: next((p for p in patterns if p.search(m)), None),
+            messages,
+        )
+        _throughput("single-pass engine", engine.scan, messages)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,51 @@
+"""Microbenchmark: per-request graph build vs. shared compiled graph.
+
+Usage (from apps/api):
+    python -m benchmarks.bench_graph_compile [iterations]
+"""
+
+import statistics
+import sys
+import time
+
+from app.agent.graph import build_concierge_graph
+from app.agent.registry import GraphRegistry, graph_registry
+
+
+def _time_per_call(fn, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(
+        f"{label:<28} mean={statistics.mean(samples):8.4f}ms"
+        f"  p50={statistics.median(samples):8.4f}ms  p95={p95:8.4f}ms"
+    )
+
+
+def main(iterations: int = 200) -> None:
+    # Warm imports so the first sample doesn't include module loading
+    build_concierge_graph()
+    graph_registry.compile_all()
+
+    per_request = _time_per_call(build_concierge_graph, iterations)
+    shared = _time_per_call(graph_registry.get, iterations)
+    cold = _time_per_call(lambda: GraphRegistry({"g": build_concierge_graph}).get("g"), 20)
+
+    print(f"iterations={iterations}")
+    _report("build per request", per_request)
+    _report("registry.get (warm)", shared)
+    _report("registry.get (cold)", cold)
+    saved = statistics.mean(per_request) - statistics.mean(shared)
+    print(f"saved per request: {saved:.4f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,80 @@
+"""Knowledge chunk insert throughput: ORM add+flush vs multi-row INSERT vs binary COPY.
+
+Needs a Postgres with pgvector (uses settings.database_url). Every run is
+rolled back, so nothing is left behind.
+
+Usage (from apps/api):
+    python -m benchmarks.bench_knowledge_writer [sizes...]
+"""
+
+import asyncio
+import random
+import sys
+import time
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.database import register_vector_codec
+from app.models.knowledge_document import KnowledgeDocument
+from app.services.knowledge_writer import CHUNK_COLUMNS, copy_chunks
+from app.services.rag import content_hash
+
+DIM = 1536
+TENANT = "bench_" + uuid.uuid4().hex[:8]
+
+
+def _records(n: int) -> list[tuple]:
+    rng = random.Random(n)  # noqa: S311 -- synthetic benchmark data
+    records = []
+    for i in range(n):
+        chunk = f"Chunk {i}: Botox $12/unit, fillers from $650. " * 10
+        embedding = [rng.uniform(-1, 1) for _ in range(DIM)]
+        records.append(
+            (uuid.uuid4(), TENANT, "Bench", chunk, "faq", i, embedding, content_hash(chunk))
+        )
+    return records
+
+
+async def _orm(db: AsyncSession, records: list[tuple]) -> None:
+    for r in records:
+        db.add(KnowledgeDocument(**dict(zip(CHUNK_COLUMNS, r, strict=True))))
+    await db.flush()
+
+
+async def _multirow(db: AsyncSession, records: list[tuple]) -> None:
+    rows = [dict(zip(CHUNK_COLUMNS, r, strict=True)) for r in records]
+    await db.execute(insert(KnowledgeDocument), rows)
+
+
+async def _copy(db: AsyncSession, records: list[tuple]) -> None:
+    await copy_chunks(db, records)
+
+
+async def main(sizes: list[int]) -> None:
+    engine = create_async_engine(settings.database_url)
+    register_vector_codec(engine)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        for n in sizes:
+            records = _records(n)
+            for label, writer in (
+                ("orm add+flush", _orm),
+                ("multi-row insert", _multirow),
+                ("binary COPY", _copy),
+            ):
+                async with factory() as db:
+                    start = time.perf_counter()
+                    await writer(db, records)
+                    elapsed = time.perf_counter() - start
+                    await db.rollback()
+                print(f"n={n:<6} {label:<18} {elapsed * 1000:10.1f}ms  {n / elapsed:10.0f} rows/s")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [100, 1_000, 10_000]
+    asyncio.run(main(sizes))
@@ -0,0 +1,107 @@
+"""Retrieval latency: in-process NumPy index vs pgvector at several corpus sizes.
+
+The in-memory numbers need no services. The pgvector numbers need a Postgres
+with pgvector at settings.database_url; the synthetic tenants are written in a
+transaction that is rolled back at the end.
+
+Usage (from apps/api):
+    python -m benchmarks.bench_memory_index [sizes...] [--no-db]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.database import register_vector_codec
+from app.services.knowledge_writer import copy_chunks
+from app.services.memory_index import TenantMatrix
+from app.services.rag import NEAREST_CHUNKS_SQL, content_hash
+from app.services.vector_index import tenant_index_ddl
+
+DIM = 1536
+QUERIES = 200
+TOP_K = 5
+
+
+def _corpus(n: int, rng: np.random.Generator) -> np.ndarray:
+    return rng.normal(size=(n, DIM)).astype(np.float32)
+
+
+def _report(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<26} p50={statistics.median(samples):8.3f}ms  p95={p95:8.3f}ms")
+
+
+def _bench_memory(corpus: np.ndarray, queries: np.ndarray) -> list[float]:
+    rows = [{"content": f"chunk {i}"} for i in range(len(corpus))]
+    matrix = TenantMatrix.build(1, rows, list(corpus))
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        matrix.search(q, TOP_K, threshold=-1.0)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def _bench_pgvector(db: AsyncSession, corpus: np.ndarray, queries: np.ndarray) -> list[float]:
+    tenant_id = "bench_" + uuid.uuid4().hex[:8]
+    records = [
+        (uuid.uuid4(), tenant_id, "Bench", f"chunk {i}", "faq", i, v.tolist(), content_hash(str(i)))
+        for i, v in enumerate(corpus)
+    ]
+    await copy_chunks(db, records)
+    # Non-concurrent build is fine inside the throwaway transaction
+    await db.execute(text(tenant_index_ddl(tenant_id, concurrently=False)))
+    await db.execute(text("ANALYZE knowledge_documents"))
+    await db.execute(text("SET LOCAL plan_cache_mode = force_custom_plan"))
+
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        params = {
+            "query_embedding": q.tolist(),
+            "tenant_id": tenant_id,
+            "max_distance": 2.0,
+            "top_k": TOP_K,
+        }
+        await db.execute(NEAREST_CHUNKS_SQL, params)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def main(sizes: list[int], use_db: bool) -> None:
+    rng = np.random.default_rng(0)
+    engine = factory = None
+    if use_db:
+        engine = create_async_engine(settings.database_url)
+        register_vector_codec(engine)
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        for n in sizes:
+            corpus = _corpus(n, rng)
+            queries = corpus[rng.integers(0, n, QUERIES)] + rng.normal(
+                scale=0.1, size=(QUERIES, DIM)
+            ).astype(np.float32)
+            print(f"n={n}")
+            _report("  numpy (in-process)", _bench_memory(corpus, queries))
+            if factory is not None:
+                async with factory() as db:
+                    _report("  pgvector (HNSW)", await _bench_pgvector(db, corpus, queries))
+                    await db.rollback()
+    finally:
+        if engine is not None:
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    sizes = [int(a) for a in args] or [500, 2_000, 5_000]
+    asyncio.run(main(sizes, use_db="--no-db" not in sys.argv))
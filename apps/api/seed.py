@@ -5,10 +5,12 @@ import uuid
 
 from sqlalchemy import text
 
-from app.database import async_session_factory
+from app.database import async_session_factory, engine
 from app.models.tenant import Tenant
 from app.models.knowledge_document import KnowledgeDocument
+from app.services.knowledge_version import bump_knowledge_version
 from app.services.rag import RAGService
+from app.services.vector_index import provision_tenant_vector_indexes
 
 TEST_TENANT_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
 TEST_CLERK_ORG_ID = "test-org-001"
@@ -81,6 +83,9 @@ async def seed():
             await db.commit()
             print(f"Created test tenant: Glow Med Spa (id={TEST_TENANT_ID})")
 
+        # Onboarding: build the tenant's ANN indexes before it has any chunks
+        await provision_tenant_vector_indexes(engine, [TEST_CLERK_ORG_ID, str(TEST_TENANT_ID)])
+
         # Ingest the sample treatment menu
         rag = RAGService(db)
 
@@ -94,14 +99,15 @@ async def seed():
             print(f"Knowledge base already has {count} chunks — skipping.")
         else:
             print("Ingesting sample treatment menu...")
-            docs = await rag.ingest_document(
+            ingested = await rag.ingest_document(
                 tenant_id=str(TEST_TENANT_ID),
                 title="Treatment Menu & Pricing",
                 content=SAMPLE_TREATMENT_MENU,
                 doc_type="treatment_menu",
             )
             await db.commit()
-            print(f"Ingested {len(docs)} chunks into knowledge base.")
+            await bump_knowledge_version(str(TEST_TENANT_ID))
+            print(f"Ingested {ingested.total_chunks} chunks into knowledge base.")
 
     print()
     print("Seed complete! You can now test with:")
@@ -11,6 +11,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import settings
+from app.database import register_vector_codec
 from app.models import Base, Conversation, Escalation, Lead, Tenant
 from app.models.conversation import Channel
 from app.models.escalation import EscalationReason, EscalationStatus
@@ -22,7 +23,19 @@ from app.models.lead import LeadIntent, LeadSource, LeadStatus
 TEST_DATABASE_URL = settings.database_url.replace("/medspa", "/medspa_test")
 
 # Tables to truncate between tests (order matters for FK constraints)
-_TABLES = ["escalations", "conversations", "leads", "knowledge_documents", "tenants"]
+_TABLES = [
+    "escalations",
+    "escalation_decision_metrics",
+    "llm_call_metrics",
+    "agent_run_metrics",
+    "pending_lead_captures",
+    "conversation_messages",
+    "conversations",
+    "leads",
+    "knowledge_documents",
+    "ingestion_jobs",
+    "tenants",
+]
 
 
 @pytest_asyncio.fixture
@@ -33,6 +46,7 @@ async def db() -> AsyncGenerator[AsyncSession, None]:
     between session-scoped fixtures and function-scoped tests.
     """
     engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    register_vector_codec(engine)
 
     # Ensure tables exist
     async with engine.begin() as conn:
@@ -3,13 +3,29 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from langchain_core.messages import AIMessage
+
 from app.agent.nodes import (
     _COMPLAINT_PATTERNS,
     _EMERGENCY_PATTERNS,
     _HUMAN_REQUEST_PATTERNS,
     _MEDICAL_ADVICE_PATTERNS,
     check_escalation_node,
+    create_lead_node,
 )
+from app.agent.turn_classifier import TurnClassification
+
+
+def _classifier_llm(escalation: str, intent: str = "general", urgency: int = 2) -> MagicMock:
+    """LLM mock answering the combined structured classification call."""
+    parsed = TurnClassification(
+        escalation=escalation, intent=intent, urgency=urgency, summary="Patient question."
+    )
+    llm = MagicMock()
+    llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value={"raw": AIMessage(content=""), "parsed": parsed, "parsing_error": None}
+    )
+    return llm
 
 
 # ---------------------------------------------------------------------------
@@ -134,24 +150,22 @@ class TestCheckEscalationNode:
     @pytest.mark.asyncio
     @patch("app.agent.nodes._get_llm")
     async def test_safe_message_no_escalation(self, mock_get_llm):
-        mock_llm = AsyncMock()
-        mock_response = MagicMock()
-        mock_response.content = "SAFE"
-        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
-        mock_get_llm.return_value = mock_llm
+        mock_get_llm.return_value = _classifier_llm("SAFE", intent="pricing", urgency=9)
 
         state = {"messages": [{"role": "user", "content": "How much does Botox cost per unit?"}]}
         result = await check_escalation_node(state)
         assert result["should_escalate"] is False
+        # Lead fields come from the same call, urgency clamped to 1-5
+        assert result["classification"] == {
+            "intent": "pricing",
+            "urgency": 5,
+            "summary": "Patient question.",
+        }
 
     @pytest.mark.asyncio
     @patch("app.agent.nodes._get_llm")
     async def test_llm_classifies_medical(self, mock_get_llm):
-        mock_llm = AsyncMock()
-        mock_response = MagicMock()
-        mock_response.content = "MEDICAL"
-        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
-        mock_get_llm.return_value = mock_llm
+        mock_get_llm.return_value = _classifier_llm("MEDICAL")
 
         state = {"messages": [{"role": "user", "content": "My face feels numb two weeks after the procedure"}]}
         result = await check_escalation_node(state)
@@ -161,10 +175,69 @@ class TestCheckEscalationNode:
     @pytest.mark.asyncio
     @patch("app.agent.nodes._get_llm")
     async def test_llm_failure_defaults_safe(self, mock_get_llm):
-        mock_llm = AsyncMock()
-        mock_llm.ainvoke = AsyncMock(side_effect=Exception("LLM down"))
+        mock_llm = MagicMock()
+        mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+            side_effect=Exception("LLM down")
+        )
         mock_get_llm.return_value = mock_llm
 
         state = {"messages": [{"role": "user", "content": "Tell me about lip filler options"}]}
         result = await check_escalation_node(state)
         assert result["should_escalate"] is False
+
+    @pytest.mark.asyncio
+    @patch("app.agent.nodes._get_llm")
+    async def test_confident_centroid_skips_llm(self, mock_get_llm):
+        from app.services.escalation_centroids import CentroidPrediction
+        from app.services.tenant_config import TenantConfig
+
+        classifier = MagicMock()
+        classifier.classify.return_value = CentroidPrediction(
+            label="SAFE", similarity=0.8, margin=0.3, confident=True
+        )
+        store = MagicMock()
+        store.get.return_value = classifier
+
+        state = {
+            "tenant_id": "org_test",
+            "messages": [{"role": "user", "content": "What are your hours on Saturday?"}],
+        }
+        config = AsyncMock(return_value=TenantConfig.defaults())
+        with (
+            patch("app.agent.nodes._tenant_config", config),
+            patch("app.services.rag._get_query_embedding", AsyncMock(return_value=[0.1] * 8)),
+            patch("app.services.escalation_centroids.get_centroid_store", return_value=store),
+            patch("app.agent.nodes.random.random", return_value=0.99),
+        ):
+            result = await check_escalation_node(state)
+
+        assert result["should_escalate"] is False
+        mock_get_llm.assert_not_called()
+
+
+class TestCreateLeadNode:
+    @pytest.mark.asyncio
+    @patch("app.agent.nodes._get_llm")
+    async def test_only_describes_capture(self, mock_get_llm):
+        classification = {"intent": "appointment", "urgency": 3, "summary": "Book filler."}
+        state = {
+            "tenant_id": "org_test",
+            "messages": [{"role": "user", "content": "I'd like to book lip filler next week"}],
+            "classification": classification,
+        }
+        result = await create_lead_node(state)
+
+        # No LLM call or DB write before the response is sent
+        assert result == {
+            "lead_capture": {
+                "message": "I'd like to book lip filler next week",
+                "classification": classification,
+            },
+            "intent": "appointment",
+        }
+        mock_get_llm.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_short_message_skipped(self):
+        state = {"tenant_id": "org_test", "messages": [{"role": "user", "content": "hi"}]}
+        assert await create_lead_node(state) == {}
@@ -0,0 +1,49 @@
+"""Tests for the single-pass escalation pattern engine."""
+
+from app.agent.escalation_patterns import (
+    EscalationPatternEngine,
+    get_pattern_engine,
+    normalize_tenant_rules,
+)
+
+
+class TestEscalationPatternEngine:
+    def test_reports_every_category_by_priority(self):
+        matches = get_pattern_engine().scan(
+            "Is it safe to keep going? This is the worst, I want to speak to a real person"
+        )
+        assert [m.category for m in matches] == ["complaint", "human_request", "medical_advice"]
+        assert matches[0].reason == "complaint"
+
+    def test_overlapping_phrases_from_different_categories(self):
+        matches = get_pattern_engine().scan("I have severe swelling after the filler")
+        assert [m.category for m in matches] == ["emergency", "medical_advice"]
+        assert matches[1].text.lower() == "swelling after"
+
+    def test_no_match(self):
+        assert get_pattern_engine().scan("How much is Botox per unit?") == []
+
+    def test_empty_rules(self):
+        assert EscalationPatternEngine({}).scan("call 911") == []
+
+
+class TestTenantRules:
+    def test_tenant_phrases_extend_defaults(self):
+        rules = normalize_tenant_rules({"complaint": ["charged  twice"]})
+        engine = get_pattern_engine(rules)
+        assert [m.category for m in engine.scan("You CHARGED twice!")] == ["complaint"]
+        # Whole words only
+        assert engine.scan("I recharged twice") == []
+        # Defaults still apply
+        assert engine.scan("call 911")[0].category == "emergency"
+
+    def test_normalize_drops_unknown_and_blank(self):
+        rules = normalize_tenant_rules(
+            {"complaint": ["refund", " ", "refund"], "unknown": ["x"], "emergency": "oops"}
+        )
+        assert rules == (("complaint", ("refund",)),)
+        assert normalize_tenant_rules(None) == ()
+
+    def test_engine_cached_per_rule_set(self):
+        rules = normalize_tenant_rules({"complaint": ["refund"]})
+        assert get_pattern_engine(rules) is get_pattern_engine(rules)
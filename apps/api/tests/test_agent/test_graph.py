@@ -1,9 +1,25 @@
 """Tests for LangGraph agent graph structure and routing."""
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.agent.graph import ConciergeState, _route_after_escalation_check, build_concierge_graph
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from app.agent.graph import (
+    ConciergeState,
+    _route_after_escalation_check,
+    build_concierge_graph,
+    build_parallel_concierge_graph,
+)
+from app.agent.nodes import (
+    _escalation_signal_ctx,
+    answer_node,
+    build_prompt_messages,
+    check_escalation_node,
+)
+from app.agent.turn_classifier import TurnClassification
 
 
 class TestGraphRouting:
@@ -41,6 +57,12 @@ class TestGraphRouting:
         graph = build_concierge_graph()
         assert graph is not None
 
+    def test_escalation_checked_before_generation(self):
+        edges = {(e.source, e.target) for e in build_concierge_graph().get_graph().edges}
+        assert ("search_knowledge", "check_escalation") in edges
+        assert ("check_escalation", "generate_response") in edges
+        assert ("generate_response", "check_escalation") not in edges
+
     @pytest.mark.asyncio
     @patch("app.agent.nodes._get_llm")
     @patch("app.agent.nodes.search_knowledge_node")
@@ -48,10 +70,22 @@ class TestGraphRouting:
         """Ensure the graph runs end-to-end with mocked nodes."""
         mock_search.return_value = {"context": "Botox costs $12/unit."}
 
-        mock_llm = AsyncMock()
-        mock_response = MagicMock()
-        mock_response.content = "SAFE"
-        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_llm = MagicMock()
+        mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+            return_value={
+                "raw": AIMessage(content=""),
+                "parsed": TurnClassification(
+                    escalation="SAFE", intent="pricing", urgency=2, summary="Botox price."
+                ),
+                "parsing_error": None,
+            }
+        )
+
+        async def _astream(_messages):
+            yield AIMessageChunk(content="Botox is ")
+            yield AIMessageChunk(content="$12/unit.")
+
+        mock_llm.astream = _astream
         mock_get_llm.return_value = mock_llm
 
         # We need to also mock the response generation
@@ -69,6 +103,7 @@ class TestGraphRouting:
                 "conversation_id": "conv123",
                 "should_escalate": False,
                 "escalation_reason": None,
+                "classification": None,
                 "intent": None,
                 "context": "",
                 "response": "",
@@ -76,3 +111,89 @@ class TestGraphRouting:
 
             result = await graph.ainvoke(initial_state)
             assert "response" in result
+
+
+class TestParallelGraph:
+    def test_parallel_graph_compiles(self):
+        graph = build_parallel_concierge_graph()
+        assert {"answer", "check_escalation", "join"} <= set(graph.get_graph().nodes)
+
+    @pytest.mark.asyncio
+    @patch("app.agent.nodes.generate_response_node")
+    @patch("app.agent.nodes.search_knowledge_node")
+    async def test_answer_node_runs_sequentially_without_signal(self, mock_search, mock_gen):
+        mock_search.return_value = {"context": "Botox costs $12/unit."}
+        mock_gen.return_value = {"response": "Botox is $12/unit."}
+
+        result = await answer_node({"messages": [{"role": "user", "content": "Botox?"}]})
+
+        assert result == {"context": "Botox costs $12/unit.", "response": "Botox is $12/unit."}
+        assert mock_gen.call_args.args[0]["context"] == "Botox costs $12/unit."
+
+    @pytest.mark.asyncio
+    @patch("app.agent.nodes.search_knowledge_node")
+    async def test_answer_node_cancelled_when_escalation_wins(self, mock_search):
+        cancelled = asyncio.Event()
+
+        async def _slow_search(_state):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {"context": ""}
+
+        mock_search.side_effect = _slow_search
+        signal = asyncio.Event()
+        token = _escalation_signal_ctx.set(signal)
+        try:
+            task = asyncio.ensure_future(
+                answer_node({"messages": [{"role": "user", "content": "I can't breathe"}]})
+            )
+            await asyncio.sleep(0.01)
+            signal.set()
+            result = await asyncio.wait_for(task, timeout=1)
+        finally:
+            _escalation_signal_ctx.reset(token)
+
+        assert result == {"response": ""}
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_regex_escalation_sets_signal(self):
+        signal = asyncio.Event()
+        token = _escalation_signal_ctx.set(signal)
+        try:
+            result = await check_escalation_node(
+                {"messages": [{"role": "user", "content": "I'm having an allergic reaction!"}]}
+            )
+        finally:
+            _escalation_signal_ctx.reset(token)
+
+        assert result["should_escalate"] is True
+        assert signal.is_set()
+
+
+class TestPromptLayout:
+    def test_history_prefix_is_stable_and_context_last(self):
+        history = [
+            {"role": "user", "content": "Do you offer Botox?"},
+            {"role": "assistant", "content": "Yes, we do."},
+        ]
+        first = build_prompt_messages(
+            {"spa_name": "Test Spa", "messages": history[:1], "context": "Botox: $12/unit"}
+        )
+        second = build_prompt_messages(
+            {
+                "spa_name": "Test Spa",
+                "messages": history + [{"role": "user", "content": "Any openings Friday?"}],
+                "context": "Hours: Fri 9-5",
+            }
+        )
+
+        # Everything but the trailing context message carries over byte-for-byte
+        assert [m.content for m in second[: len(first) - 1]] == [
+            m.content for m in first[:-1]
+        ]
+        assert "Hours: Fri 9-5" in second[-1].content
+        assert all("Hours" not in m.content for m in second[:-1])
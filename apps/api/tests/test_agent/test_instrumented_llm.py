@@ -0,0 +1,148 @@
+"""Tests for the instrumented LLM wrappers."""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+
+from app.agent.instrumented_llm import (
+    _compute_cost,
+    _extract_usage,
+    instrumented_astream,
+    instrumented_structured,
+)
+from app.agent.turn_classifier import TurnClassification
+from app.services.metrics_collector import MetricsCollector, _metrics_ctx
+
+
+def _streaming_llm(*chunks: AIMessageChunk):
+    llm = MagicMock()
+    llm.model_name = "gpt-4o-mini"
+
+    async def _astream(_messages):
+        for chunk in chunks:
+            yield chunk
+
+    llm.astream = _astream
+    return llm
+
+
+class TestInstrumentedAstream:
+    @pytest.mark.asyncio
+    async def test_merges_chunks_and_records_usage(self):
+        llm = _streaming_llm(
+            AIMessageChunk(content="Hello"),
+            AIMessageChunk(content=" there"),
+            AIMessageChunk(
+                content="",
+                usage_metadata={"input_tokens": 10, "output_tokens": 2, "total_tokens": 12},
+            ),
+        )
+        collector = MetricsCollector("tenant_1")
+        token = _metrics_ctx.set(collector)
+        try:
+            response = await instrumented_astream(
+                llm, [HumanMessage(content="hi")], "generate_response"
+            )
+        finally:
+            _metrics_ctx.reset(token)
+
+        assert response.content == "Hello there"
+        call = collector._llm_calls[0]
+        assert call["node_name"] == "generate_response"
+        assert call["prompt_tokens"] == 10
+        assert call["completion_tokens"] == 2
+        assert call["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_empty_stream_returns_empty_message(self):
+        response = await instrumented_astream(_streaming_llm(), [], "generate_response")
+        assert response.content == ""
+
+
+def _structured_llm(parsed, parsing_error=None):
+    llm = MagicMock()
+    llm.model_name = "gpt-4o-mini"
+    raw = AIMessage(
+        content="{}",
+        usage_metadata={"input_tokens": 180, "output_tokens": 30, "total_tokens": 210},
+    )
+    llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value={"raw": raw, "parsed": parsed, "parsing_error": parsing_error}
+    )
+    return llm
+
+
+class TestInstrumentedStructured:
+    @pytest.mark.asyncio
+    async def test_returns_parsed_and_records_usage(self):
+        parsed = TurnClassification(
+            escalation="SAFE", intent="pricing", urgency=2, summary="Asks about Botox cost."
+        )
+        llm = _structured_llm(parsed)
+        collector = MetricsCollector("tenant_1")
+        token = _metrics_ctx.set(collector)
+        try:
+            result = await instrumented_structured(
+                llm, TurnClassification, [HumanMessage(content="hi")], "check_escalation"
+            )
+        finally:
+            _metrics_ctx.reset(token)
+
+        assert result is parsed
+        llm.with_structured_output.assert_called_once_with(
+            TurnClassification, method="json_schema", include_raw=True
+        )
+        (call,) = collector._llm_calls
+        assert call["node_name"] == "check_escalation"
+        assert call["total_tokens"] == 210
+        assert call["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_parsing_error_raises_but_counts_tokens(self):
+        llm = _structured_llm(None, parsing_error=ValueError("bad json"))
+        collector = MetricsCollector("tenant_1")
+        token = _metrics_ctx.set(collector)
+        try:
+            with pytest.raises(ValueError):
+                await instrumented_structured(llm, TurnClassification, [], "check_escalation")
+        finally:
+            _metrics_ctx.reset(token)
+
+        assert collector._llm_calls[0]["total_tokens"] == 210
+
+
+class TestTimeToFirstToken:
+    def test_first_mark_wins(self):
+        collector = MetricsCollector("tenant_1")
+        collector.start_run()
+        collector.mark_first_token()
+        first = collector.time_to_first_token_ms
+        collector._run_start -= 5  # pretend 5s passed
+        collector.mark_first_token()
+        assert collector.time_to_first_token_ms == first
+
+    def test_not_recorded_before_run_start(self):
+        collector = MetricsCollector("tenant_1")
+        collector.mark_first_token()
+        assert collector.time_to_first_token_ms is None
+
+
+class TestCachedTokenPricing:
+    def test_cached_tokens_extracted_from_stream_usage(self):
+        response = AIMessageChunk(
+            content="",
+            usage_metadata={
+                "input_tokens": 2000,
+                "output_tokens": 10,
+                "total_tokens": 2010,
+                "input_token_details": {"cache_read": 1536},
+            },
+        )
+        assert _extract_usage(response) == (2000, 10, 2010, 1536)
+
+    def test_cached_tokens_billed_at_cached_rate(self):
+        full = _compute_cost("gpt-4o-mini", 2000, 0)
+        cached = _compute_cost("gpt-4o-mini", 2000, 0, cached_tokens=1000)
+        assert cached == full * Decimal("0.75")
@@ -0,0 +1,66 @@
+"""Tests for the compiled graph registry."""
+
+import asyncio
+from typing import TypedDict
+from unittest.mock import MagicMock
+
+import pytest
+from langgraph.graph import END, StateGraph
+
+from app.agent.registry import CONCIERGE, GraphRegistry, graph_registry
+
+
+class TestGraphRegistry:
+    def test_compiles_once(self):
+        builder = MagicMock(return_value=object())
+        registry = GraphRegistry({"g": builder})
+
+        first = registry.get("g")
+        second = registry.get("g")
+
+        assert first is second
+        builder.assert_called_once()
+
+    def test_compile_all_builds_every_variant(self):
+        a, b = MagicMock(return_value="a"), MagicMock(return_value="b")
+        registry = GraphRegistry({"a": a, "b": b})
+        registry.compile_all()
+        a.assert_called_once()
+        b.assert_called_once()
+
+    def test_unknown_variant_raises(self):
+        registry = GraphRegistry({})
+        with pytest.raises(KeyError):
+            registry.get("missing")
+
+    def test_clear_forces_recompile(self):
+        builder = MagicMock(side_effect=lambda: object())
+        registry = GraphRegistry({"g": builder})
+        first = registry.get("g")
+        registry.clear()
+        assert registry.get("g") is not first
+        assert builder.call_count == 2
+
+    def test_default_registry_has_concierge(self):
+        assert graph_registry.get(CONCIERGE) is graph_registry.get(CONCIERGE)
+
+    @pytest.mark.asyncio
+    async def test_shared_graph_handles_concurrent_invocations(self):
+        """One compiled graph serves concurrent runs without state bleeding across them."""
+        class _State(TypedDict):
+            value: int
+
+        async def _double(state: _State) -> dict:
+            await asyncio.sleep(0.01)
+            return {"value": state["value"] * 2}
+
+        def _build():
+            g = StateGraph(_State)
+            g.add_node("double", _double)
+            g.set_entry_point("double")
+            g.add_edge("double", END)
+            return g.compile()
+
+        graph = GraphRegistry({"g": _build}).get("g")
+        results = await asyncio.gather(*(graph.ainvoke({"value": i}) for i in range(20)))
+        assert [r["value"] for r in results] == [i * 2 for i in range(20)]
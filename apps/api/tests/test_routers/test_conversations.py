@@ -2,6 +2,8 @@
 
 import pytest
 
+from app.models import ConversationMessage
+
 
 @pytest.mark.asyncio
 async def test_list_conversations_empty(client):
@@ -37,3 +39,34 @@ async def test_get_conversation(client, conversation):
 async def test_get_conversation_not_found(client):
     response = await client.get("/api/v1/conversations/00000000-0000-0000-0000-000000000000")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_conversation_includes_appended_messages(client, db, conversation):
+    db.add_all(
+        [
+            ConversationMessage(
+                conversation_id=conversation.id,
+                tenant_id=conversation.tenant_id,
+                role="user",
+                content="How much is it?",
+            ),
+            ConversationMessage(
+                conversation_id=conversation.id,
+                tenant_id=conversation.tenant_id,
+                role="assistant",
+                content="Pricing starts at $12 per unit.",
+            ),
+        ]
+    )
+    await db.flush()
+
+    response = await client.get(f"/api/v1/conversations/{conversation.id}")
+    transcript = response.json()["transcript"]
+    # Legacy JSONB messages first, then appended rows in insertion order
+    assert [m["content"] for m in transcript] == [
+        "Hi, I'm interested in Botox",
+        "Welcome! I'd be happy to help.",
+        "How much is it?",
+        "Pricing starts at $12 per unit.",
+    ]
@@ -0,0 +1,157 @@
+"""Tests for knowledge base upload and ingestion job endpoints."""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.models.ingestion_job import IngestionJob, IngestionStatus
+from app.services.ingestion import DocumentParseError, extract_text
+
+
+@pytest.fixture
+def mock_enqueue():
+    with patch("app.routers.knowledge_base.ingest_document.delay") as delay:
+        yield delay
+
+
+async def _upload(client, content: bytes = b"Botox is $12 per unit."):
+    return await client.post(
+        "/api/v1/knowledge-base",
+        files={"file": ("pricing.txt", content, "text/plain")},
+        data={"title": "Pricing", "doc_type": "pricing"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_upload_queues_job(client, mock_enqueue):
+    response = await _upload(client)
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] == "queued"
+    assert data["title"] == "Pricing"
+    assert data["chunks_done"] == 0
+    mock_enqueue.assert_called_once_with(data["id"])
+
+
+@pytest.mark.asyncio
+async def test_upload_empty_file_rejected(client, mock_enqueue):
+    response = await _upload(client, content=b"   ")
+    assert response.status_code == 400
+    mock_enqueue.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_job_status(client, mock_enqueue):
+    job_id = (await _upload(client)).json()["id"]
+    response = await client.get(f"/api/v1/knowledge-base/jobs/{job_id}")
+    assert response.status_code == 200
+    assert response.json()["id"] == job_id
+
+
+@pytest.mark.asyncio
+async def test_get_job_other_tenant_not_found(client, db, mock_enqueue):
+    job = IngestionJob(
+        id=uuid.uuid4(),
+        tenant_id="org_someone_else",
+        title="Pricing",
+        doc_type="faq",
+        filename="pricing.txt",
+        raw_bytes=b"hello",
+    )
+    db.add(job)
+    await db.flush()
+    response = await client.get(f"/api/v1/knowledge-base/jobs/{job.id}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_retry_failed_job_requeues(client, db, tenant_id, mock_enqueue):
+    job = IngestionJob(
+        id=uuid.uuid4(),
+        tenant_id=tenant_id,
+        title="Pricing",
+        doc_type="faq",
+        filename="pricing.txt",
+        raw_bytes=b"hello",
+        status=IngestionStatus.FAILED.value,
+        error="Rate limited",
+        attempts=1,
+    )
+    db.add(job)
+    await db.flush()
+
+    response = await client.post(f"/api/v1/knowledge-base/jobs/{job.id}/retry")
+    assert response.status_code == 200
+    assert response.json()["status"] == "queued"
+    assert response.json()["error"] is None
+    mock_enqueue.assert_called_once_with(str(job.id))
+
+
+@pytest.mark.asyncio
+async def test_retry_completed_job_is_noop(client, db, tenant_id, mock_enqueue):
+    job = IngestionJob(
+        id=uuid.uuid4(),
+        tenant_id=tenant_id,
+        title="Pricing",
+        doc_type="faq",
+        filename="pricing.txt",
+        status=IngestionStatus.COMPLETED.value,
+        total_chunks=3,
+        chunks_done=3,
+    )
+    db.add(job)
+    await db.flush()
+
+    response = await client.post(f"/api/v1/knowledge-base/jobs/{job.id}/retry")
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    mock_enqueue.assert_not_called()
+
+
+def _processing_job(tenant_id: str, last_progress: datetime) -> IngestionJob:
+    return IngestionJob(
+        id=uuid.uuid4(),
+        tenant_id=tenant_id,
+        title="Pricing",
+        doc_type="faq",
+        filename="pricing.txt",
+        raw_bytes=b"hello",
+        status=IngestionStatus.PROCESSING.value,
+        attempts=1,
+        updated_at=last_progress,
+    )
+
+
+@pytest.mark.asyncio
+async def test_retry_stale_processing_job_requeues(client, db, tenant_id, mock_enqueue):
+    job = _processing_job(tenant_id, datetime.now(UTC) - timedelta(hours=1))
+    db.add(job)
+    await db.flush()
+
+    response = await client.post(f"/api/v1/knowledge-base/jobs/{job.id}/retry")
+    assert response.status_code == 200
+    assert response.json()["status"] == "queued"
+    mock_enqueue.assert_called_once_with(str(job.id))
+
+
+@pytest.mark.asyncio
+async def test_retry_active_processing_job_is_noop(client, db, tenant_id, mock_enqueue):
+    job = _processing_job(tenant_id, datetime.now(UTC))
+    db.add(job)
+    await db.flush()
+
+    response = await client.post(f"/api/v1/knowledge-base/jobs/{job.id}/retry")
+    assert response.status_code == 200
+    assert response.json()["status"] == "processing"
+    mock_enqueue.assert_not_called()
+
+
+class TestExtractText:
+    def test_plain_text(self):
+        assert extract_text("faq.md", "Fillers — $650".encode()) == "Fillers — $650"
+
+    def test_bad_pdf_raises_parse_error(self):
+        with pytest.raises(DocumentParseError):
+            extract_text("menu.pdf", b"not a pdf")
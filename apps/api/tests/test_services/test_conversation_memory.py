@@ -0,0 +1,117 @@
+"""Tests for sliding-window conversation memory."""
+
+import uuid
+
+import pytest
+from langchain_core.messages import AIMessage
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.models import Conversation, ConversationMessage
+from app.models.conversation import Channel
+from app.models.metrics import LLMCallMetric
+from app.services.conversation_memory import (
+    ConversationMemory,
+    needs_summary_update,
+    select_prompt_messages,
+    update_summary,
+    window_messages,
+)
+
+
+def _messages(n: int) -> list[dict]:
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"m{i}"} for i in range(n)
+    ]
+
+
+class _FakeLLM:
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.prompts: list[str] = []
+
+    async def ainvoke(self, messages):
+        self.prompts.append(messages[0].content)
+        return AIMessage(content=self.reply)
+
+
+class TestPromptWindow:
+    def test_short_history_sent_whole(self):
+        messages = _messages(3)
+        assert select_prompt_messages(messages, summarized_count=0) == messages
+
+    def test_summarized_turns_dropped(self):
+        messages = _messages(20)
+        selected = select_prompt_messages(messages, summarized_count=15)
+        assert selected == messages[-window_messages():]
+
+    def test_unsummarized_turns_kept_until_summary_catches_up(self):
+        messages = _messages(20)
+        selected = select_prompt_messages(messages, summarized_count=4)
+        assert selected == messages[4:]
+
+    def test_summarized_in_loaded_history(self):
+        memory = ConversationMemory(summary="s", summary_message_count=30, message_count=40)
+        # The last 20 messages are 20..39, of which 20..29 are summarized
+        assert memory.summarized_in(20) == 10
+        assert ConversationMemory().summarized_in(0) == 0
+
+    def test_needs_update_after_batch_leaves_window(self):
+        boundary = window_messages() + settings.chat_summary_min_new_messages
+        assert not needs_summary_update(boundary - 1, 0)
+        assert needs_summary_update(boundary, 0)
+
+
+@pytest.fixture
+def session_factory(db):
+    return async_sessionmaker(db.bind, class_=AsyncSession, expire_on_commit=False)
+
+
+class TestUpdateSummary:
+    @pytest.mark.asyncio
+    async def test_folds_old_messages_incrementally(self, session_factory, tenant_id):
+        legacy = _messages(2)
+        appended = _messages(window_messages() + settings.chat_summary_min_new_messages)[2:]
+        conversation_id = uuid.uuid4()
+        async with session_factory() as db:
+            db.add(
+                Conversation(
+                    id=conversation_id,
+                    tenant_id=tenant_id,
+                    channel=Channel.WEB_CHAT,
+                    transcript=legacy,
+                    message_count=len(legacy) + len(appended),
+                )
+            )
+            db.add_all(
+                ConversationMessage(conversation_id=conversation_id, tenant_id=tenant_id, **m)
+                for m in appended
+            )
+            await db.commit()
+
+        llm = _FakeLLM("Patient asked about Botox.")
+        run_id = uuid.uuid4()
+        assert await update_summary(conversation_id, session_factory, llm, run_id=run_id)
+        # Only the messages that left the window: m0-m1 (legacy) and m2-m3
+        assert "Patient: m0" in llm.prompts[0]
+        assert "Assistant: m3" in llm.prompts[0]
+        assert "m4" not in llm.prompts[0]
+
+        async with session_factory() as db:
+            conv = await db.scalar(select(Conversation).where(Conversation.id == conversation_id))
+        assert conv.summary == "Patient asked about Botox."
+        assert conv.summary_message_count == settings.chat_summary_min_new_messages
+
+        # The summary call is metered like every other LLM call
+        async with session_factory() as db:
+            calls = (
+                await db.scalars(
+                    select(LLMCallMetric).where(LLMCallMetric.conversation_id == conversation_id)
+                )
+            ).all()
+        assert [(c.node_name, c.agent_run_id) for c in calls] == [("update_summary", run_id)]
+
+        # Nothing new has left the window: no second LLM call
+        assert not await update_summary(conversation_id, session_factory, llm)
+        assert len(llm.prompts) == 1
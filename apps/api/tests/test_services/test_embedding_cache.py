@@ -0,0 +1,64 @@
+"""Tests for the query embedding cache (in-process tier; Redis tier disabled)."""
+
+import pytest
+
+from app.services.embedding_cache import (
+    EmbeddingCache,
+    cache_key,
+    decode_embedding,
+    encode_embedding,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestKeysAndEncoding:
+    def test_key_ignores_case_and_whitespace(self):
+        assert cache_key("m", "How much is  Botox") == cache_key("m", " how much is botox ")
+
+    def test_key_depends_on_model(self):
+        assert cache_key("a", "botox") != cache_key("b", "botox")
+
+    def test_float32_roundtrip(self):
+        vec = [0.5, -0.25, 1.0]
+        payload = encode_embedding(vec)
+        assert len(payload) == 4 * len(vec)
+        assert decode_embedding(payload) == vec
+
+
+class TestEmbeddingCache:
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self):
+        cache = EmbeddingCache(max_entries=10, ttl_seconds=60)
+        assert await cache.get("k") == (None, "miss")
+        await cache.put("k", [1.0, 2.0])
+        assert await cache.get("k") == ([1.0, 2.0], "memory")
+        assert cache.stats()["memory_hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        clock = _Clock()
+        cache = EmbeddingCache(max_entries=10, ttl_seconds=60, clock=clock)
+        await cache.put("k", [1.0])
+        clock.now += 61
+        assert await cache.get("k") == (None, "miss")
+        assert cache.stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        cache = EmbeddingCache(max_entries=2, ttl_seconds=60)
+        await cache.put("a", [1.0])
+        await cache.put("b", [2.0])
+        await cache.get("a")  # a becomes most recently used
+        await cache.put("c", [3.0])
+
+        assert (await cache.get("b"))[0] is None
+        assert (await cache.get("a"))[0] == [1.0]
+        assert (await cache.get("c"))[0] == [3.0]
@@ -0,0 +1,86 @@
+"""Tests for the batched ingestion embedding pipeline."""
+
+import pytest
+
+from app.services.embedding_pipeline import (
+    IngestionStats,
+    embed_in_batches,
+    estimate_tokens,
+    plan_batches,
+)
+
+
+class _RateLimitedError(Exception):
+    status_code = 429
+
+
+class TestPlanBatches:
+    def test_respects_item_budget(self):
+        batches = plan_batches(["a"] * 10, max_tokens=10_000, max_items=4)
+        assert [len(texts) for _, texts in batches] == [4, 4, 2]
+        assert [start for start, _ in batches] == [0, 4, 8]
+
+    def test_respects_token_budget(self):
+        chunk = "x" * 300  # ~101 tokens
+        batches = plan_batches([chunk] * 5, max_tokens=2 * estimate_tokens(chunk), max_items=100)
+        assert [len(texts) for _, texts in batches] == [2, 2, 1]
+
+    def test_oversized_chunk_gets_its_own_batch(self):
+        batches = plan_batches(["x" * 3000, "y"], max_tokens=10, max_items=100)
+        assert len(batches) == 2
+
+    def test_empty(self):
+        assert plan_batches([], max_tokens=100, max_items=10) == []
+
+
+class TestEmbedInBatches:
+    @pytest.mark.asyncio
+    async def test_yields_every_chunk_with_positions(self):
+        async def _embed(texts):
+            return [[float(len(t))] for t in texts]
+
+        chunks = [f"chunk {i}" * (i + 1) for i in range(10)]
+        stats = IngestionStats(total_chunks=len(chunks), total_batches=0)
+        results: dict[int, list[float]] = {}
+        async for batch in embed_in_batches(chunks, _embed, stats=stats, max_items=3):
+            for offset, embedding in enumerate(batch.embeddings):
+                results[batch.start + offset] = embedding
+
+        assert results == {i: [float(len(c))] for i, c in enumerate(chunks)}
+        assert stats.chunks_done == 10
+        assert stats.batches_done == stats.total_batches == 4
+
+    @pytest.mark.asyncio
+    async def test_retries_rate_limits(self):
+        calls = {"n": 0}
+
+        async def _flaky(texts):
+            calls["n"] += 1
+            if calls["n"] < 3:
+                raise _RateLimitedError()
+            return [[1.0] for _ in texts]
+
+        stats = IngestionStats(total_chunks=1, total_batches=0)
+        batches = [
+            b async for b in embed_in_batches(["a"], _flaky, stats=stats, backoff_base=0)
+        ]
+        assert len(batches) == 1
+        assert stats.retries == 2
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_propagates(self):
+        async def _broken(texts):
+            raise ValueError("bad input")
+
+        with pytest.raises(ValueError):
+            async for _ in embed_in_batches(["a"], _broken, backoff_base=0):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        async def _always_limited(texts):
+            raise _RateLimitedError()
+
+        with pytest.raises(_RateLimitedError):
+            async for _ in embed_in_batches(["a"], _always_limited, max_retries=2, backoff_base=0):
+                pass
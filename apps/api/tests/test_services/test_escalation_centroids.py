@@ -0,0 +1,112 @@
+"""Tests for the escalation centroid pre-classifier."""
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.metrics import EscalationDecisionMetric
+from app.services.escalation_centroids import (
+    CentroidStore,
+    EscalationCentroids,
+    purge_expired_embeddings,
+)
+
+DIM = 1536
+
+
+def _axis(i: int, noise: float = 0.0) -> list[float]:
+    vec = np.zeros(DIM, dtype=np.float32)
+    vec[i] = 1.0
+    vec[(i + 1) % 3] = noise
+    return vec.tolist()
+
+
+def _classifier(margin: float = 0.1) -> EscalationCentroids:
+    rows = [("SAFE", _axis(0), 30), ("MEDICAL", _axis(1), 30), ("ESCALATE", _axis(2), 30)]
+    return EscalationCentroids.from_rows(rows, min_examples=20, margin=margin, min_similarity=0.3)
+
+
+class TestEscalationCentroids:
+    def test_confident_nearest_label(self):
+        prediction = _classifier().classify(_axis(1))
+        assert prediction.label == "MEDICAL"
+        assert prediction.confident
+
+    def test_uncertain_margin(self):
+        # Equidistant between SAFE and MEDICAL
+        prediction = _classifier().classify(_axis(0, noise=0.95))
+        assert prediction.margin < 0.1
+        assert not prediction.confident
+
+    def test_inactive_until_every_label_has_examples(self):
+        rows = [("SAFE", _axis(0), 30), ("MEDICAL", _axis(1), 30), ("ESCALATE", _axis(2), 5)]
+        assert EscalationCentroids.from_rows(rows, 20, 0.1, 0.3) is None
+
+
+class TestCentroidStore:
+    @pytest.mark.asyncio
+    async def test_refresh_from_confirmed_decisions(self, db, tenant_id, monkeypatch):
+        monkeypatch.setattr("app.config.settings.escalation_centroid_min_examples", 1)
+        for i, label in enumerate(("SAFE", "MEDICAL", "ESCALATE")):
+            db.add(
+                EscalationDecisionMetric(
+                    tenant_id=tenant_id,
+                    detection_method="llm",
+                    llm_classification=label,
+                    message_embedding=_axis(i),
+                    correct=True,
+                )
+            )
+        # Unconfirmed rows are not examples
+        db.add(
+            EscalationDecisionMetric(
+                tenant_id=tenant_id,
+                detection_method="llm",
+                llm_classification="SAFE",
+                message_embedding=_axis(2),
+            )
+        )
+        await db.commit()
+
+        store = CentroidStore(refresh_seconds=3600)
+        factory = async_sessionmaker(db.bind, class_=AsyncSession, expire_on_commit=False)
+        classifier = await store.refresh(factory)
+        assert classifier.classify(_axis(2)).label == "ESCALATE"
+        assert store.get() is classifier
+
+
+class TestEmbeddingRetention:
+    @pytest.mark.asyncio
+    async def test_purges_expired_embeddings_only(self, db, tenant_id):
+        now = datetime.now(UTC)
+        rows = {
+            "fresh": (now, None),
+            "stale_unlabelled": (now - timedelta(days=30), None),
+            "labelled_example": (now - timedelta(days=30), True),
+            "expired_example": (now - timedelta(days=365), True),
+        }
+        for name, (created_at, correct) in rows.items():
+            db.add(
+                EscalationDecisionMetric(
+                    tenant_id=tenant_id,
+                    detection_method="llm",
+                    pattern_matched=name,
+                    message_embedding=_axis(0),
+                    correct=correct,
+                    created_at=created_at,
+                )
+            )
+        await db.commit()
+
+        assert await purge_expired_embeddings(db) == 2
+        result = await db.execute(
+            select(
+                EscalationDecisionMetric.pattern_matched,
+                EscalationDecisionMetric.message_embedding.is_not(None),
+            ).where(EscalationDecisionMetric.tenant_id == tenant_id)
+        )
+        kept = {name for name, has_embedding in result.all() if has_embedding}
+        assert kept == {"fresh", "labelled_example"}
@@ -0,0 +1,78 @@
+"""Tests for the bulk knowledge chunk writer."""
+
+import struct
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.database import decode_vector, encode_vector
+from app.models.knowledge_document import KnowledgeDocument
+from app.services.knowledge_writer import copy_chunks
+from app.services.rag import content_hash
+
+
+class TestVectorEncoding:
+    def test_wire_layout(self):
+        data = encode_vector([1.0, -2.5])
+        assert data[:4] == struct.pack(">HH", 2, 0)
+        assert len(data) == 4 + 2 * 4
+
+    def test_round_trip(self):
+        values = [0.125, -0.5, 3.0, 0.0]
+        assert decode_vector(encode_vector(values)).to_list() == values
+
+    def test_accepts_orm_text_form(self):
+        assert encode_vector("[0.125,-0.5]") == encode_vector([0.125, -0.5])
+
+
+@pytest.mark.asyncio
+async def test_copy_chunks_writes_rows(db, tenant_id):
+    records = [
+        (
+            uuid.uuid4(),
+            tenant_id,
+            "Pricing",
+            f"chunk {i}",
+            "pricing",
+            i,
+            [i / 10] * 1536,
+            content_hash(f"chunk {i}"),
+        )
+        for i in range(3)
+    ]
+
+    async def _stream():
+        for record in records:
+            yield record
+
+    assert await copy_chunks(db, _stream()) == 3
+
+    result = await db.execute(
+        select(KnowledgeDocument)
+        .where(KnowledgeDocument.tenant_id == tenant_id)
+        .order_by(KnowledgeDocument.chunk_index)
+    )
+    docs = result.scalars().all()
+    assert [d.content for d in docs] == ["chunk 0", "chunk 1", "chunk 2"]
+    assert docs[2].embedding[0] == pytest.approx(0.2)
+    assert docs[0].created_at is not None
+    assert docs[1].content_hash == content_hash("chunk 1")
+
+
+@pytest.mark.asyncio
+async def test_orm_vector_binding_still_works_after_copy(db, tenant_id):
+    await copy_chunks(
+        db, [(uuid.uuid4(), tenant_id, "FAQ", "a", "faq", 0, [0.1] * 1536, content_hash("a"))]
+    )
+    doc = KnowledgeDocument(
+        id=uuid.uuid4(),
+        tenant_id=tenant_id,
+        title="FAQ",
+        content="b",
+        doc_type="faq",
+        chunk_index=1,
+        embedding=[0.2] * 1536,
+    )
+    db.add(doc)
+    await db.flush()
@@ -0,0 +1,239 @@
+"""Tests for post-response lead capture."""
+
+import uuid
+
+import pytest
+from langchain_core.messages import AIMessage
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.agent.turn_classifier import TurnClassification
+from app.models import Conversation, Lead, PendingLeadCapture
+from app.models.conversation import Channel
+from app.models.metrics import AgentRunMetric, LLMCallMetric
+from app.services.lead_capture import (
+    LeadCaptureJob,
+    capture_lead,
+    lead_capture_pending,
+    run_pending_capture,
+)
+
+
+class _FakeStructuredLLM:
+    model_name = "gpt-4o-mini"
+
+    def __init__(self, parsed: TurnClassification):
+        self.parsed = parsed
+        self.calls = 0
+
+    def with_structured_output(self, schema, method, include_raw):
+        return self
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        raw = AIMessage(
+            content="",
+            usage_metadata={"input_tokens": 150, "output_tokens": 25, "total_tokens": 175},
+        )
+        return {"raw": raw, "parsed": self.parsed, "parsing_error": None}
+
+
+@pytest.fixture
+def session_factory(db):
+    return async_sessionmaker(db.bind, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _turn(session_factory, tenant_id: str) -> tuple[uuid.UUID, uuid.UUID]:
+    """A committed conversation and the AgentRunMetric row of its turn."""
+    conversation_id, run_id = uuid.uuid4(), uuid.uuid4()
+    async with session_factory() as db:
+        db.add(
+            Conversation(
+                id=conversation_id, tenant_id=tenant_id, channel=Channel.WEB_CHAT, transcript=[]
+            )
+        )
+        db.add(AgentRunMetric(id=run_id, tenant_id=tenant_id, total_tokens=1000))
+        await db.commit()
+    return conversation_id, run_id
+
+
+class TestCaptureLead:
+    @pytest.mark.asyncio
+    async def test_creates_lead_and_marks_run(self, session_factory, tenant_id):
+        conversation_id, run_id = await _turn(session_factory, tenant_id)
+        job = LeadCaptureJob(
+            tenant_id=tenant_id,
+            conversation_id=str(conversation_id),
+            run_id=run_id,
+            message="I'd like to book Botox for Friday",
+            classification={"intent": "appointment", "urgency": 3, "summary": "Book Botox."},
+        )
+
+        lead_id = await capture_lead(job, session_factory=session_factory)
+
+        async with session_factory() as db:
+            conversation = await db.get(Conversation, conversation_id)
+            run = await db.get(AgentRunMetric, run_id)
+            lead = await db.get(Lead, uuid.UUID(lead_id))
+        assert str(conversation.lead_id) == lead_id
+        assert lead.summary == "Book Botox."
+        assert (run.lead_created, run.intent_detected) == (True, "appointment")
+
+    @pytest.mark.asyncio
+    async def test_later_turn_updates_same_lead_and_records_llm_call(
+        self, session_factory, tenant_id
+    ):
+        conversation_id, run_id = await _turn(session_factory, tenant_id)
+        first = LeadCaptureJob(
+            tenant_id=tenant_id,
+            conversation_id=str(conversation_id),
+            run_id=run_id,
+            message="How much is Botox?",
+            classification={"intent": "pricing", "urgency": 2, "summary": "Botox price."},
+        )
+        lead_id = await capture_lead(first, session_factory=session_factory)
+
+        # Escalation was decided without the LLM: capture classifies on its own
+        llm = _FakeStructuredLLM(
+            TurnClassification(
+                escalation="SAFE", intent="appointment", urgency=4, summary="Book Botox."
+            )
+        )
+        second = LeadCaptureJob(
+            tenant_id=tenant_id,
+            conversation_id=str(conversation_id),
+            run_id=run_id,
+            message="Great, can I book for Friday?",
+        )
+        assert await capture_lead(second, session_factory=session_factory, llm=llm) == lead_id
+        assert llm.calls == 1
+
+        async with session_factory() as db:
+            leads = (await db.scalars(select(Lead).where(Lead.tenant_id == tenant_id))).all()
+            run = await db.get(AgentRunMetric, run_id)
+            calls = (
+                await db.scalars(select(LLMCallMetric).where(LLMCallMetric.agent_run_id == run_id))
+            ).all()
+        assert [lead.intent.value for lead in leads] == ["appointment"]
+        assert [call.node_name for call in calls] == ["create_lead"]
+        assert run.total_tokens == 1175
+
+    @pytest.mark.asyncio
+    async def test_unchanged_follow_up_skips_llm_and_write(self, session_factory, tenant_id):
+        conversation_id, run_id = await _turn(session_factory, tenant_id)
+        first = LeadCaptureJob(
+            tenant_id=tenant_id,
+            conversation_id=str(conversation_id),
+            run_id=run_id,
+            message="I'd like to book Botox",
+            classification={"intent": "appointment", "urgency": 2, "summary": "Book Botox."},
+        )
+        lead_id = await capture_lead(first, session_factory=session_factory)
+
+        follow_up_run = uuid.uuid4()
+        async with session_factory() as db:
+            db.add(AgentRunMetric(id=follow_up_run, tenant_id=tenant_id))
+            await db.commit()
+        llm = _FakeStructuredLLM(
+            TurnClassification(escalation="SAFE", intent="pricing", urgency=5, summary="x")
+        )
+        job = LeadCaptureJob(
+            tenant_id=tenant_id,
+            conversation_id=str(conversation_id),
+            run_id=follow_up_run,
+            message="Does Saturday at 3 work?",
+        )
+        assert await capture_lead(job, session_factory=session_factory, llm=llm) == lead_id
+
+        assert llm.calls == 0
+        async with session_factory() as db:
+            lead = await db.get(Lead, uuid.UUID(lead_id))
+            run = await db.get(AgentRunMetric, follow_up_run)
+        assert (lead.intent.value, lead.urgency) == ("appointment", 2)
+        assert (run.lead_classification, run.lead_created) == ("memo", False)
+
+    @pytest.mark.asyncio
+    async def test_older_turn_finishing_last_keeps_newer_lead(self, session_factory, tenant_id):
+        conversation_id, run_id = await _turn(session_factory, tenant_id)
+        newer = LeadCaptureJob(
+            tenant_id=tenant_id,
+            conversation_id=str(conversation_id),
+            run_id=run_id,
+            message="Actually, can I book for Friday?",
+            classification={"intent": "appointment", "urgency": 4, "summary": "Book Friday."},
+            message_count=4,
+        )
+        lead_id = await capture_lead(newer, session_factory=session_factory)
+        older = LeadCaptureJob(
+            tenant_id=tenant_id,
+            conversation_id=str(conversation_id),
+            run_id=run_id,
+            message="How much is Botox?",
+            classification={"intent": "pricing", "urgency": 2, "summary": "Botox price."},
+            message_count=2,
+        )
+        assert await capture_lead(older, session_factory=session_factory) == lead_id
+
+        async with session_factory() as db:
+            lead = await db.get(Lead, uuid.UUID(lead_id))
+            conversation = await db.get(Conversation, conversation_id)
+        assert (lead.intent.value, lead.summary) == ("appointment", "Book Friday.")
+        assert conversation.lead_memo["message_count"] == 4
+
+
+class TestPendingCapture:
+    @staticmethod
+    async def _pending(session_factory, tenant_id) -> tuple[uuid.UUID, uuid.UUID]:
+        conversation_id, run_id = await _turn(session_factory, tenant_id)
+        pending_id = uuid.uuid4()
+        async with session_factory() as db:
+            db.add(
+                PendingLeadCapture(
+                    id=pending_id,
+                    tenant_id=tenant_id,
+                    conversation_id=conversation_id,
+                    run_id=run_id,
+                    message="I'd like to book Botox for Friday",
+                    classification={
+                        "intent": "appointment",
+                        "urgency": 3,
+                        "summary": "Book Botox.",
+                    },
+                    message_count=2,
+                )
+            )
+            await db.commit()
+        return conversation_id, pending_id
+
+    @pytest.mark.asyncio
+    async def test_capture_clears_pending(self, session_factory, tenant_id):
+        conversation_id, pending_id = await self._pending(session_factory, tenant_id)
+        async with session_factory() as db:
+            assert await lead_capture_pending(db, conversation_id)
+
+        lead_id = await run_pending_capture(pending_id, session_factory)
+
+        async with session_factory() as db:
+            conversation = await db.get(Conversation, conversation_id)
+            assert not await lead_capture_pending(db, conversation_id)
+        assert str(conversation.lead_id) == lead_id
+
+    @pytest.mark.asyncio
+    async def test_redelivered_task_is_noop(self, session_factory, tenant_id):
+        conversation_id, pending_id = await self._pending(session_factory, tenant_id)
+        await run_pending_capture(pending_id, session_factory)
+
+        assert await run_pending_capture(pending_id, session_factory) is None
+        async with session_factory() as db:
+            leads = (await db.scalars(select(Lead).where(Lead.tenant_id == tenant_id))).all()
+        assert len(leads) == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_capture_not_pending(self, session_factory, tenant_id, monkeypatch):
+        from app.config import settings
+
+        conversation_id, _ = await self._pending(session_factory, tenant_id)
+        monkeypatch.setattr(settings, "lead_capture_pending_timeout_seconds", -60)
+
+        async with session_factory() as db:
+            assert not await lead_capture_pending(db, conversation_id)
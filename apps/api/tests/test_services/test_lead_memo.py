@@ -0,0 +1,46 @@
+"""Tests for the lead classification memo's change detector."""
+
+from app.config import settings
+from app.services.lead_memo import LeadMemo, keyword_intents, reclassify_reason, remember
+
+_BOOKING = {"intent": "appointment", "urgency": 2, "summary": "Book Botox."}
+
+
+class TestKeywordIntents:
+    def test_matches_whole_words(self):
+        assert keyword_intents("How much to book a consultation?") == {"appointment", "pricing"}
+        assert keyword_intents("Is the bookshelf costly?") == frozenset()
+
+
+class TestReclassifyReason:
+    def test_without_memo_always_classifies(self):
+        assert reclassify_reason(None, "thanks!", 2) == "no_memo"
+
+    def test_follow_up_reuses_memo(self):
+        memo = remember(None, _BOOKING, "I'd like to book Botox", 2)
+        assert reclassify_reason(memo, "Does Saturday at 3 work?", 4) is None
+        # Keywords of the memo's own intent don't count as a change
+        assert reclassify_reason(memo, "Can I schedule for Friday instead?", 4) is None
+
+    def test_new_intent_keywords_reclassify(self):
+        memo = remember(None, _BOOKING, "I'd like to book Botox", 2)
+        assert reclassify_reason(memo, "And how much is it?", 4) == "new_keywords"
+
+    def test_turn_count_reclassifies(self):
+        memo = remember(None, _BOOKING, "I'd like to book Botox", 2)
+        later = 2 + settings.lead_memo_max_turns * 2
+        assert reclassify_reason(memo, "ok", later - 2) is None
+        assert reclassify_reason(memo, "ok", later) == "turn_count"
+
+
+class TestLeadMemo:
+    def test_json_round_trip(self):
+        memo = remember(None, _BOOKING, "How much to book?", 2)
+        assert memo.keywords == {"appointment", "pricing"}
+        assert LeadMemo.from_json(memo.to_json()) == memo
+        assert LeadMemo.from_json(None) is None
+
+    def test_matches_ignores_summary(self):
+        memo = remember(None, _BOOKING, "book", 2)
+        assert memo.matches({**_BOOKING, "summary": "Something else."})
+        assert not memo.matches({**_BOOKING, "urgency": 4})
@@ -0,0 +1,53 @@
+"""Tests for the shared OpenAI client factory."""
+
+import pytest
+
+from app.services import llm_clients
+from app.services.llm_clients import LLMClientFactory
+
+
+@pytest.fixture(autouse=True)
+def _api_key(monkeypatch):
+    monkeypatch.setattr(llm_clients.settings, "openai_api_key", "sk-test")
+
+
+class TestLLMClientFactory:
+    @pytest.mark.asyncio
+    async def test_chat_models_are_cached_per_config(self):
+        factory = LLMClientFactory()
+        try:
+            assert factory.chat("gpt-4o-mini", 1024) is factory.chat("gpt-4o-mini", 1024)
+            assert factory.chat("gpt-4o-mini", 1024) is not factory.chat("gpt-4o", 256)
+        finally:
+            await factory.aclose()
+
+    @pytest.mark.asyncio
+    async def test_models_share_one_http_pool(self):
+        factory = LLMClientFactory()
+        try:
+            chat = factory.chat("gpt-4o-mini", 1024)
+            embedder = factory.embeddings()
+            assert chat.http_async_client is factory._async_http
+            assert embedder.http_async_client is factory._async_http
+        finally:
+            await factory.aclose()
+
+    @pytest.mark.asyncio
+    async def test_pool_limits_come_from_settings(self, monkeypatch):
+        monkeypatch.setattr(llm_clients.settings, "openai_max_connections", 7)
+        factory = LLMClientFactory()
+        try:
+            pool = factory._async_http._transport._pool
+            assert pool._max_connections == 7
+        finally:
+            await factory.aclose()
+
+    @pytest.mark.asyncio
+    async def test_close_resets_singleton(self):
+        first = llm_clients.get_llm_clients()
+        await llm_clients.close_llm_clients()
+        second = llm_clients.get_llm_clients()
+        try:
+            assert first is not second
+        finally:
+            await llm_clients.close_llm_clients()
@@ -0,0 +1,138 @@
+"""Tests for the in-process NumPy vector index."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.services.memory_index import MemoryVectorIndex, TenantMatrix
+
+DIM = 8
+
+
+def _unit(i: int) -> list[float]:
+    vec = [0.0] * DIM
+    vec[i] = 1.0
+    return vec
+
+
+def _records(n: int) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            id=f"id-{i}",
+            title="Menu",
+            content=f"chunk {i}",
+            doc_type="faq",
+            chunk_index=i,
+            embedding=_unit(i % DIM),
+        )
+        for i in range(n)
+    ]
+
+
+def _db(records: list[SimpleNamespace]) -> MagicMock:
+    result = MagicMock()
+    result.fetchall.return_value = records
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+@pytest.fixture
+def version():
+    state = {"version": 1}
+    with patch(
+        "app.services.memory_index.get_knowledge_version",
+        AsyncMock(side_effect=lambda tenant_id: state["version"]),
+    ):
+        yield state
+
+
+class TestTenantMatrix:
+    def test_ranks_by_cosine_and_applies_threshold(self):
+        rows = [{"content": c} for c in ("a", "b", "c")]
+        matrix = TenantMatrix.build(1, rows, [[1.0, 0.0], [0.6, 0.8], [0.0, 2.0]])
+        results = matrix.search([1.0, 0.0], top_k=3, threshold=0.5)
+        assert [r["content"] for r in results] == ["a", "b"]
+        assert results[0]["similarity"] == pytest.approx(1.0)
+        assert results[1]["similarity"] == pytest.approx(0.6)
+
+    def test_top_k_uses_partial_selection(self):
+        rng = np.random.default_rng(0)
+        embeddings = rng.normal(size=(200, DIM)).astype(np.float32)
+        rows = [{"content": str(i)} for i in range(200)]
+        matrix = TenantMatrix.build(1, rows, list(embeddings))
+        query = embeddings[17]
+
+        results = matrix.search(list(query), top_k=5, threshold=-1.0)
+        normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+        assert [int(r["content"]) for r in results] == list(expected)
+
+    def test_empty(self):
+        assert TenantMatrix.build(1, [], []).search([1.0], top_k=5, threshold=0.0) == []
+
+
+class TestMemoryVectorIndex:
+    @pytest.mark.asyncio
+    async def test_loads_lazily_once(self, version):
+        index = MemoryVectorIndex(max_bytes=10_000_000, max_chunks_per_tenant=100)
+        db = _db(_records(4))
+
+        first = await index.search(db, "t1", _unit(2), top_k=1, threshold=0.5)
+        second = await index.search(db, "t1", _unit(3), top_k=1, threshold=0.5)
+
+        assert first[0]["content"] == "chunk 2"
+        assert second[0]["content"] == "chunk 3"
+        assert db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_reloads_after_version_bump(self, version):
+        index = MemoryVectorIndex(max_bytes=10_000_000, max_chunks_per_tenant=100)
+        db = _db(_records(4))
+        await index.search(db, "t1", _unit(0), top_k=1, threshold=0.5)
+
+        version["version"] = 2
+        await index.search(db, "t1", _unit(0), top_k=1, threshold=0.5)
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_oversized_tenant_falls_back(self, version):
+        index = MemoryVectorIndex(max_bytes=10_000_000, max_chunks_per_tenant=3)
+        db = _db(_records(4))
+
+        assert await index.search(db, "t1", _unit(0), top_k=1, threshold=0.5) is None
+        # Remembered until the corpus changes
+        assert await index.search(db, "t1", _unit(0), top_k=1, threshold=0.5) is None
+        assert db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_version_falls_back(self, version):
+        index = MemoryVectorIndex(max_bytes=10_000_000, max_chunks_per_tenant=100)
+        db = _db(_records(4))
+        await index.search(db, "t1", _unit(0), top_k=1, threshold=0.5)
+
+        version["version"] = None
+        assert await index.search(db, "t1", _unit(0), top_k=1, threshold=0.5) is None
+        assert db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, version):
+        one_tenant = TenantMatrix.build(
+            1, [{"content": f"chunk {i}"} for i in range(4)], [_unit(i) for i in range(4)]
+        ).nbytes
+        index = MemoryVectorIndex(max_bytes=2 * one_tenant, max_chunks_per_tenant=100)
+        db = _db(_records(4))
+
+        await index.search(db, "t1", _unit(0), top_k=1, threshold=0.5)
+        await index.search(db, "t2", _unit(0), top_k=1, threshold=0.5)
+        await index.search(db, "t1", _unit(0), top_k=1, threshold=0.5)  # t1 most recent
+        await index.search(db, "t3", _unit(0), top_k=1, threshold=0.5)
+
+        stats = index.stats()
+        assert stats["tenants"] == 2
+        assert stats["evictions"] == 1
+        assert stats["bytes"] <= 2 * one_tenant
+        await index.search(db, "t1", _unit(0), top_k=1, threshold=0.5)
+        assert db.execute.await_count == 3  # t1 survived, t2 was evicted
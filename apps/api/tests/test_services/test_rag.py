@@ -1,8 +1,18 @@
-"""Tests for RAG service — chunking logic only (embedding requires API keys)."""
+"""Tests for RAG service (embeddings are faked; no API keys needed)."""
+
+from unittest.mock import patch
 
 import pytest
+from sqlalchemy import select, text
 
-from app.services.rag import chunk_text
+from app.models.knowledge_document import KnowledgeDocument
+from app.services.rag import (
+    NEAREST_CHUNKS_SQL,
+    RAGService,
+    chunk_text,
+    reciprocal_rank_fusion,
+)
+from app.services.vector_index import ensure_tenant_vector_index, tenant_index_name
 
 
 class TestChunking:
@@ -38,3 +48,211 @@ class TestChunking:
         text = "\n\n".join(paragraphs)
         chunks = chunk_text(text)
         assert len(chunks) >= 2
+
+
+class TestIncrementalIngestion:
+    """Re-ingesting a document only embeds chunks whose content changed."""
+
+    @staticmethod
+    def _paragraphs(*edits: tuple[int, str]) -> str:
+        paragraphs = [f"Section {i}: " + f"treatment details {i} " * 20 for i in range(8)]
+        for index, replacement in edits:
+            paragraphs[index] = replacement
+        return "\n\n".join(p for p in paragraphs if p)
+
+    @pytest.fixture
+    def embedded(self):
+        calls: list[str] = []
+
+        async def _fake_embeddings(texts):
+            calls.extend(texts)
+            return [[0.01] * 1536 for _ in texts]
+
+        with patch("app.services.rag._get_embeddings", _fake_embeddings):
+            yield calls
+
+    @pytest.mark.asyncio
+    async def test_unchanged_document_embeds_nothing(self, db, tenant_id, embedded):
+        rag = RAGService(db)
+        first = await rag.ingest_document(tenant_id, "Menu", self._paragraphs(), "treatment_menu")
+        embedded.clear()
+
+        second = await rag.ingest_document(tenant_id, "Menu", self._paragraphs(), "treatment_menu")
+        assert embedded == []
+        assert second.unchanged == first.total_chunks
+        assert second.deleted == 0
+
+    @pytest.mark.asyncio
+    async def test_edit_embeds_only_changed_chunks(self, db, tenant_id, embedded):
+        rag = RAGService(db)
+        await rag.ingest_document(tenant_id, "Menu", self._paragraphs(), "treatment_menu")
+        embedded.clear()
+
+        new_section = "Section 3: " + "Botox now $13 per unit. " * 16
+        edited = self._paragraphs((3, new_section), (5, ""))
+        result = await rag.ingest_document(tenant_id, "Menu", edited, "treatment_menu")
+
+        assert embedded == [new_section.strip()]
+        assert result.embedded == 1
+        assert result.deleted == 2
+
+        rows = await db.execute(
+            select(KnowledgeDocument.chunk_index, KnowledgeDocument.content)
+            .where(KnowledgeDocument.tenant_id == tenant_id)
+            .order_by(KnowledgeDocument.chunk_index)
+        )
+        stored = rows.all()
+        assert [r.chunk_index for r in stored] == list(range(result.total_chunks))
+        assert [r.content for r in stored] == chunk_text(edited)
+
+
+class TestNearestChunksQuery:
+    @pytest.mark.asyncio
+    async def test_plan_uses_tenant_hnsw_index(self, db, tenant_id):
+        """The retrieval query must stay in a shape the tenant's HNSW index can order.
+
+        Sorting and seq scans are disabled so the only way to satisfy the
+        inner ORDER BY/LIMIT is an index scan on the tenant's partial index.
+        """
+        async with db.bind.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await ensure_tenant_vector_index(conn, tenant_id)
+
+        await db.execute(text("SET LOCAL enable_seqscan = off"))
+        await db.execute(text("SET LOCAL enable_sort = off"))
+        await db.execute(text("SET LOCAL plan_cache_mode = force_custom_plan"))
+        result = await db.execute(
+            text("EXPLAIN " + NEAREST_CHUNKS_SQL.text),
+            {
+                "query_embedding": [0.01] * 1536,
+                "tenant_id": tenant_id,
+                "max_distance": 0.22,
+                "top_k": 5,
+            },
+        )
+        plan = "\n".join(row[0] for row in result)
+        assert f"Index Scan using {tenant_index_name(tenant_id)}" in plan
+        assert "Sort" not in plan
+
+    @pytest.mark.asyncio
+    async def test_threshold_applied_after_top_k(self, db, tenant_id):
+        near = [1.0] + [0.0] * 1535
+        far = [0.0, 1.0] + [0.0] * 1534
+        for i, embedding in enumerate([near, far]):
+            db.add(
+                KnowledgeDocument(
+                    tenant_id=tenant_id,
+                    title="Menu",
+                    content=f"chunk {i}",
+                    doc_type="faq",
+                    chunk_index=i,
+                    embedding=embedding,
+                )
+            )
+        await db.flush()
+
+        results, backend = await RAGService(db)._nearest_chunks(
+            tenant_id, near, top_k=5, threshold=0.5
+        )
+        assert backend == "pgvector"
+        assert [r["content"] for r in results] == ["chunk 0"]
+        assert results[0]["similarity"] == pytest.approx(1.0)
+
+
+def _row(chunk_id: str, similarity: float | None = None) -> dict:
+    return {"id": chunk_id, "content": chunk_id, "similarity": similarity}
+
+
+class TestReciprocalRankFusion:
+    def test_agreement_beats_single_leg_top_rank(self):
+        vector = [_row("a", 0.9), _row("b", 0.85)]
+        lexical = [_row("c"), _row("b")]
+        fused = reciprocal_rank_fusion([vector, lexical], k=60)
+        assert [r["id"] for r in fused] == ["b", "a", "c"]
+
+    def test_keeps_vector_similarity_for_shared_rows(self):
+        fused = reciprocal_rank_fusion([[_row("b")], [_row("b", 0.8)]], k=60)
+        assert fused[0]["similarity"] == 0.8
+        assert fused[0]["rrf_score"] == pytest.approx(2 / 61)
+
+    def test_lexical_only_rows_have_no_similarity(self):
+        fused = reciprocal_rank_fusion([[], [_row("c")]], k=60)
+        assert fused == [{"id": "c", "content": "c", "similarity": None, "rrf_score": 1 / 61}]
+
+
+class TestHybridSearch:
+    _QUERY = [1.0] + [0.0] * 1535
+
+    @staticmethod
+    def _similar(similarity: float) -> list[float]:
+        return [similarity, (1 - similarity**2) ** 0.5] + [0.0] * 1534
+
+    async def _search(self, db, tenant_id, chunks, top_k):
+        for i, (content, embedding) in enumerate(chunks):
+            db.add(
+                KnowledgeDocument(
+                    tenant_id=tenant_id,
+                    title="Menu",
+                    content=content,
+                    doc_type="treatment_menu",
+                    chunk_index=i,
+                    embedding=embedding,
+                )
+            )
+        await db.flush()
+
+        async def _fake_embed_query(_query):
+            return self._QUERY, "disabled"
+
+        with (
+            patch("app.services.rag._embed_query", _fake_embed_query),
+            patch("app.services.rag.settings.rag_retrieval_mode", "hybrid"),
+        ):
+            _, stats = await RAGService(db).search_with_stats(
+                tenant_id, "How much is Kybella?", top_k=top_k, threshold=0.5
+            )
+            results = await RAGService(db).search(
+                tenant_id, "How much is Kybella?", top_k=top_k, threshold=0.5
+            )
+        return results, stats
+
+    @pytest.mark.asyncio
+    async def test_exact_term_found_outside_vector_candidates(self, db, tenant_id):
+        """A product name the embedding ranks below the candidate list is still retrieved."""
+        results, stats = await self._search(
+            db,
+            tenant_id,
+            [
+                ("Our injectables are administered by licensed nurses.", self._QUERY),
+                ("Book a consultation before any treatment.", self._similar(0.99)),
+                ("Kybella dissolves fat under the chin in 2-4 sessions.", self._similar(0.6)),
+            ],
+            top_k=2,
+        )
+
+        assert [r["chunk_index"] for r in results] == [0, 2]
+        assert results[1]["similarity"] == pytest.approx(0.6)
+        assert stats["retrieval_mode"] == "hybrid"
+        assert stats["lexical_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lexical_match_below_threshold_is_dropped(self, db, tenant_id):
+        """Sharing a word with the query doesn't bypass the similarity threshold."""
+        results, stats = await self._search(
+            db,
+            tenant_id,
+            [
+                ("Our injectables are administered by licensed nurses.", self._QUERY),
+                ("Kybella dissolves fat under the chin in 2-4 sessions.", self._similar(0.1)),
+            ],
+            top_k=5,
+        )
+
+        assert [r["chunk_index"] for r in results] == [0]
+        assert stats["lexical_hits"] == 0
+        assert stats["avg_similarity"] == pytest.approx(1.0)
+
+    def test_vector_is_default_mode(self):
+        from app.config import Settings
+
+        assert Settings.model_fields["rag_retrieval_mode"].default == "vector"
@@ -0,0 +1,85 @@
+"""Tests for the semantic response cache."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.agent.nodes import _lookup_cached_response
+from app.services.knowledge_version import get_knowledge_version
+from app.services.response_cache import ResponseCache
+
+
+def _cache(**kwargs) -> ResponseCache:
+    defaults = {"similarity": 0.95, "ttl_seconds": 60, "max_entries_per_tenant": 10}
+    return ResponseCache(**{**defaults, **kwargs})
+
+
+class TestResponseCache:
+    def test_hit_within_radius(self):
+        cache = _cache()
+        cache.store("t1", 1, [1.0, 0.0, 0.0], "Botox is $12/unit.")
+        assert cache.lookup("t1", 1, [0.99, 0.05, 0.0]) == "Botox is $12/unit."
+        assert cache.stats()["hits"] == 1
+
+    def test_miss_outside_radius(self):
+        cache = _cache()
+        cache.store("t1", 1, [1.0, 0.0, 0.0], "Botox is $12/unit.")
+        assert cache.lookup("t1", 1, [0.0, 1.0, 0.0]) is None
+
+    def test_tenants_are_isolated(self):
+        cache = _cache()
+        cache.store("t1", 1, [1.0, 0.0], "answer")
+        assert cache.lookup("t2", 1, [1.0, 0.0]) is None
+
+    def test_version_bump_invalidates(self):
+        cache = _cache()
+        cache.store("t1", 1, [1.0, 0.0], "old answer")
+        assert cache.lookup("t1", 2, [1.0, 0.0]) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_stale_store_does_not_clobber_newer_version(self):
+        cache = _cache()
+        cache.store("t1", 2, [1.0, 0.0], "new answer")
+        cache.store("t1", 1, [0.0, 1.0], "answer generated before the corpus changed")
+        assert cache.lookup("t1", 2, [1.0, 0.0]) == "new answer"
+        assert cache.lookup("t1", 2, [0.0, 1.0]) is None
+
+    def test_ttl_expiry(self):
+        now = [0.0]
+        cache = _cache(clock=lambda: now[0])
+        cache.store("t1", 1, [1.0, 0.0], "answer")
+        now[0] = 61.0
+        assert cache.lookup("t1", 1, [1.0, 0.0]) is None
+
+    def test_max_entries_evicts_oldest(self):
+        cache = _cache(max_entries_per_tenant=2)
+        cache.store("t1", 1, [1.0, 0.0, 0.0], "a")
+        cache.store("t1", 1, [0.0, 1.0, 0.0], "b")
+        cache.store("t1", 1, [0.0, 0.0, 1.0], "c")
+        assert cache.lookup("t1", 1, [1.0, 0.0, 0.0]) is None
+        assert cache.lookup("t1", 1, [0.0, 0.0, 1.0]) == "c"
+
+
+class TestUnknownKnowledgeVersion:
+    @pytest.mark.asyncio
+    async def test_redis_read_failure_means_unknown_version(self):
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=ConnectionError("down"))
+        with patch("app.services.redis_client.get_redis", return_value=redis), patch(
+            "app.services.knowledge_version.settings.knowledge_version_redis_enabled", True
+        ):
+            assert await get_knowledge_version("t1") is None
+
+    @pytest.mark.asyncio
+    async def test_lookup_skips_cache_when_version_unknown(self):
+        cache = _cache()
+        cache.store("t1", 0, [1.0, 0.0], "answer from before the corpus changed")
+        with patch("app.services.response_cache.get_response_cache", return_value=cache), patch(
+            "app.services.knowledge_version.get_knowledge_version", AsyncMock(return_value=None)
+        ):
+            cached, entry = await _lookup_cached_response(
+                "t1", [{"role": "user", "content": "How much is Botox?"}]
+            )
+
+        assert cached is None
+        assert entry is None
@@ -0,0 +1,146 @@
+"""Tests for the per-tenant config cache."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.models import Tenant
+from app.services.tenant_config import (
+    TenantConfig,
+    TenantConfigCache,
+    run_invalidation_listener,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTenantConfig:
+    def test_defaults_when_unset(self):
+        config = TenantConfig.from_settings({"greeting": "Welcome!"})
+        assert config.similarity_threshold == settings.rag_similarity_threshold
+        assert config.top_k == settings.rag_top_k
+
+    def test_overrides(self):
+        config = TenantConfig.from_settings({"similarity_threshold": 0.6, "top_k": 8})
+        assert config == TenantConfig(similarity_threshold=0.6, top_k=8)
+
+    def test_escalation_rules(self):
+        config = TenantConfig.from_settings(
+            {"escalation_rules": {"complaint": ["Charged Twice"], "unknown": ["x"]}}
+        )
+        assert config.escalation_rules == (("complaint", ("charged twice",)),)
+
+
+class TestTenantConfigCache:
+    @pytest.mark.asyncio
+    async def test_resolves_by_org_id_and_uuid(self, db, tenant):
+        tenant.settings = {"similarity_threshold": 0.65}
+        await db.flush()
+        cache = TenantConfigCache(ttl_seconds=60)
+
+        by_org = await cache.get(db, tenant.clerk_org_id)
+        by_uuid = await cache.get(db, str(tenant.id))
+        assert by_org.similarity_threshold == 0.65
+        assert by_uuid == by_org
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_db_until_invalidated(self, db, tenant):
+        cache = TenantConfigCache(ttl_seconds=60)
+        await cache.get(db, tenant.clerk_org_id)
+
+        tenant.settings = {"top_k": 9}
+        await db.flush()
+        assert (await cache.get(db, tenant.clerk_org_id)).top_k == settings.rag_top_k
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        cache.invalidate(tenant.clerk_org_id, str(tenant.id))
+        assert (await cache.get(db, tenant.clerk_org_id)).top_k == 9
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self, db, tenant):
+        clock = _Clock()
+        cache = TenantConfigCache(ttl_seconds=60, clock=clock)
+        await cache.get(db, tenant.clerk_org_id)
+
+        tenant.settings = {"top_k": 3}
+        await db.flush()
+        clock.now += 61
+        assert (await cache.get(db, tenant.clerk_org_id)).top_k == 3
+
+    @pytest.mark.asyncio
+    async def test_unknown_tenant_gets_defaults(self, db):
+        config = await TenantConfigCache(ttl_seconds=60).get(db, "org_missing")
+        assert config == TenantConfig.defaults()
+
+    @pytest.mark.asyncio
+    async def test_info_by_uuid(self, db, tenant):
+        info = await TenantConfigCache(ttl_seconds=60).get_info(db, str(tenant.id))
+        assert info.clerk_org_id == tenant.clerk_org_id
+        assert info.name == "Test Med Spa"
+
+    @pytest.mark.asyncio
+    async def test_unknown_tenant_is_negatively_cached(self, db, tenant_id):
+        clock = _Clock()
+        cache = TenantConfigCache(ttl_seconds=60, negative_ttl_seconds=5, clock=clock)
+        assert await cache.get_info(db, tenant_id) is None
+
+        db.add(Tenant(clerk_org_id=tenant_id, name="New Spa"))
+        await db.flush()
+        assert await cache.get_info(db, tenant_id) is None
+        assert cache.misses == 1
+
+        clock.now += 6
+        assert (await cache.get_info(db, tenant_id)).name == "New Spa"
+
+    @pytest.mark.asyncio
+    async def test_bounded_by_max_entries(self, db, tenant):
+        cache = TenantConfigCache(ttl_seconds=60, max_entries=2)
+        await cache.get_info(db, tenant.clerk_org_id)
+        await cache.get_info(db, "org_random_1")
+        cache.lookup(tenant.clerk_org_id)  # recently used, so kept
+        await cache.get_info(db, "org_random_2")
+
+        assert cache.lookup(tenant.clerk_org_id)[0]
+        assert cache.lookup("org_random_2")[0]
+        assert not cache.lookup("org_random_1")[0]
+
+
+class _DownRedis:
+    def pubsub(self):
+        raise ConnectionError("redis down")
+
+    async def aclose(self):
+        pass
+
+
+class TestInvalidationListener:
+    @pytest.mark.asyncio
+    async def test_clears_once_per_outage(self):
+        cache = TenantConfigCache(ttl_seconds=60)
+        retries = 0
+
+        async def _sleep(_seconds):
+            nonlocal retries
+            retries += 1
+            if retries == 3:
+                raise asyncio.CancelledError
+
+        with (
+            patch("app.services.tenant_config.get_tenant_config_cache", return_value=cache),
+            patch("app.services.tenant_config.aioredis.from_url", return_value=_DownRedis()),
+            patch("app.services.tenant_config.asyncio.sleep", _sleep),
+            patch.object(cache, "clear", wraps=cache.clear) as clear,
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await run_invalidation_listener()
+
+        assert retries == 3
+        assert clear.call_count == 1
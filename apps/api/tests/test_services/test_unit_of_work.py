@@ -0,0 +1,132 @@
+"""Tests for the per-turn unit of work."""
+
+import uuid
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import Conversation, Escalation
+from app.models.conversation import Channel
+from app.models.escalation import EscalationReason
+from app.services.unit_of_work import UnitOfWork, after_commit, turn_session
+
+
+@pytest.fixture
+def session_factory(db):
+    return async_sessionmaker(db.bind, class_=AsyncSession, expire_on_commit=False)
+
+
+class TestUnitOfWork:
+    @pytest.mark.asyncio
+    async def test_turn_shares_one_session(self, session_factory):
+        async with UnitOfWork(session_factory) as uow:
+            async with turn_session() as first:
+                pass
+            async with turn_session() as second:
+                assert second is first is uow.session
+
+    @pytest.mark.asyncio
+    async def test_read_release_then_single_commit(self, session_factory, tenant_id):
+        async with UnitOfWork(session_factory) as uow:
+            async with turn_session(release=True) as db:
+                await db.execute(text("SELECT 1"))
+            assert not uow.session.in_transaction()
+
+            conversation_id = uuid.uuid4()
+            async with turn_session() as db:
+                # Staged against a conversation that is only added afterwards
+                db.add(
+                    Escalation(
+                        tenant_id=tenant_id,
+                        conversation_id=conversation_id,
+                        reason=EscalationReason.EMERGENCY,
+                    )
+                )
+            async with turn_session() as db:
+                db.add(
+                    Conversation(
+                        id=conversation_id,
+                        tenant_id=tenant_id,
+                        channel=Channel.WEB_CHAT,
+                        transcript=[],
+                    )
+                )
+            await uow.commit()
+
+            assert (uow.checkouts, uow.commits) == (2, 1)
+
+        async with session_factory() as check:
+            count = await check.scalar(
+                select(func.count()).select_from(Escalation).where(
+                    Escalation.conversation_id == conversation_id
+                )
+            )
+        assert count == 1
+
+    @pytest.mark.asyncio
+    async def test_after_commit_deferred_until_commit(self, session_factory):
+        ran: list[str] = []
+
+        async def _notify():
+            ran.append("notified")
+
+        async with UnitOfWork(session_factory) as uow:
+            await after_commit(_notify)
+            assert ran == []
+            await uow.commit()
+        assert ran == ["notified"]
+
+    @pytest.mark.asyncio
+    async def test_failed_block_rolls_back(self, session_factory):
+        async with UnitOfWork(session_factory) as uow:
+            # The UoW rolls back and re-raises the driver error unchanged
+            with pytest.raises(DBAPIError, match="division by zero"):
+                async with turn_session() as db:
+                    await db.execute(text("SELECT 1/0"))
+            assert not uow.session.in_transaction()
+            async with turn_session() as db:
+                assert await db.scalar(text("SELECT 1")) == 1
+
+
+class TestEscalationCommit:
+    @pytest.mark.asyncio
+    async def test_escalation_survives_a_failed_turn(self, session_factory, tenant_id):
+        from app.agent.nodes import escalate_node
+        from app.routers.chat import _append_messages
+
+        conversation_id = uuid.uuid4()
+        state = {
+            "tenant_id": tenant_id,
+            "conversation_id": str(conversation_id),
+            "escalation_reason": "emergency",
+        }
+        async with UnitOfWork(session_factory):
+            result = await escalate_node(state)
+            # The turn ends without uow.commit() (e.g. the client disconnected)
+        assert result["should_escalate"] is True
+
+        async with session_factory() as check:
+            escalations = (
+                await check.scalars(
+                    select(Escalation).where(Escalation.conversation_id == conversation_id)
+                )
+            ).all()
+        assert [e.reason for e in escalations] == [EscalationReason.EMERGENCY]
+
+        # A retried first turn still saves its transcript on the same conversation
+        async with UnitOfWork(session_factory) as uow:
+            async with uow.use() as db:
+                await _append_messages(
+                    db,
+                    tenant_id,
+                    str(conversation_id),
+                    False,
+                    [{"role": "user", "content": "help"}, {"role": "assistant", "content": "ok"}],
+                )
+            await uow.commit()
+
+        async with session_factory() as check:
+            conversation = await check.get(Conversation, conversation_id)
+        assert conversation.message_count == 2
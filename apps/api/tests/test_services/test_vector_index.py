@@ -0,0 +1,24 @@
+"""Tests for per-tenant HNSW index naming and DDL."""
+
+from app.services.vector_index import tenant_index_ddl, tenant_index_name
+
+
+class TestTenantIndex:
+    def test_name_is_stable_and_fits_identifier_limit(self):
+        name = tenant_index_name("org_2abcDEF1234567890")
+        assert name == tenant_index_name("org_2abcDEF1234567890")
+        assert name != tenant_index_name("org_other")
+        assert len(name) <= 63
+
+    def test_ddl_is_partial_hnsw(self):
+        ddl = tenant_index_ddl("org_abc")
+        assert "CONCURRENTLY" in ddl
+        assert "USING hnsw (embedding vector_cosine_ops)" in ddl
+        assert ddl.endswith("WHERE tenant_id = 'org_abc'")
+
+    def test_ddl_escapes_quotes(self):
+        assert tenant_index_ddl("o'brien").endswith("WHERE tenant_id = 'o''brien'")
+
+    def test_name_matches_indexes_built_by_migration_008(self):
+        # Names are a SHA-1 prefix; changing the digest would orphan existing indexes
+        assert tenant_index_name("org_abc") == "ix_knowledge_embedding_4c75961089ec0b17"
@@ -24,6 +24,17 @@ interface KnowledgeDocument {
   updated_at: string;
 }
 
+interface IngestionJob {
+  id: string;
+  title: string;
+  status: "queued" | "processing" | "completed" | "failed";
+  total_chunks: number | null;
+  chunks_done: number;
+  error: string | null;
+}
+
+const JOB_POLL_INTERVAL_MS = 1500;
+
 const docTypeLabels: Record<string, string> = {
   treatment_menu: "Treatment Menu",
   pricing: "Pricing",
@@ -50,6 +61,7 @@ export default function KnowledgeBasePage() {
   const [documents, setDocuments] = useState<KnowledgeDocument[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
+  const [jobs, setJobs] = useState<IngestionJob[]>([]);
 
   const fetchDocuments = useCallback(async () => {
     try {
@@ -71,6 +83,31 @@ export default function KnowledgeBasePage() {
     fetchDocuments();
   }, [fetchDocuments]);
 
+  // Poll in-flight ingestion jobs; refresh the document list as they finish
+  const activeJobIds = jobs
+    .filter((j) => j.status === "queued" || j.status === "processing")
+    .map((j) => j.id)
+    .join(",");
+
+  useEffect(() => {
+    if (!activeJobIds) return;
+    const timer = setInterval(async () => {
+      const token = await getToken();
+      const updated = await Promise.all(
+        activeJobIds.split(",").map((id) =>
+          api.get<IngestionJob>(`/knowledge-base/jobs/${id}`, { token: token || undefined })
+        )
+      ).catch(() => null);
+      if (!updated) return;
+      setJobs((prev) => prev.map((j) => updated.find((u) => u.id === j.id) || j));
+      if (updated.some((j) => j.status === "completed")) {
+        setJobs((prev) => prev.filter((j) => j.status !== "completed"));
+        await fetchDocuments();
+      }
+    }, JOB_POLL_INTERVAL_MS);
+    return () => clearInterval(timer);
+  }, [activeJobIds, getToken, fetchDocuments]);
+
   const handleUpload = async (file: File, title: string, docType: string) => {
     const token = await getToken();
     const formData = new FormData();
@@ -78,11 +115,24 @@ export default function KnowledgeBasePage() {
     formData.append("title", title);
     formData.append("doc_type", docType);
 
-    await api.upload("/knowledge-base", formData, {
+    const job = await api.upload<IngestionJob>("/knowledge-base", formData, {
       token: token || undefined,
     });
+    setJobs((prev) => [job, ...prev]);
+  };
 
-    await fetchDocuments();
+  const handleRetry = async (jobId: string) => {
+    try {
+      const token = await getToken();
+      const job = await api.post<IngestionJob>(`/knowledge-base/jobs/${jobId}/retry`, undefined, {
+        token: token || undefined,
+      });
+      setJobs((prev) => prev.map((j) => (j.id === jobId ? job : j)));
+    } catch (err) {
+      console.error("Failed to retry ingestion:", err);
+      setError("Failed to retry processing. Please try again.");
+      setTimeout(() => setError(""), 5000);
+    }
   };
 
   const handleDelete = async (title: string) => {
@@ -116,6 +166,34 @@ export default function KnowledgeBasePage() {
 
       <DocumentUpload onUpload={handleUpload} />
 
+      {jobs.length > 0 && (
+        <div className="mt-4 space-y-2">
+          {jobs.map((job) => (
+            <Card key={job.id} className="p-3 flex items-center justify-between gap-3">
+              <div className="min-w-0">
+                <p className="text-sm font-medium line-clamp-1" style={{ color: "var(--text)" }}>
+                  {job.title}
+                </p>
+                <p className="text-[11px]" style={{ color: "var(--text-muted)" }}>
+                  {job.status === "failed"
+                    ? `Failed: ${job.error || "unknown error"}`
+                    : job.status === "processing" && job.total_chunks
+                      ? `Processing ${job.chunks_done}/${job.total_chunks} chunks`
+                      : "Queued for processing"}
+                </p>
+              </div>
+              {job.status === "failed" ? (
+                <Button size="sm" variant="secondary" onClick={() => handleRetry(job.id)}>
+                  Retry
+                </Button>
+              ) : (
+                <StatusBadge variant="info">{job.status}</StatusBadge>
+              )}
+            </Card>
+          ))}
+        </div>
+      )}
+
       <div className="mt-8">
         <h2
           className="text-lg font-semibold mb-4"
@@ -30,6 +30,7 @@ interface TenantSettings {
     widget_color?: string;
     widget_position?: string;
     similarity_threshold?: number;
+    top_k?: number;
   };
 }
 
@@ -61,6 +62,7 @@ export default function SettingsPage() {
   const [widgetColor, setWidgetColor] = useState("#8B7355");
   const [widgetPosition, setWidgetPosition] = useState("bottom-right");
   const [threshold, setThreshold] = useState(0.78);
+  const [topK, setTopK] = useState(5);
   const [hours, setHours] = useState<Record<string, { open: string; close: string; closed: boolean }>>({});
 
   const markChanged = () => setHasChanges(true);
@@ -79,6 +81,7 @@ export default function SettingsPage() {
       setWidgetColor(data.settings?.widget_color || "#8B7355");
       setWidgetPosition(data.settings?.widget_position || "bottom-right");
       setThreshold(data.settings?.similarity_threshold ?? 0.78);
+      setTopK(data.settings?.top_k ?? 5);
 
       const existingHours = data.business_hours || {};
       const h: Record<string, { open: string; close: string; closed: boolean }> = {};
@@ -119,6 +122,7 @@ export default function SettingsPage() {
           widget_color: widgetColor,
           widget_position: widgetPosition,
           similarity_threshold: threshold,
+          top_k: topK,
         },
         { token: token || undefined }
       );
@@ -393,6 +397,31 @@ export default function SettingsPage() {
               Higher values return more relevant but fewer results. Default: 0.78
             </p>
           </div>
+          <div className="mt-5">
+            <label className="block text-sm font-medium mb-2" style={{ color: "var(--text-secondary)" }}>
+              Results per Answer
+            </label>
+            <div className="flex items-center gap-3">
+              <input
+                type="range"
+                min="1"
+                max="20"
+                step="1"
+                value={topK}
+                onChange={(e) => { setTopK(parseInt(e.target.value, 10)); markChanged(); }}
+                className="flex-1 accent-spa-accent"
+              />
+              <span
+                className="w-12 text-sm font-semibold text-right"
+                style={{ color: "var(--text)" }}
+              >
+                {topK}
+              </span>
+            </div>
+            <p className="mt-1 text-xs" style={{ color: "var(--text-muted)" }}>
+              Knowledge base passages the assistant reads before answering. Default: 5
+            </p>
+          </div>
         </Card>
       </div>
 
@@ -20,6 +20,8 @@ interface OverviewData {
   p50_latency_ms: number;
   p95_latency_ms: number;
   p99_latency_ms: number;
+  avg_ttft_ms: number;
+  p95_ttft_ms: number;
 }
 
 interface LLMTimeseriesItem {
@@ -105,7 +107,7 @@ export default function OverviewPage() {
         <MetricCard
           label="Avg Latency"
           value={`${overview.p50_latency_ms.toFixed(0)}ms`}
-          sub={`p95: ${overview.p95_latency_ms.toFixed(0)}ms`}
+          sub={`p95: ${overview.p95_latency_ms.toFixed(0)}ms · TTFT ${overview.avg_ttft_ms.toFixed(0)}ms`}
         />
         <MetricCard label="Total Cost" value={`$${overview.total_cost_usd.toFixed(2)}`} />
         <MetricCard label="Error Rate" value={`${overview.error_rate.toFixed(1)}%`} />
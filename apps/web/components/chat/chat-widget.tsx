@@ -94,6 +94,10 @@ export function ChatWidget({ tenantId }: ChatWidgetProps) {
             if (event.type === "token") {
               accumulated += event.content;
               setStreamingContent(accumulated);
+            } else if (event.type === "replace") {
+              // Server took over the answer (e.g. escalation) after tokens were streamed
+              accumulated = event.content;
+              setStreamingContent(accumulated);
             } else if (event.type === "done") {
               if (accumulated) {
                 const assistantMessage: Message = {